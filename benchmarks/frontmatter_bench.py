@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: single-pass frontmatter engine vs. the old regex cascade.
+Usage: python benchmarks/frontmatter_bench.py [--keys N] [--repeat N]
+
+Checks that both paths produce byte-identical output for every post under
+content/blog and for synthetic frontmatter, then times them on synthetic
+frontmatter with hundreds of keys.
+"""
+import argparse
+import importlib.util
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+
+from frontmatter_fields import detect_existing_frontmatter  # noqa: E402
+
+
+def load_converter():
+    spec = importlib.util.spec_from_file_location("obsidian_to_hugo", BASE_DIR / "scripts" / "obsidian-to-hugo.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+converter = load_converter()
+yaml_str = converter.yaml_str
+
+
+def legacy_normalize_frontmatter_fields(frontmatter):
+    """The regex cascade normalize_frontmatter_fields replaced (kept verbatim)."""
+    # Normalize capitalized field names to lowercase
+    for field in ['Series', 'Status', 'Author', 'Tags', 'Category']:
+        frontmatter = re.sub(rf'^{field}:', field.lower() + ':', frontmatter, flags=re.MULTILINE)
+
+    # Change summary: to description: (PaperMod uses description)
+    frontmatter = re.sub(r'^summary:', 'description:', frontmatter, flags=re.MULTILINE)
+    
+    # PaperMod uses ShowToc instead of toc
+    frontmatter = re.sub(r'^toc:\s*true', 'ShowToc: true\nTocOpen: false', frontmatter, flags=re.MULTILINE)
+    frontmatter = re.sub(r'^toc:\s*false', 'ShowToc: false', frontmatter, flags=re.MULTILINE)
+
+    # Clean up tags (remove # hashes and empty entries)
+    def remove_tag_hashes(match):
+        cleaned = re.sub(r'- ["\']*#([^"\'\n]+)["\']*', r'- \1', match.group(0))
+        cleaned = re.sub(r'  -\s*\n', '', cleaned)
+        return cleaned
+
+    frontmatter = re.sub(r'^tags:\s*\n(?:  - [^\n]+\n)*', remove_tag_hashes, frontmatter, flags=re.MULTILINE)
+
+    # Convert published_date to date (Hugo field)
+    published_date_match = re.search(r'^published_date:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE)
+    if published_date_match:
+        pub_date = published_date_match.group(1).strip()
+        frontmatter = re.sub(r'^published_date:[^\n]*\n?', f'date: {pub_date}\n', frontmatter, flags=re.MULTILINE)
+
+    # Convert status: draft -> draft: true; strip status field
+    status_match = re.search(r'^status:\s*["\']?(\w+)["\']?\s*$', frontmatter, re.MULTILINE)
+    if status_match and status_match.group(1).lower() == 'draft':
+        if not re.search(r'^draft:', frontmatter, re.MULTILINE):
+            frontmatter = re.sub(r'^status:[^\n]*\n?', 'draft: true\n', frontmatter, flags=re.MULTILINE)
+        else:
+            frontmatter = re.sub(r'^status:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+    else:
+        frontmatter = re.sub(r'^status:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+
+    # Process Unsplash credit and Cover images
+    unsplash_data = {
+        'name': re.search(r'^unsplash_name:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE),
+        'user': re.search(r'^unsplash_user:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE),
+        'id': re.search(r'^unsplash_id:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE)
+    }
+    
+    credit_info = {k: v.group(1).strip() for k, v in unsplash_data.items() if v}
+    
+    # Remove raw unsplash fields
+    for field in ['unsplash_name', 'unsplash_user', 'unsplash_id']:
+        frontmatter = re.sub(rf'^{field}:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+
+    # Build credit block
+    credit_block = ""
+    if credit_info:
+        credit_block = "\n  credit:"
+        if 'name' in credit_info: credit_block += f'\n    name: "{yaml_str(credit_info["name"])}"'
+        if 'user' in credit_info: credit_block += f'\n    username: "{yaml_str(credit_info["user"])}"'
+        if 'id' in credit_info: credit_block += f'\n    photo_id: "{yaml_str(credit_info["id"])}"'
+
+    # Capture standalone alt field to use in cover.alt, then remove it
+    standalone_alt = ""
+    alt_match = re.search(r'^alt:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE)
+    if alt_match:
+        standalone_alt = alt_match.group(1).strip()
+        frontmatter = re.sub(r'^alt:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+
+    # Convert simple image: to PaperMod cover:
+    image_match = re.search(r'^image:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE)
+    if image_match:
+        img = image_match.group(1).strip()
+        if img:
+            alt_value = yaml_str(standalone_alt) if standalone_alt else ""
+            cover_block = f'cover:\n  image: "{yaml_str(img)}"\n  alt: "{alt_value}"\n  caption: ""\n  relative: true{credit_block}'
+            frontmatter = re.sub(r'^image:[^\n]*\n?', cover_block + '\n', frontmatter, flags=re.MULTILINE)
+        else:
+            frontmatter = re.sub(r'^image:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+    elif credit_block:
+        # Inject credit into existing cover if possible
+        if 'cover:' in frontmatter:
+            frontmatter = re.sub(r'(relative:\s*true)', r'\1' + credit_block, frontmatter)
+
+    # Strip Obsidian's capital-A Author: scalar (keep lowercase author: list)
+    frontmatter = re.sub(r'^Author:\s*\S[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+
+    # Clean up redundant or theme-clashing fields
+    for field in ['canonical_url', 'layout', 'created', 'Created',
+                  'Category', 'promo_file', 'series_position', 'target_date', 'post']:
+        frontmatter = re.sub(rf'^{field}:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+
+    # Strip empty weight field
+    frontmatter = re.sub(r'^weight:\s*\n?', '', frontmatter, flags=re.MULTILINE)
+
+    # Convert series scalar string to Hugo array format; strip if empty
+    series_scalar = re.search(r'^series:[ \t]*(\S[^\n]*?)[ \t]*$', frontmatter, re.MULTILINE)
+    already_array = re.search(r'^series:\s*\n\s+-', frontmatter, re.MULTILINE)
+    if series_scalar and not already_array:
+        raw = series_scalar.group(1).strip()
+        if raw in ('[]', ''):
+            frontmatter = re.sub(r'^series:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+        else:
+            # Strip surrounding quotes of any style (handles 'value', "value", '"value"')
+            value = raw.strip("'\"").strip("'\"")
+            if value:
+                frontmatter = re.sub(r'^series:[^\n]*\n?', f'series:\n  - "{value}"\n', frontmatter, flags=re.MULTILINE)
+            else:
+                frontmatter = re.sub(r'^series:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+
+    return frontmatter.strip()
+
+
+def synthetic_frontmatter(n_keys, seed=0):
+    """Obsidian-style frontmatter: the fields the rules act on plus n_keys filler keys."""
+    rng = random.Random(seed)
+    lines = [
+        'title: "Synthetic Post"',
+        'Status: draft' if rng.random() < 0.5 else 'status: idea',
+        'created: "2026-01-01"',
+        'published_date: 2026-02-03',
+        'summary: A synthetic summary',
+        'toc: true',
+        'Tags:',
+        '  - "#python"',
+        '  - sql',
+        '  -  ',
+        'image: cover.jpg',
+        'alt: "A cover image"',
+        'unsplash_name: Jane Doe',
+        'unsplash_user: janedoe',
+        'unsplash_id: abc123',
+        f'series: "{rng.choice(["SQL for Python Developers", "Forging the Truth"])}"',
+        'weight:',
+        'layout: post',
+        'canonical_url: ""',
+    ]
+    for i in range(n_keys):
+        kind = rng.random()
+        if kind < 0.6:
+            lines.append(f'field_{i}: value {rng.randint(0, 10**6)}')
+        elif kind < 0.8:
+            lines.append(f'list_{i}:')
+            lines.extend(f'  - item {j}' for j in range(rng.randint(1, 4)))
+        else:
+            lines.append(f'quoted_{i}: "{rng.choice(["a", "b c", "d: e"])}"')
+    rng.shuffle(lines[1:6])
+    lines.append('draft: false')
+    return '\n'.join(lines)
+
+
+def blog_frontmatters():
+    for path in sorted((BASE_DIR / "content" / "blog").rglob("index.md")):
+        has_fm, fm, _ = detect_existing_frontmatter(path.read_text(encoding='utf-8'))
+        if has_fm:
+            yield path, converter.clean_obsidian_links_from_frontmatter(fm)
+
+
+def check_identical(samples):
+    mismatches = 0
+    for label, fm in samples:
+        if converter.normalize_frontmatter_fields(fm) != legacy_normalize_frontmatter_fields(fm):
+            mismatches += 1
+            print(f"❌ Output differs: {label}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--keys', type=int, nargs='+', default=[50, 200, 800])
+    parser.add_argument('--repeat', type=int, default=200)
+    opts = parser.parse_args()
+
+    posts = list(blog_frontmatters())
+    synthetic = [(f"synthetic keys={n} seed={seed}", synthetic_frontmatter(n, seed))
+                 for n in opts.keys for seed in range(5)]
+    mismatches = check_identical((str(p.relative_to(BASE_DIR)), fm) for p, fm in posts)
+    mismatches += check_identical(synthetic)
+    print(f"✅ Compared {len(posts)} posts and {len(synthetic)} synthetic blocks: {mismatches} mismatch(es)\n")
+
+    print(f"{'keys':>6} {'lines':>6} {'regex cascade':>15} {'single pass':>13} {'speedup':>8}")
+    for n in opts.keys:
+        fm = synthetic_frontmatter(n)
+        old = min(timeit.repeat(lambda: legacy_normalize_frontmatter_fields(fm), number=opts.repeat, repeat=3)) / opts.repeat
+        new = min(timeit.repeat(lambda: converter.normalize_frontmatter_fields(fm), number=opts.repeat, repeat=3)) / opts.repeat
+        print(f"{n:>6} {fm.count(chr(10)) + 1:>6} {old * 1e6:>12.1f} µs {new * 1e6:>10.1f} µs {old / new:>7.1f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+End-to-end converter benchmark on synthetic Obsidian vaults.
+Usage: python benchmarks/vault_bench.py [--scale 1k 10k 100k] [--jobs N] [--seed N]
+                                        [--baseline PATH] [--save-baseline] [--tolerance 0.25] [--check]
+
+Generates a reproducible vault per scale with Faker (drafts with messy
+frontmatter, callouts, code fences and ![[embeds]], finds, and attachments),
+then runs obsidian-to-hugo.py --batch and finds-to-hugo.py --all against a
+scratch copy of the site, cold and again with nothing changed. Wall time,
+peak RSS and per-stage timings (from --timings-json) are recorded and
+compared against a baseline JSON; any run or stage slower or bigger than the
+baseline by more than the tolerance fails the benchmark. With --check, a
+missing baseline (or a run it has no entry for) fails it too.
+"""
+import argparse
+import http.server
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+
+from faker import Faker
+
+BASE_DIR = Path(__file__).parent.parent
+WORK_DIR = BASE_DIR / ".hugo" / "bench"
+DEFAULT_BASELINE = Path(__file__).parent / "vault_baseline.json"
+
+# Share of generated files per kind
+MIX = {'drafts': 0.6, 'finds': 0.2, 'attachments': 0.2}
+
+# Smallest valid PNG (1x1, transparent)
+TINY_PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489'
+    '0000000d49444154789c6300010000000500010d0a2db40000000049454e44ae426082')
+
+# Regressions smaller than this are noise, whatever the percentage
+MIN_WALL_DELTA = 0.05
+MIN_STAGE_DELTA = 0.05
+MIN_RSS_DELTA_MB = 5.0
+
+TAGS = ['python', 'sql', 'duckdb', 'ai', 'llm', 'obsidian', 'hugo', 'data-engineering',
+        'learning', 'productivity', 'aws', 'local-first']
+SERIES = ['SQL for Python Developers', 'Forging the Truth', 'Local First AI', 'AWS Data Engineer Associate Certification']
+CALLOUTS = ['note', 'tip', 'warning', 'info', 'example']
+
+
+def parse_scale(text):
+    text = text.lower()
+    return int(float(text[:-1]) * 1000) if text.endswith('k') else int(text)
+
+
+def draft_note(fake, rng, i, attachments):
+    title = f"{fake.sentence(nb_words=6).rstrip('.')} {i}"
+    tags = rng.sample(TAGS, rng.randint(1, 4))
+    fm = [f'title: "{title}"']
+    fm.append('Tags:' if rng.random() < 0.3 else 'tags:')
+    fm.extend(f'  - "#{t}"' if rng.random() < 0.4 else f'  - {t}' for t in tags)
+    if rng.random() < 0.3:
+        fm.append(f'Series: "{rng.choice(SERIES)}"' if rng.random() < 0.5 else f'series:\n  - "[[{rng.choice(SERIES)}]]"')
+    fm.append(f'status: {rng.choice(["draft", "published", "idea"])}')
+    fm.append(f'published_date: "{fake.date_between("-3y", "today").isoformat()}"')
+    fm.append(f'summary: "{fake.sentence(nb_words=14)}"')
+    fm.append(f'toc: {rng.choice(["true", "false"])}')
+    fm.append('canonical_url: ""')
+    fm.append('layout: post')
+    if attachments and rng.random() < 0.5:
+        fm.append(f'image: {rng.choice(attachments).name}')
+        fm.append(f'alt: "{fake.sentence(nb_words=5)}"')
+        if rng.random() < 0.6:
+            fm.append(f'unsplash_name: {fake.name()}')
+            fm.append(f'unsplash_user: {fake.user_name()}')
+            fm.append(f'unsplash_id: {fake.pystr(min_chars=11, max_chars=11)}')
+
+    body = [f"# {title}", ""]
+    for _ in range(rng.randint(3, 12)):
+        r = rng.random()
+        if r < 0.15:
+            body.append(f"> [!{rng.choice(CALLOUTS)}] {fake.sentence(nb_words=4)}")
+            body.append(f"> {fake.sentence()}")
+        elif r < 0.25:
+            body.append("```python")
+            body.extend(f"{fake.word()} = {rng.randint(0, 999)}  # ![[not-an-embed.png]]" for _ in range(rng.randint(2, 8)))
+            body.append("```")
+        elif r < 0.4 and attachments:
+            name = rng.choice(attachments).name if rng.random() < 0.9 else f"missing-{i}.png"
+            body.append(f"![[{name}|{fake.sentence(nb_words=3)}]]" if rng.random() < 0.5 else f"![[{name}]]")
+        elif r < 0.5:
+            body.append(f"## {fake.sentence(nb_words=4).rstrip('.')}")
+        else:
+            body.append(fake.paragraph(nb_sentences=rng.randint(2, 7)))
+        body.append("")
+    return f"{slug_name(title)}.md", "---\n" + "\n".join(fm) + "\n---\n\n" + "\n".join(body)
+
+
+def find_note(fake, rng, i):
+    title = f"{fake.catch_phrase()} {i}"
+    r = rng.random()
+    if r < 0.2:
+        url = f"https://x.com/{fake.user_name()}/status/{rng.randint(10**17, 10**18)}?s=20"
+    elif r < 0.35:
+        url = f"https://bsky.app/profile/{fake.user_name()}.bsky.social/post/{fake.pystr(min_chars=13, max_chars=13).lower()}"
+    else:
+        url = f"{fake.url()}{fake.slug()}"
+    fm = [
+        'status: idea',
+        f'source_url: "{url}"',
+        f'source_title: "{title}"',
+        f'source_author: "{fake.name()}"',
+        'source_type: "blog post"',
+        f'captured: "{fake.date_between("-2y", "today").isoformat()}"',
+        'tags:',
+        *(f'  - {t}' for t in rng.sample(TAGS, rng.randint(1, 3))),
+        'category: "[[Find]]"',
+    ]
+    body = f"## Why This Caught My Eye\n\n{fake.paragraph(nb_sentences=4)}\n\n{fake.paragraph()}\n"
+    return f"{i:04d}-{slug_name(title)}.md", "---\n" + "\n".join(fm) + "\n---\n\n" + body
+
+
+def slug_name(title):
+    return ''.join(c if c.isalnum() else '-' for c in title.lower()).strip('-')[:60]
+
+
+def generate_vault(root, n_files, seed):
+    """Write a vault of roughly n_files files under root (reused if complete)."""
+    marker = root / ".complete"
+    if marker.exists():
+        return
+    shutil.rmtree(root, ignore_errors=True)
+    fake = Faker()
+    Faker.seed(seed)
+    rng = random.Random(seed)
+
+    n_attach = int(n_files * MIX['attachments'])
+    n_finds = int(n_files * MIX['finds'])
+    n_drafts = n_files - n_attach - n_finds
+
+    attachments = []
+    for i in range(n_attach):
+        folder = root / "attachments" / str(2020 + i % 6) / f"{i % 12 + 1:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"{fake.word()}-{i}.png"
+        path.write_bytes(TINY_PNG)
+        attachments.append(path)
+
+    for kind, count, make in (('_drafts', n_drafts, lambda i: draft_note(fake, rng, i, attachments)),
+                              ('_finds', n_finds, lambda i: find_note(fake, rng, i))):
+        folder = root / kind
+        folder.mkdir(parents=True, exist_ok=True)
+        for i in range(count):
+            name, text = make(i)
+            (folder / name).write_text(text, encoding='utf-8')
+    marker.write_text(json.dumps({'files': n_files, 'seed': seed}))
+
+
+class _StubOEmbed(http.server.BaseHTTPRequestHandler):
+    """Answers every oEmbed request instantly, so finds runs never touch the network."""
+
+    def do_GET(self):
+        url = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query).get('url', [''])[0]
+        body = json.dumps({'html': f'<blockquote class="stub"><a href="{url}">{url}</a></blockquote>'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _StubOEmbed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def prepare_site(site):
+    """A scratch site whose scripts write into its own content/ and .hugo/."""
+    shutil.rmtree(site, ignore_errors=True)
+    (site / "scripts").mkdir(parents=True)
+    for script in (BASE_DIR / "scripts").glob("*.py"):
+        shutil.copy2(script, site / "scripts" / script.name)
+    (site / "content" / "blog").mkdir(parents=True)
+    (site / "content" / "finds").mkdir(parents=True)
+
+
+def run_measured(cmd, env, log_path):
+    """Run cmd; return (exit code, wall seconds, peak RSS in MB of the largest process)."""
+    start = time.perf_counter()
+    with open(log_path, 'wb') as log:
+        proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, env=env)
+        _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return proc.returncode, wall, rss_mb
+
+
+def last_trace(path):
+    try:
+        lines = Path(path).read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return {}
+    return json.loads(lines[-1]).get('stages', {}) if lines else {}
+
+
+def bench_scale(label, n_files, seed, jobs, env):
+    vault = WORK_DIR / f"vault-{label}-{seed}"
+    start = time.perf_counter()
+    generate_vault(vault, n_files, seed)
+    print(f"🏗️  {label}: vault ready in {time.perf_counter() - start:.1f}s ({vault.relative_to(BASE_DIR)})")
+
+    site = WORK_DIR / f"site-{label}"
+    prepare_site(site)
+    scripts = site / "scripts"
+    commands = {
+        'obsidian --batch': [sys.executable, str(scripts / "obsidian-to-hugo.py"), '--batch', str(vault / "_drafts"),
+                             str(vault), '--jobs', str(jobs)],
+        'finds --all': [sys.executable, str(scripts / "finds-to-hugo.py"), '--all', str(vault / "_finds"),
+                        '--jobs', str(jobs)],
+    }
+
+    results = {}
+    for name, cmd in commands.items():
+        for phase in ('cold', 'warm'):
+            key = f"{label}/{name} ({phase})"
+            trace = site / f"trace-{len(results)}.jsonl"
+            code, wall, rss = run_measured(cmd + ['--timings-json', str(trace)], env, site / f"log-{len(results)}.txt")
+            results[key] = {'wall_s': round(wall, 4), 'peak_rss_mb': round(rss, 1), 'exit': code,
+                            'stages': {k: round(v['seconds'], 4) for k, v in last_trace(trace).items()}}
+            status = "✅" if code == 0 else f"❌ exit {code} (see {site.relative_to(BASE_DIR)}/log-{len(results) - 1}.txt)"
+            print(f"   {key:<36} {wall:>8.2f}s {rss:>8.1f} MB  {status}")
+    return results
+
+
+def compare(results, baseline, tolerance, check=False):
+    """Return the list of regressions vs. the baseline: wall time, peak RSS and
+    each stage's seconds. With check, runs the baseline lacks count too."""
+    regressions = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if not base:
+            if check:
+                regressions.append(f"{key}: not in baseline")
+            continue
+        metrics = [('wall_s', base['wall_s'], r['wall_s'], MIN_WALL_DELTA),
+                   ('peak_rss_mb', base['peak_rss_mb'], r['peak_rss_mb'], MIN_RSS_DELTA_MB)]
+        metrics += [(f"stage {stage}", old, r['stages'][stage], MIN_STAGE_DELTA)
+                    for stage, old in sorted(base.get('stages', {}).items()) if stage in r['stages']]
+        for metric, old, new, floor in metrics:
+            if new > old * (1 + tolerance) and new - old > floor:
+                change = f"+{(new / old - 1):.0%}" if old else "new"
+                regressions.append(f"{key}: {metric} {new} vs baseline {old} ({change}, tolerance {tolerance:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the converters on synthetic vaults.")
+    parser.add_argument('--scale', nargs='+', default=['1k'], help="vault sizes in files, e.g. 1k 10k 100k (default: 1k)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="write these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown/growth (default: 0.25 = 25%%)")
+    parser.add_argument('--output', type=Path, help="also write the results JSON here")
+    parser.add_argument('--check', action='store_true',
+                        help="fail if there is no baseline, or no baseline entry for a run (for CI)")
+    opts = parser.parse_args()
+
+    server = start_stub_server()
+    env = dict(os.environ)
+    stub = f"http://127.0.0.1:{server.server_address[1]}"
+    env['OEMBED_X_ENDPOINT'] = f"{stub}/x"
+    env['OEMBED_BLUESKY_ENDPOINT'] = f"{stub}/bluesky"
+
+    results = {}
+    for label in opts.scale:
+        results.update(bench_scale(label, parse_scale(label), opts.seed, opts.jobs, env))
+    server.shutdown()
+
+    print("\nPer-stage seconds (cold runs):")
+    for key, r in results.items():
+        if key.endswith('(cold)') and r['stages']:
+            stages = sorted(r['stages'].items(), key=lambda kv: kv[1], reverse=True)
+            print(f"   {key}: " + ", ".join(f"{k} {v:.2f}" for k, v in stages))
+
+    if opts.output:
+        opts.output.write_text(json.dumps(results, indent=1) + "\n")
+
+    failed = [k for k, r in results.items() if r['exit'] != 0]
+    try:
+        baseline = json.loads(opts.baseline.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        baseline = None
+
+    if opts.save_baseline:
+        merged = {**(baseline or {}), **results}
+        opts.baseline.write_text(json.dumps(merged, indent=1, sort_keys=True) + "\n")
+        print(f"\n💾 Baseline saved to {opts.baseline}")
+    elif baseline is None:
+        if opts.check:
+            print(f"\n❌ No baseline at {opts.baseline}; run with --save-baseline to create one")
+            failed.append('baseline')
+        else:
+            print(f"\nℹ️  No baseline at {opts.baseline}; run with --save-baseline to create one")
+    else:
+        regressions = compare(results, baseline, opts.tolerance, opts.check)
+        if regressions:
+            print(f"\n❌ {len(regressions)} REGRESSION(S) vs {opts.baseline.name}:")
+            for line in regressions:
+                print(f"   {line}")
+            failed.append('regressions')
+        else:
+            print(f"\n✅ Within {opts.tolerance:.0%} of {opts.baseline.name}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
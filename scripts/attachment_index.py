@@ -0,0 +1,130 @@
+"""
+Persistent index of Obsidian vault attachments, keyed by file name.
+
+One walk of the vault maps every file name to the path(s) it lives at. The
+index is saved to disk together with each directory's mtime, so later runs
+only re-list directories whose entries were added, removed or renamed.
+"""
+import json
+import os
+import time
+from pathlib import Path, PurePosixPath
+
+INDEX_VERSION = 1
+
+
+class AttachmentIndex:
+    """File name -> vault-relative paths, refreshed incrementally by directory mtime."""
+
+    def __init__(self, vault_path, cache_path=None):
+        self.vault_path = Path(vault_path)
+        self.cache_path = Path(cache_path) if cache_path else None
+        # rel dir ("" for the vault root) -> {"mtime": ns, "files": [...], "subdirs": [...]}
+        self.dirs = {}
+        self.by_name = {}
+        self.hits = 0
+        self.misses = 0
+        self.walk_seconds = 0.0
+        self.rescanned = 0
+        self._dirty = False
+
+    @classmethod
+    def load(cls, vault_path, cache_path):
+        """Load a saved index for this vault (if any) and bring it up to date."""
+        index = cls(vault_path, cache_path)
+        try:
+            data = json.loads(Path(cache_path).read_text(encoding='utf-8'))
+            if data.get('version') == INDEX_VERSION and data.get('vault') == str(index.vault_path.resolve()):
+                index.dirs = data.get('dirs', {})
+        except (OSError, ValueError):
+            pass
+        index.refresh()
+        return index
+
+    def refresh(self):
+        """Walk the vault, re-listing only directories whose mtime changed."""
+        start = time.perf_counter()
+        old = self.dirs
+        new = {}
+        self.rescanned = 0
+        stack = ['']
+        while stack:
+            rel = stack.pop()
+            full = self.vault_path / rel if rel else self.vault_path
+            try:
+                mtime = os.stat(full).st_mtime_ns
+            except OSError:
+                continue
+            entry = old.get(rel)
+            if entry is None or entry['mtime'] != mtime:
+                entry = self._scan_dir(full, mtime)
+                if entry is None:
+                    continue
+                self.rescanned += 1
+            new[rel] = entry
+            stack.extend(f"{rel}/{d}" if rel else d for d in entry['subdirs'])
+
+        if self.rescanned or new.keys() != old.keys():
+            self._dirty = True
+        self.dirs = new
+        self._build_name_map()
+        self.walk_seconds = time.perf_counter() - start
+
+    @staticmethod
+    def _scan_dir(full, mtime):
+        files, subdirs = [], []
+        try:
+            with os.scandir(full) as it:
+                for entry in it:
+                    # Skip .obsidian, .trash, .git and friends
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+        except OSError:
+            return None
+        return {'mtime': mtime, 'files': sorted(files), 'subdirs': sorted(subdirs)}
+
+    def _build_name_map(self):
+        by_name = {}
+        for rel in sorted(self.dirs):
+            for name in self.dirs[rel]['files']:
+                by_name.setdefault(name, []).append(f"{rel}/{name}" if rel else name)
+        self.by_name = by_name
+
+    def lookup(self, name):
+        """Return the vault path for a referenced attachment, or None.
+
+        `name` may be a bare file name or a relative path such as
+        `attachments/diagram.png`; in the latter case the match must end with it.
+        """
+        parts = PurePosixPath(name).parts
+        if not parts or PurePosixPath(name).is_absolute() or '..' in parts:
+            self.misses += 1
+            return None
+        suffix = '/'.join(parts)
+        for rel in self.by_name.get(parts[-1], ()):
+            if len(parts) == 1 or rel == suffix or rel.endswith('/' + suffix):
+                path = self.vault_path / rel
+                if path.is_file():
+                    self.hits += 1
+                    return path
+        self.misses += 1
+        return None
+
+    def save(self):
+        """Persist the index if the last refresh changed anything."""
+        if not self.cache_path or not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': INDEX_VERSION, 'vault': str(self.vault_path.resolve()), 'dirs': self.dirs}
+        tmp = self.cache_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(data, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, self.cache_path)
+        self._dirty = False
+
+    def stats_line(self):
+        return (f"📇 Attachment index: {self.hits} hit(s), {self.misses} miss(es), "
+                f"{len(self.dirs)} dirs walked ({self.rescanned} rescanned) in {self.walk_seconds:.2f}s")
@@ -0,0 +1,109 @@
+"""
+Content-addressed store for bundle images.
+
+Every image placed into a page bundle is first put in .hugo/attachment-store/
+under its sha256, and the bundle gets a reflink (copy-on-write clone) of that
+object where the filesystem supports it, otherwise a plain copy. A series
+banner used by twenty posts is then stored once on disk on btrfs or XFS.
+
+Bundle images are never hardlinked: each stays an ordinary writable file that
+can be edited in place without touching the store or other bundles, and the
+working tree never depends on the (gitignored) store.
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from convert_manifest import file_hash
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'}
+
+# ioctl(dest_fd, FICLONE, src_fd) clones a file on btrfs, XFS, bcachefs, ...
+FICLONE = 0x40049409
+
+
+def _reflink(src, dest):
+    if fcntl is None or not hasattr(fcntl, 'ioctl'):
+        raise OSError("reflinks not supported")
+    with open(src, 'rb') as s, open(dest, 'wb') as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+
+
+class AttachmentStore:
+    """Images by content hash, cloned into bundles."""
+
+    METHODS = ('reflink', 'copy')
+
+    def __init__(self, root):
+        self.root = Path(root)
+        # st_dev of a bundle folder -> first method that worked there
+        self._methods = {}
+        self.placed = dict.fromkeys(self.METHODS, 0)
+
+    def object_path(self, digest, suffix):
+        return self.root / digest[:2] / f"{digest}{suffix.lower()}"
+
+    def put(self, src, digest=None):
+        """The store object holding src's bytes, adding it if missing."""
+        src = Path(src)
+        obj = self.object_path(digest or file_hash(src), src.suffix)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=obj.parent, suffix='.tmp')
+            os.close(fd)
+            shutil.copyfile(src, tmp)
+            os.chmod(tmp, 0o444)
+            # Another process may have added the same object; either copy is fine
+            os.replace(tmp, obj)
+        return obj
+
+    def link(self, obj, dest):
+        """Replace dest with a writable reflink (or, failing that, a copy) of obj.
+        Returns the method used."""
+        dest = Path(dest)
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix='.tmp')
+        os.close(fd)
+        os.unlink(tmp)
+        device = os.stat(dest.parent).st_dev
+        methods = self.METHODS[self.METHODS.index(self._methods[device]):] if device in self._methods else self.METHODS
+        for method in methods:
+            try:
+                if method == 'reflink':
+                    _reflink(obj, tmp)
+                else:
+                    shutil.copyfile(obj, tmp)
+            except OSError:
+                if os.path.lexists(tmp):
+                    os.unlink(tmp)
+                continue
+            self._methods.setdefault(device, method)
+            os.replace(tmp, dest)
+            self.placed[method] += 1
+            return method
+        raise OSError(f"could not place {dest}")
+
+    def place(self, src, dest, src_hash=None):
+        """Put src into the store and link dest to it (copy_if_changed's drop-in).
+        A dest that already has these bytes is left alone, so its mtime is
+        kept; dedupe-images.py --compact re-links those. Returns True if dest
+        was replaced."""
+        dest = Path(dest)
+        digest = src_hash or file_hash(src)
+        obj = self.put(src, digest)
+        try:
+            if dest.stat().st_size == obj.stat().st_size and file_hash(dest) == digest:
+                return False
+        except OSError:
+            pass
+        self.link(obj, dest)
+        return True
+
+    def stats_line(self):
+        placed = ', '.join(f"{n} {method}" for method, n in self.placed.items() if n)
+        return f"🗃️  Attachment store: {placed or 'nothing placed'}"
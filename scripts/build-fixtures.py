@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Build .hugo/fixtures.duckdb, the database validate-code-blocks.py attaches.
+Usage: python build-fixtures.py [--scale ROWS] [--seed N]
+
+Without --scale the tables are the ones blog-validate-helpers/_global_data.py
+creates. With --scale (e.g. 2m) customers/orders have that many customers,
+and three orders each, for timing the SQL examples on large tables; run it
+again without --scale to go back. validate-code-blocks.py rebuilds the file
+by itself when _global_data.py changes.
+"""
+import argparse
+from pathlib import Path
+
+import fixture_db
+
+BASE_DIR = Path(__file__).parent.parent
+FIXTURE_DB_PATH = BASE_DIR / ".hugo" / "fixtures.duckdb"
+GLOBAL_DATA_PATH = BASE_DIR / "blog-validate-helpers" / "_global_data.py"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the code-block validation fixtures.")
+    parser.add_argument('--scale', type=fixture_db.parse_scale, metavar='ROWS',
+                        help="generate this many customers with faker (e.g. 100k, 2m)")
+    parser.add_argument('--seed', type=int, default=0, help="with --scale: random seed (default: 0)")
+    opts = parser.parse_args()
+    fixture_db.build(FIXTURE_DB_PATH, GLOBAL_DATA_PATH, opts.scale, opts.seed)
+
+
+if __name__ == "__main__":
+    main()
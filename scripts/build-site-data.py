@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Write data/series.json and data/related.json for the series and related-posts partials.
+Usage: python build-site-data.py [--force]
+
+Only bundles changed since the last run are re-read (the cache is in .hugo/),
+and the data files are only rewritten when they change. obsidian-to-hugo.py
+and finds-to-hugo.py run this by themselves after writing a bundle.
+"""
+import argparse
+from pathlib import Path
+
+import site_data
+
+BASE_DIR = Path(__file__).parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the series and related-posts data files.")
+    parser.add_argument('--force', action='store_true', help="re-read every bundle")
+    opts = parser.parse_args()
+    if not site_data.update(BASE_DIR, opts.force):
+        print("✅ Site data is up to date")
+
+
+if __name__ == "__main__":
+    main()
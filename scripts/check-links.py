@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Check the outbound links in every post and find.
+Usage: python check-links.py [--force] [--ttl DAYS] [--per-host N] [--interval SECONDS]
+
+Every URL in content/ is collected in one pass and checked concurrently (HEAD,
+then GET if HEAD is refused). Results are cached in .hugo/link-check-cache.json,
+so a daily run only rechecks links whose result is older than --ttl days
+(failures after one day). Exits with 1 if any link is broken.
+
+--content and --cache point it at another folder and cache file, e.g. a
+scratch folder linking to a local stub server (use --include-local).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from link_check import DEFAULT_TTL, LinkCache, check_links, collect_links
+
+BASE_DIR = Path(__file__).parent.parent
+CONTENT_DIR = BASE_DIR / "content"
+CACHE_PATH = BASE_DIR / ".hugo" / "link-check-cache.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check outbound links in posts and finds.")
+    parser.add_argument('--force', action='store_true', help="recheck every link, ignoring the cache")
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL / 86400, metavar='DAYS',
+                        help="recheck good links after DAYS days (default: %(default)g)")
+    parser.add_argument('--per-host', type=int, default=2, metavar='N', help="concurrent requests per host (default: 2)")
+    parser.add_argument('--interval', type=float, default=0.5, metavar='SECONDS',
+                        help="minimum time between requests to one host (default: 0.5)")
+    parser.add_argument('--timeout', type=float, default=15, help="per-request timeout in seconds (default: 15)")
+    parser.add_argument('--include-local', action='store_true', help="also check localhost and example.com links")
+    parser.add_argument('--content', type=Path, default=CONTENT_DIR, metavar='DIR', help="content folder (default: content/)")
+    parser.add_argument('--cache', type=Path, default=CACHE_PATH, metavar='FILE',
+                        help="result cache (default: .hugo/link-check-cache.json)")
+    opts = parser.parse_args()
+
+    start = time.perf_counter()
+    links = collect_links(opts.content, opts.include_local)
+    pages = {page for found_in in links.values() for page in found_in}
+    print(f"🔍 {len(links)} link(s) in {len(pages)} page(s)")
+
+    cache = LinkCache(opts.cache, ttl=opts.ttl * 86400)
+    cache.prune(links)
+    try:
+        results, cached = check_links(links, cache, opts.timeout, max(1, opts.per_host), opts.interval, opts.force)
+    finally:
+        cache.save()
+
+    broken = sorted(url for url, result in results.items() if not result['ok'])
+    print(f"📊 Links: {len(results) - len(broken)} ok, {len(broken)} broken "
+          f"({len(results) - cached} checked, {cached} cached) in {time.perf_counter() - start:.2f}s")
+    for url in broken:
+        result = results[url]
+        print(f"   ❌ {result['status'] or result['error']}  {url}")
+        for page in links[url]:
+            print(f"         ← {page}")
+    if broken:
+        sys.exit(1)
+    print("🎉 All links OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Build and query a columnar index of the site's page bundles.
+Usage: python content-index.py [build] [--force]
+       python content-index.py query [--section blog] [--tag T] [--series S] [--drafts]
+                                     [--older-than DAYS] [--sort FIELD] [--ascending] [--limit N] [--json]
+
+The index lives in .hugo/content-index.parquet with one row per index.md
+under content/. Rebuilds only re-parse bundles whose mtime or size changed,
+and leave the file untouched when nothing did.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from content_bundles import read_bundle, scan_bundles
+
+BASE_DIR = Path(__file__).parent.parent
+CONTENT_DIR = BASE_DIR / "content"
+INDEX_PATH = BASE_DIR / ".hugo" / "content-index.parquet"
+INDEX_VERSION = b'1'
+
+SCHEMA = pa.schema([
+    ('path', pa.string()),
+    ('section', pa.string()),
+    ('slug', pa.string()),
+    ('title', pa.string()),
+    ('date', pa.date32()),
+    ('draft', pa.bool_()),
+    ('tags', pa.list_(pa.string())),
+    ('series', pa.list_(pa.string())),
+    ('cover', pa.string()),
+    ('word_count', pa.int32()),
+    ('mtime_ns', pa.int64()),
+    ('size', pa.int64()),
+], metadata={b'content_index_version': INDEX_VERSION})
+
+
+def index_bundle(content_dir, rel, mtime_ns, size):
+    """One index row for a bundle's index.md."""
+    row = read_bundle(content_dir, rel)
+    parts = rel.split('/')
+    row['slug'] = row['slug'] or (parts[-2] if len(parts) > 1 else '')
+    row['mtime_ns'] = mtime_ns
+    row['size'] = size
+    return row
+
+
+def load_index(index_path, columns=None):
+    """Read the saved index, or None if it's missing or from another version."""
+    # ParquetFile rather than pq.read_table: the latter pulls in
+    # pyarrow.dataset, which costs more to import than a no-op rebuild takes
+    try:
+        parquet = pq.ParquetFile(index_path)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if (parquet.schema_arrow.metadata or {}).get(b'content_index_version') != INDEX_VERSION:
+        return None
+    return parquet.read(columns=columns)
+
+
+def build_index(content_dir=CONTENT_DIR, index_path=INDEX_PATH, force=False):
+    """Bring the index up to date. Returns (parsed, removed, total)."""
+    current = scan_bundles(content_dir)
+    saved = None if force else load_index(index_path, columns=['path', 'mtime_ns', 'size'])
+    old = {}
+    if saved is not None:
+        cols = saved.to_pydict()
+        old = {p: (m, s) for p, m, s in zip(cols['path'], cols['mtime_ns'], cols['size'])}
+
+    unchanged = [p for p, stamp in old.items() if current.get(p) == stamp]
+    changed = sorted(p for p in current if old.get(p) != current[p])
+    removed = len(old.keys() - current.keys())
+    if not changed and not removed and saved is not None:
+        return 0, 0, len(current)
+
+    rows = pa.Table.from_pylist([index_bundle(content_dir, p, *current[p]) for p in changed], schema=SCHEMA)
+    if unchanged:
+        full = load_index(index_path)
+        kept = full.filter(pc.is_in(full['path'], value_set=pa.array(unchanged)))
+        rows = pa.concat_tables([kept.cast(SCHEMA), rows])
+    rows = rows.sort_by('path')
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index_path.with_suffix('.tmp')
+    pq.write_table(rows, tmp)
+    os.replace(tmp, index_path)
+    return len(changed), removed, len(current)
+
+
+def query_rows(rows, section=None, tag=None, series=None, drafts=False, older_than=None):
+    """Filter index rows (as dicts) by the query options."""
+    cutoff = date.today() - timedelta(days=older_than) if older_than is not None else None
+    for row in rows:
+        if section and row['section'] != section:
+            continue
+        if tag and tag.lower() not in (t.lower() for t in row['tags']):
+            continue
+        if series and series.lower() not in (s.lower() for s in row['series']):
+            continue
+        if drafts and not row['draft']:
+            continue
+        if cutoff and (row['date'] is None or row['date'] >= cutoff):
+            continue
+        yield row
+
+
+def print_rows(rows):
+    for row in rows:
+        when = row['date'].isoformat() if row['date'] else '----------'
+        flag = 'D' if row['draft'] else ' '
+        print(f"{when} {flag} {row['section']}/{row['slug']:<48} {row['title']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the content index.")
+    parser.add_argument('--force', action='store_true', help="re-parse every bundle")
+    sub = parser.add_subparsers(dest='command')
+    b = sub.add_parser('build', help="update .hugo/content-index.parquet (default)")
+    # SUPPRESS so `--force build` isn't reset by the subcommand's default
+    b.add_argument('--force', action='store_true', default=argparse.SUPPRESS, help="re-parse every bundle")
+    q = sub.add_parser('query', help="list bundles matching filters")
+    q.add_argument('--section', help="blog, finds, ...")
+    q.add_argument('--tag')
+    q.add_argument('--series')
+    q.add_argument('--drafts', action='store_true', help="only drafts")
+    q.add_argument('--older-than', type=int, metavar='DAYS', help="dated more than DAYS ago")
+    q.add_argument('--sort', default='date', choices=[f.name for f in SCHEMA], help="sort field (default: date)")
+    q.add_argument('--ascending', action='store_true', help="smallest / oldest first (default: largest / newest first)")
+    q.add_argument('--limit', type=int)
+    q.add_argument('--json', action='store_true', help="print matching rows as JSON")
+    opts = parser.parse_args()
+
+    start = time.perf_counter()
+    parsed, removed, total = build_index(force=opts.force)
+
+    if opts.command != 'query':
+        print(f"📇 Content index: {total} bundle(s), {parsed} parsed, {removed} removed "
+              f"in {time.perf_counter() - start:.3f}s -> {INDEX_PATH.relative_to(BASE_DIR)}")
+        return
+
+    table = load_index(INDEX_PATH)
+    rows = list(query_rows(table.to_pylist(), opts.section, opts.tag, opts.series, opts.drafts, opts.older_than))
+    # Rows without a value for the sort field go last either way
+    present = [r for r in rows if r[opts.sort] is not None]
+    present.sort(key=lambda r: r[opts.sort], reverse=not opts.ascending)
+    rows = present + [r for r in rows if r[opts.sort] is None]
+    if opts.limit:
+        rows = rows[:opts.limit]
+
+    if opts.json:
+        json.dump(rows, sys.stdout, default=str, indent=1)
+        print()
+    else:
+        print_rows(rows)
+        print(f"\n{len(rows)} bundle(s)")
+
+
+if __name__ == "__main__":
+    main()
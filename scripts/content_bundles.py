@@ -0,0 +1,64 @@
+"""
+Finding and reading the page bundles under content/.
+
+Shared by content-index.py and the site data files (site_data.py).
+"""
+import os
+from datetime import date
+
+from frontmatter_fields import detect_existing_frontmatter, extract_list, extract_nested_scalar, extract_scalar
+
+
+def scan_bundles(content_dir):
+    """Every index.md under content_dir as {relative posix path: (mtime_ns, size)}."""
+    found = {}
+    stack = ['']
+    while stack:
+        rel = stack.pop()
+        try:
+            with os.scandir(content_dir / rel if rel else content_dir) as it:
+                for entry in it:
+                    child = f"{rel}/{entry.name}" if rel else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(child)
+                    elif entry.name == 'index.md':
+                        st = entry.stat()
+                        found[child] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            continue
+    return found
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def read_bundle(content_dir, rel):
+    """The frontmatter fields of a bundle's index.md, plus its section and word count.
+    `slug` is the frontmatter value ('' when the bundle has none); `series_scalar`
+    is the series when it is given as a single value rather than a list."""
+    content = (content_dir / rel).read_text(encoding='utf-8')
+    _, fm, body = detect_existing_frontmatter(content)
+    parts = rel.split('/')
+    series = extract_list(fm, 'series')
+    scalar = None
+    if not series:
+        scalar = extract_scalar(fm, 'series') or None
+        series = [scalar] if scalar else []
+    return {
+        'path': rel,
+        'section': parts[0] if len(parts) > 1 else '',
+        'slug': extract_scalar(fm, 'slug'),
+        'title': extract_scalar(fm, 'title'),
+        'date': parse_date(extract_scalar(fm, 'date')),
+        'draft': extract_scalar(fm, 'draft').lower() == 'true',
+        'tags': extract_list(fm, 'tags'),
+        'aliases': extract_list(fm, 'aliases'),
+        'series': series,
+        'series_scalar': scalar,
+        'cover': extract_nested_scalar(fm, 'cover', 'image') or None,
+        'word_count': len(body.split()),
+    }
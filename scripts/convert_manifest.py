@@ -0,0 +1,222 @@
+"""
+Conversion manifest: skip notes and images that have not changed.
+
+Each converter keeps a small JSON manifest under .hugo/ that records, per
+source note, the content hash of the note, the images copied with it, the
+bundle file it produced and that file's hash. A note whose inputs, output and
+converter (the script and the modules it imports from scripts/) are all
+unchanged is skipped entirely; otherwise outputs and
+images are only written when their bytes differ, so mtimes Hugo watches are
+left alone.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+
+def bytes_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path):
+    """sha256 of a file, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_if_changed(path, text):
+    """Write text to path unless the file already holds exactly these bytes.
+    Returns True if the file was written."""
+    path = Path(path)
+    data = text.encode('utf-8')
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def write_stream_if_changed(path, chunks):
+    """Stream byte chunks into path unless it already holds exactly these bytes.
+    The new content goes to a temp file first, so memory stays bounded.
+    Returns (written, sha256 of the content)."""
+    path = Path(path)
+    tmp = path.with_name(path.name + '.tmp')
+    h = hashlib.sha256()
+    with open(tmp, 'wb') as f:
+        for chunk in chunks:
+            h.update(chunk)
+            f.write(chunk)
+    digest = h.hexdigest()
+    try:
+        unchanged = path.stat().st_size == tmp.stat().st_size and file_hash(path) == digest
+    except OSError:
+        unchanged = False
+    if unchanged:
+        tmp.unlink()
+        return False, digest
+    os.replace(tmp, path)
+    return True, digest
+
+
+def copy_if_changed(src, dest, src_hash=None):
+    """copy2 src to dest unless dest already has the same content.
+    dest is replaced, not written in place, so a reader never sees a half
+    written file. Returns True if the file was copied."""
+    src, dest = Path(src), Path(dest)
+    try:
+        if dest.stat().st_size == src.stat().st_size and file_hash(dest) == (src_hash or file_hash(src)):
+            return False
+    except OSError:
+        pass
+    tmp = dest.with_name(dest.name + '.tmp')
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dest)
+    return True
+
+
+def tool_hash(tool_path):
+    """Hash of a converter script and of every module it has loaded from the
+    same folder, so editing a shared helper (frontmatter_fields, wiki_links,
+    site_data, ...) counts as a change to the converter."""
+    folder = Path(tool_path).resolve().parent
+    files = {Path(tool_path).resolve()}
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if path and path.endswith('.py') and Path(path).resolve().parent == folder:
+            files.add(Path(path).resolve())
+    h = hashlib.sha256()
+    for path in sorted(files):
+        h.update(f"{path.name}:{file_hash(path)}\n".encode('utf-8'))
+    return h.hexdigest()
+
+
+class ConvertManifest:
+    """Per-note record of input and output hashes for one converter script."""
+
+    def __init__(self, path, tool_path, force=False, settings=None):
+        self.path = Path(path)
+        self.force = force
+        # Any edit to the converter or the modules it imports, or to settings
+        # that change its output (e.g. image optimization), invalidates every entry
+        self.tool = tool_hash(tool_path)
+        if settings:
+            self.tool = bytes_hash(f"{self.tool}:{json.dumps(settings, sort_keys=True)}".encode('utf-8'))
+        self.notes = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path, tool_path, force=False, settings=None):
+        manifest = cls(path, tool_path, force, settings)
+        try:
+            data = json.loads(Path(path).read_text(encoding='utf-8'))
+            if data.get('version') == MANIFEST_VERSION:
+                manifest.notes = data.get('notes', {})
+        except (OSError, ValueError):
+            pass
+        return manifest
+
+    @staticmethod
+    def key(source_path):
+        return str(Path(source_path).resolve())
+
+    def image_hash(self, key, image_path):
+        """Hash of an image, reusing the recorded hash while size and mtime match."""
+        st = os.stat(image_path)
+        recorded = self.notes.get(key, {}).get('images', {}).get(str(image_path))
+        if recorded and recorded['size'] == st.st_size and recorded['mtime'] == st.st_mtime_ns:
+            return recorded['hash']
+        return file_hash(image_path)
+
+    @staticmethod
+    def image_entry(image_path, digest, dest, local=True):
+        """Manifest record for an image copied into the bundle as `dest`.
+        `local` marks images from the note's own folder (vs. found in the vault)."""
+        st = os.stat(image_path)
+        return {'size': st.st_size, 'mtime': st.st_mtime_ns, 'hash': digest, 'dest': dest, 'local': local}
+
+    def is_fresh(self, key, source_hash, images=None, inputs=None):
+        """True if the note, its images and its output are exactly as last recorded.
+
+        `images` maps source image path -> current hash; every recorded image
+        must still be present with the same hash and its copy must exist.
+        `inputs` are the other arguments the output depends on (e.g. the
+        slug it was converted under); they must match the recorded ones.
+        """
+        if self.force:
+            return False
+        entry = self.notes.get(key)
+        if not entry or entry.get('tool') != self.tool or entry.get('source') != source_hash:
+            return False
+        if entry.get('inputs', {}) != (inputs or {}) or entry.get('pending'):
+            return False
+        output = Path(entry['output'])
+        try:
+            if file_hash(output) != entry['output_hash']:
+                return False
+        except OSError:
+            return False
+        recorded = entry.get('images', {})
+        if images is not None and set(images) != {p for p, r in recorded.items() if r.get('local')}:
+            return False
+        for src, rec in recorded.items():
+            current = (images or {}).get(src)
+            if current is None:
+                try:
+                    current = self.image_hash(key, src)
+                except OSError:
+                    return False
+            if current != rec['hash'] or not (output.parent / rec['dest']).exists():
+                return False
+        return True
+
+    def record(self, key, source_hash, output_path, output_hash, images=None, links=None, inputs=None,
+               pending=None):
+        """Remember what a note produced. `images` maps source path -> image_entry(),
+        `links` maps each wiki link target to where it resolved (None if it didn't),
+        `inputs` are the arguments is_fresh() compares. `pending` lists what the
+        output is still missing (e.g. an embed that couldn't be fetched); such a
+        note is never fresh, so the next run tries again."""
+        self.notes[key] = {
+            'tool': self.tool,
+            'source': source_hash,
+            'output': str(Path(output_path).resolve()),
+            'output_hash': output_hash,
+            'images': images or {},
+        }
+        if links:
+            self.notes[key]['links'] = links
+        if inputs:
+            self.notes[key]['inputs'] = inputs
+        if pending:
+            self.notes[key]['pending'] = sorted(pending)
+        self._dirty = True
+
+    def is_pending(self, key):
+        """True if the note's output was recorded as missing something."""
+        return bool(self.notes.get(key, {}).get('pending'))
+
+    def merge(self, key, entry):
+        """Adopt an entry recorded by a pool worker."""
+        if entry is not None:
+            self.notes[key] = entry
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'version': MANIFEST_VERSION, 'notes': self.notes}, indent=1), encoding='utf-8')
+        os.replace(tmp, self.path)
+        self._dirty = False
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Report duplicate and unreferenced images in content/ page bundles.
+Usage: python dedupe-images.py [--compact] [--limit N]
+
+Identical images in several bundles (series banners, logos, author photos)
+are grouped by content hash, with the space they waste. --compact replaces
+the copies with reflinks of one object in .hugo/attachment-store/ (on
+filesystems without reflinks they stay copies, see attachment_store.py), the
+same way obsidian-to-hugo.py places new images. It also turns images that
+are hardlinked elsewhere back into files of their own. Images no index.md
+mentions are listed but never deleted.
+"""
+import argparse
+import os
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from attachment_store import IMAGE_EXTS, AttachmentStore
+from convert_manifest import file_hash
+from timings import human_bytes
+
+BASE_DIR = Path(__file__).parent.parent
+CONTENT_DIR = BASE_DIR / "content"
+ATTACHMENT_STORE_DIR = BASE_DIR / ".hugo" / "attachment-store"
+
+TMP_RE = re.compile(r'^\..*\.tmp$')
+
+
+def scan_images(content_dir):
+    """Every image under content_dir (dot-folders and temp files skipped)."""
+    images = []
+    for root, dirs, files in os.walk(content_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTS and not TMP_RE.match(name):
+                images.append(Path(root) / name)
+    return sorted(images)
+
+
+def duplicate_groups(images):
+    """{sha256: [paths]} for content shared by more than one file. Only files
+    whose size matches another file's are hashed."""
+    by_size = {}
+    for path in images:
+        by_size.setdefault(path.stat().st_size, []).append(path)
+    groups = {}
+    for paths in by_size.values():
+        if len(paths) < 2:
+            continue
+        for path in paths:
+            groups.setdefault(file_hash(path), []).append(path)
+    return {digest: paths for digest, paths in groups.items() if len(paths) > 1}
+
+
+def wasted_bytes(paths):
+    """Bytes taken by copies beyond the first (files already linked count once)."""
+    inodes = {(st.st_dev, st.st_ino) for st in map(os.stat, paths)}
+    return os.stat(paths[0]).st_size * (len(inodes) - 1)
+
+
+def unreferenced(images, content_dir):
+    """Images in a bundle whose index.md never mentions them."""
+    texts = {}
+    found = []
+    for path in images:
+        bundle = path.parent
+        while bundle != content_dir and not (bundle / "index.md").exists():
+            bundle = bundle.parent
+        if bundle == content_dir:
+            continue
+        if bundle not in texts:
+            texts[bundle] = (bundle / "index.md").read_text(encoding='utf-8')
+        rel = path.relative_to(bundle).as_posix()
+        if rel not in texts[bundle] and quote(rel) not in texts[bundle]:
+            found.append(path)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report (and link together) duplicate bundle images.")
+    parser.add_argument('--compact', action='store_true', help="replace duplicate copies with links into the attachment store")
+    parser.add_argument('--limit', type=int, default=10, help="duplicate groups / unreferenced images to list (default: 10)")
+    opts = parser.parse_args()
+
+    images = scan_images(CONTENT_DIR)
+    total = sum(p.stat().st_size for p in images)
+    groups = duplicate_groups(images)
+    waste = {digest: wasted_bytes(paths) for digest, paths in groups.items()}
+    print(f"🖼️  {len(images)} image(s), {human_bytes(total)} in {CONTENT_DIR.relative_to(BASE_DIR)}/")
+    print(f"🧮 {len(groups)} duplicated image(s) in {sum(len(p) for p in groups.values())} files, "
+          f"{human_bytes(sum(waste.values()))} reclaimable")
+    for digest in sorted(groups, key=lambda d: -waste[d])[:opts.limit]:
+        paths = groups[digest]
+        print(f"   {human_bytes(waste[digest]):>9}  {paths[0].name} × {len(paths)}")
+        for path in paths:
+            print(f"              {path.relative_to(BASE_DIR)}")
+
+    orphans = unreferenced(images, CONTENT_DIR)
+    if orphans:
+        print(f"👻 {len(orphans)} image(s) not mentioned in their bundle's index.md "
+              f"({human_bytes(sum(p.stat().st_size for p in orphans))}), e.g.:")
+        for path in orphans[:opts.limit]:
+            print(f"   {path.relative_to(BASE_DIR)}")
+
+    if not opts.compact:
+        if any(waste.values()):
+            print("\nRun with --compact to link the duplicates together")
+        return
+
+    store = AttachmentStore(ATTACHMENT_STORE_DIR)
+    relinked = reclaimed = 0
+    for digest, paths in groups.items():
+        if not waste[digest]:
+            continue
+        new_object = not store.object_path(digest, paths[0].suffix).exists()
+        obj = store.put(paths[0], digest)
+        for path in paths:
+            relinked += 1
+            if store.link(obj, path) != 'copy':
+                reclaimed += obj.stat().st_size
+        # A new store object is the one copy that stays
+        if new_object:
+            reclaimed -= obj.stat().st_size
+
+    # Hardlinked images (as older versions placed them) become files of their own
+    unlinked = 0
+    for path in images:
+        if path.stat().st_nlink > 1:
+            store.link(store.put(path), path)
+            unlinked += 1
+    print(f"\n🗜️  Re-linked {relinked} file(s), reclaimed {human_bytes(max(reclaimed, 0))}"
+          + (f", {unlinked} hardlinked file(s) made independent" if unlinked else ""))
+    print(f"   {store.stats_line()}")
+
+
+if __name__ == "__main__":
+    main()
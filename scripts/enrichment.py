@@ -0,0 +1,247 @@
+"""
+Model-written descriptions and tag suggestions for posts and finds.
+
+Notes are sent to a local Ollama (or Ollama-compatible) server's /api/chat,
+all pending notes of a run together over one pooled httpx client, with at
+most `concurrency` requests in flight. Answers are cached in
+.hugo/enrichment-cache.json by a hash of the model, prompt and note text, so
+converting an unchanged note again never queries the model. If the server
+can't be reached or doesn't have the model, every note gets None and the
+converters keep their heuristic; without httpx notes are sent one at a time
+with urllib.
+
+OLLAMA_HOST sets the server (default http://localhost:11434), e.g. to point
+at a local fake server when testing.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+CACHE_VERSION = 1
+DEFAULT_MODEL = os.environ.get('ENRICH_MODEL', 'llama3.2')
+MAX_DESCRIPTION = 160
+MAX_TAGS = 5
+# Only the start of a note goes into the prompt
+MAX_PROMPT_CHARS = 6000
+USER_AGENT = 'jamalhansen.com-enrichment/1.0'
+
+# Bump when the prompt changes, so cached answers to the old one are ignored
+PROMPT_VERSION = 1
+SYSTEM_PROMPT = (
+    "You write metadata for {kind} on a blog about Python, SQL, data and local AI. "
+    "Reply with JSON only, in the form "
+    '{{"description": "...", "tags": ["...", "..."]}}. '
+    "The description is one plain sentence of at most 155 characters that tells a reader "
+    "what the page is about, without markdown or quotes. "
+    "The tags are 3 to 5 short lowercase topic tags, most specific first."
+)
+KINDS = {'post': 'a blog post', 'find': "a 'find': a link the author found, with their commentary"}
+
+TAG_DROP_RE = re.compile(r'[^\w\- ]')
+
+
+def default_endpoint():
+    """The Ollama server, from OLLAMA_HOST (which may omit the scheme and port)."""
+    host = os.environ.get('OLLAMA_HOST', '').strip() or 'localhost:11434'
+    if '://' not in host:
+        host = f"http://{host}" if ':' in host else f"http://{host}:11434"
+    return host.rstrip('/')
+
+
+def truncate(text, max_len=MAX_DESCRIPTION):
+    """Shorten text at a word boundary, as the finds' first-paragraph description does."""
+    if len(text) <= max_len:
+        return text
+    return text[:max_len].rsplit(' ', 1)[0] + "..."
+
+
+def clean_result(content):
+    """Validate a model reply: {"description": str, "tags": [str]} or None."""
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    description = data.get('description')
+    description = ' '.join(description.split()).strip('"\' ') if isinstance(description, str) else ''
+    tags = []
+    for tag in data.get('tags') if isinstance(data.get('tags'), list) else []:
+        if isinstance(tag, str):
+            tag = '-'.join(TAG_DROP_RE.sub('', tag.lstrip('#').lower()).split())
+            if tag and tag not in tags:
+                tags.append(tag)
+    if not description and not tags:
+        return None
+    return {'description': truncate(description), 'tags': tags[:MAX_TAGS]}
+
+
+class EnrichmentCache:
+    """JSON file of content hash -> {"description", "tags", "model", "created"}."""
+
+    def __init__(self, path):
+        self.path = Path(path) if path else None
+        self.entries = {}
+        self._dirty = False
+        if self.path:
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                if data.get('version') == CACHE_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                pass
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        return {'description': entry['description'], 'tags': entry['tags']} if entry else None
+
+    def put(self, key, result, model):
+        self.entries[key] = {**result, 'model': model, 'created': time.time()}
+        self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'version': CACHE_VERSION, 'entries': self.entries}, indent=1), encoding='utf-8')
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def _has_model(models, model):
+    """True if /api/tags lists `model` ("llama3.2" means "llama3.2:latest")."""
+    names = {m.get('name') for m in models if isinstance(m, dict)}
+    return model in names or f"{model}:latest" in names
+
+
+async def _enrich_all_async(requests, endpoint, model, timeout, concurrency, log):
+    import httpx
+
+    results = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=endpoint, timeout=timeout, limits=limits,
+                                 headers={'User-Agent': USER_AGENT}) as client:
+        # One cheap request first, so a missing server or model is reported once
+        try:
+            resp = await client.get('/api/tags', timeout=min(timeout, 5))
+            if resp.status_code != 404:
+                resp.raise_for_status()
+                if not _has_model(resp.json().get('models', []), model):
+                    log(f"⚠️  Model {model} not available at {endpoint} (ollama pull {model})")
+                    return {key: None for key, _ in requests}
+        except (httpx.HTTPError, ValueError, AttributeError) as e:
+            log(f"⚠️  No model server at {endpoint} ({type(e).__name__})")
+            return {key: None for key, _ in requests}
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def enrich(key, payload):
+            async with sem:
+                try:
+                    resp = await client.post('/api/chat', json=payload)
+                    resp.raise_for_status()
+                    results[key] = clean_result(resp.json().get('message', {}).get('content'))
+                except (httpx.HTTPError, ValueError, AttributeError) as e:
+                    message = str(e).splitlines()[0] if str(e) else ''
+                    log(f"⚠️  Enrichment failed for {key}: {type(e).__name__} {message}".rstrip())
+                    results[key] = None
+
+        await asyncio.gather(*(enrich(key, payload) for key, payload in requests))
+    return results
+
+
+def _enrich_all_serial(requests, endpoint, timeout, log):
+    results = {}
+    for key, payload in requests:
+        req = urllib.request.Request(f"{endpoint}/api/chat", data=json.dumps(payload).encode('utf-8'),
+                                     headers={'User-Agent': USER_AGENT, 'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                results[key] = clean_result(json.loads(resp.read()).get('message', {}).get('content'))
+        except urllib.error.URLError as e:
+            if not isinstance(e, urllib.error.HTTPError):
+                # Nothing is listening; don't wait on every note
+                log(f"⚠️  No model server at {endpoint} ({e.reason})")
+                return {**results, **{k: None for k, _ in requests if k not in results}}
+            log(f"⚠️  Enrichment failed for {key}: {e}")
+            results[key] = None
+        except Exception as e:
+            log(f"⚠️  Enrichment failed for {key}: {e}")
+            results[key] = None
+    return results
+
+
+class Enricher:
+    """Descriptions and tags for notes, from a local model, cached by content."""
+
+    def __init__(self, cache_path, model=DEFAULT_MODEL, endpoint=None, concurrency=2, timeout=120):
+        self.cache = EnrichmentCache(cache_path)
+        self.model = model
+        self.endpoint = endpoint or default_endpoint()
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+
+    def settings(self):
+        """What the output depends on, for the conversion manifest."""
+        return {'model': self.model, 'prompt': PROMPT_VERSION}
+
+    def content_key(self, kind, title, text):
+        h = hashlib.sha256()
+        h.update(f"{PROMPT_VERSION}\0{self.model}\0{kind}\0{title}\0".encode('utf-8'))
+        h.update(text[:MAX_PROMPT_CHARS].encode('utf-8'))
+        return h.hexdigest()
+
+    def payload(self, kind, title, text):
+        return {
+            'model': self.model,
+            'stream': False,
+            'format': 'json',
+            'options': {'temperature': 0},
+            'messages': [
+                {'role': 'system', 'content': SYSTEM_PROMPT.format(kind=KINDS[kind])},
+                {'role': 'user', 'content': f"Title: {title}\n\n{text[:MAX_PROMPT_CHARS].strip()}"},
+            ],
+        }
+
+    def enrich(self, items, log=print):
+        """Descriptions and tags for many notes at once.
+
+        `items` is an iterable of (key, kind, title, text) with kind 'post' or
+        'find'. Cached answers are reused; the rest are requested together and
+        cached. Returns {key: {"description", "tags"}} with None for notes the
+        model couldn't do, so the caller keeps its fallback.
+        """
+        results = {}
+        pending = {}
+        for key, kind, title, text in items:
+            digest = self.content_key(kind, title, text)
+            cached = self.cache.get(digest)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = (digest, self.payload(kind, title, text))
+
+        if pending:
+            log(f"🤖 Enriching {len(pending)} note(s) with {self.model} ({len(results)} cached)...")
+            requests = [(key, payload) for key, (_, payload) in pending.items()]
+            try:
+                fetched = asyncio.run(_enrich_all_async(requests, self.endpoint, self.model, self.timeout,
+                                                        self.concurrency, log))
+            except ImportError:
+                log("⚠️  httpx not installed, enriching notes one at a time")
+                fetched = _enrich_all_serial(requests, self.endpoint, self.timeout, log)
+            for key, result in fetched.items():
+                results[key] = result
+                if result is not None:
+                    self.cache.put(pending[key][0], result, self.model)
+            self.cache.save()
+        elif results:
+            log(f"🤖 {len(results)} note(s) enriched from cache")
+        return results
@@ -1,70 +1,35 @@
 #!/usr/bin/env python3
 """
 Convert Obsidian finds to Hugo-compatible markdown page bundles.
-Usage: python finds-to-hugo.py input.md
+Usage: python finds-to-hugo.py input.md [input.md ...] [--force]
+       python finds-to-hugo.py --all path/to/_finds [--jobs N] [--force]
+       python finds-to-hugo.py --watch path/to/_finds [--poll]
+Add --timings (alias --profile) and/or --timings-json PATH to see where time goes.
+Add --enrich to have a local model (Ollama) write descriptions and suggest tags.
 """
+import argparse
+import os
 import sys
 import re
-import json
-import unicodedata
-import urllib.request
-import urllib.parse
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from convert_manifest import ConvertManifest, bytes_hash, write_if_changed
+from enrichment import DEFAULT_MODEL, Enricher
+from frontmatter_fields import detect_existing_frontmatter, extract_list, extract_scalar, slugify, yaml_str
+from oembed import OEmbedCache, fetch_oembed_batch
+import site_data
+from timings import NO_TIMINGS, Timings, report
+from vault_watch import OVERFLOW, make_watcher, watch
+from wiki_links import LinkIndex, plain_text, source_name
 
-def slugify(text):
-    text = str(text)
-    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
-    text = re.sub(r'[^\w\s-]', '', text).strip().lower()
-    return re.sub(r'[-\s]+', '-', text)
-
-
-def detect_existing_frontmatter(content):
-    m = re.match(r'^---\n(.*?)\n---\n(.*)$', content, flags=re.DOTALL)
-    if m:
-        return True, m.group(1), m.group(2)
-    return False, "", content
-
-
-def extract_scalar(frontmatter, field):
-    """Extract a single-line scalar value from YAML frontmatter."""
-    m = re.search(rf'^{field}:\s*["\']?([^"\'\n]*?)["\']?\s*$', frontmatter, re.MULTILINE)
-    return m.group(1).strip() if m else ""
-
-
-def extract_list(frontmatter, field):
-    """Extract a YAML list field. Returns a list of strings."""
-    # Block style: field:\n  - item
-    m = re.search(rf'^{field}:\s*\n((?:[ \t]+-[ \t]+[^\n]+\n?)*)', frontmatter, re.MULTILINE)
-    if m:
-        items = re.findall(r'[ \t]+-[ \t]+(.+)', m.group(1))
-        return [i.strip().strip('"\'').lstrip('#').strip() for i in items if i.strip()]
-    # Flow style: field: [a, b]
-    m2 = re.search(rf'^{field}:\s*\[([^\]]*)\]', frontmatter, re.MULTILINE)
-    if m2 and m2.group(1).strip():
-        return [i.strip().strip('"\'') for i in m2.group(1).split(',') if i.strip()]
-    return []
-
-
-def fetch_oembed_html(platform, url):
-    """Fetch pre-rendered embed HTML from the platform's oEmbed API.
-    Returns the HTML string, or None on failure."""
-    clean_url = re.sub(r'\?.*$', '', url)
-    try:
-        if platform == 'x':
-            api = f"https://publish.twitter.com/oembed?url={urllib.parse.quote(clean_url)}&theme=dark&dnt=true&omit_script=false"
-        elif platform == 'bluesky':
-            api = f"https://embed.bsky.app/oembed?url={urllib.parse.quote(url)}"
-        else:
-            return None
-        req = urllib.request.Request(api, headers={'User-Agent': 'finds-to-hugo/1.0'})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
-            return data.get('html', '').strip()
-    except Exception as e:
-        print(f"⚠️  oEmbed fetch failed for {platform}: {e}")
-        return None
+BASE_DIR = Path(__file__).parent.parent
+MANIFEST_PATH = BASE_DIR / ".hugo" / "finds-manifest.json"
+OEMBED_CACHE_PATH = BASE_DIR / ".hugo" / "oembed-cache.json"
+ENRICHMENT_CACHE_PATH = BASE_DIR / ".hugo" / "enrichment-cache.json"
+LINK_MANIFESTS = (BASE_DIR / ".hugo" / "obsidian-manifest.json", MANIFEST_PATH)
 
 
 def detect_social_platform(url):
@@ -80,39 +45,27 @@ def detect_social_platform(url):
     return None
 
 
-def yaml_str(value):
-    """Escape a value for embedding in a YAML double-quoted string."""
-    return value.replace('\\', '\\\\').replace('"', '\\"')
-
-
 def extract_description_from_body(body, max_len=160):
     """Pull the first meaningful paragraph from commentary for meta description."""
     # Strip headings
     text = re.sub(r'^#+\s+.*$', '', body, flags=re.MULTILINE).strip()
     if not text:
         return ""
-    first_para = re.split(r'\n\n', text)[0].strip()
+    # [[note|label]] would be published as is; keep only what the link shows
+    first_para = plain_text(re.split(r'\n\n', text)[0]).strip()
     if len(first_para) <= max_len:
         return first_para
     return first_para[:max_len].rsplit(' ', 1)[0] + "..."
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python finds-to-hugo.py input.md")
-        sys.exit(1)
-
-    input_path = Path(sys.argv[1])
-    if not input_path.exists():
-        print(f"Error: Input file '{input_path}' not found")
-        sys.exit(1)
-
-    content = input_path.read_text(encoding='utf-8')
+def plan_find(input_path, content, log=print):
+    """Parse a find note into the fields its bundle is built from.
+    Returns None (after printing why) if the note can't be converted."""
     has_fm, fm, body = detect_existing_frontmatter(content)
 
     if not has_fm:
-        print("Error: No frontmatter found. Finds must have frontmatter.")
-        sys.exit(1)
+        log(f"Error: No frontmatter found in {input_path.name}. Finds must have frontmatter.")
+        return None
 
     # Extract Obsidian fields
     source_title  = extract_scalar(fm, 'source_title')
@@ -126,52 +79,70 @@ def main():
         # Derive from filename: strip leading "0001-" style prefix
         stem = re.sub(r'^\d+-', '', input_path.stem)
         source_title = stem.replace('-', ' ').title()
-        print(f"⚠️  No source_title found, derived from filename: {source_title}")
+        log(f"⚠️  No source_title found, derived from filename: {source_title}")
 
-    slug = slugify(source_title)
     if captured and re.match(r'^\d{4}-\d{2}-\d{2}$', captured):
         date = captured
     else:
         if captured:
-            print(f"⚠️  Invalid captured date '{captured}', defaulting to today")
+            log(f"⚠️  Invalid captured date '{captured}' in {input_path.name}, defaulting to today")
         date = datetime.now().strftime('%Y-%m-%d')
-    description = extract_description_from_body(body)
 
-    # Build Hugo frontmatter
+    embed_type = detect_social_platform(source_url)
+    if embed_type and not source_type:
+        source_type = {'x': 'X Post', 'bluesky': 'Bluesky Post', 'mastodon': 'Mastodon Post'}[embed_type]
+    return {
+        'slug': slugify(source_title),
+        'title': source_title,
+        'url': source_url,
+        'author': source_author,
+        'type': source_type,
+        'date': date,
+        'tags': tags,
+        'description': extract_description_from_body(body),
+        'embed_type': embed_type,
+        'body': body,
+        'links': {},
+    }
+
+
+def find_record(find):
+    """A find's bundle as a wiki_links/site_data record."""
+    return {'path': f"finds/{find['slug']}/index.md", 'section': 'finds', 'title': find['title'],
+            'slug': '', 'aliases': [], 'draft': False, 'date': find['date']}
+
+
+def resolve_links(find, input_path, links):
+    """Turn [[wiki links]] in a find's commentary into Hugo refs (see wiki_links.py)."""
+    if '[[' in find['body']:
+        unresolved = []
+        find['body'] = links.rewrite_body(find['body'], find['links'], unresolved)
+        links.note_missing(source_name(str(input_path)), unresolved)
+
+
+def render_find(find, embed_html=None):
+    """Build the bundle's index.md content."""
     fm_lines = [
-        f'title: "{yaml_str(source_title)}"',
-        f'date: {date}',
+        f'title: "{yaml_str(find["title"])}"',
+        f'date: {find["date"]}',
         'draft: false',
     ]
-    if description:
-        fm_lines.append(f'description: "{yaml_str(description)}"')
-    if tags:
+    if find['description']:
+        fm_lines.append(f'description: "{yaml_str(find["description"])}"')
+    if find['tags']:
         fm_lines.append('tags:')
-        for tag in tags:
+        for tag in find['tags']:
             fm_lines.append(f'  - {tag}')
-    embed_type = detect_social_platform(source_url)
-    if embed_type and not source_type:
-        source_type = {'x': 'X Post', 'bluesky': 'Bluesky Post', 'mastodon': 'Mastodon Post'}[embed_type]
-
-    embed_html = None
-    if embed_type in ('x', 'bluesky'):
-        print(f"🔗 Fetching {embed_type} oEmbed...")
-        embed_html = fetch_oembed_html(embed_type, source_url)
-        if embed_html:
-            print(f"   ✓ Got embed HTML ({len(embed_html)} chars)")
-        else:
-            print(f"   ⚠️  Falling back to client-side embed")
-
-    if source_url:
-        fm_lines.append(f'source_url: "{yaml_str(source_url)}"')
-    if source_title:
-        fm_lines.append(f'source_title: "{yaml_str(source_title)}"')
-    if source_author:
-        fm_lines.append(f'source_author: "{yaml_str(source_author)}"')
-    if source_type:
-        fm_lines.append(f'source_type: "{yaml_str(source_type)}"')
-    if embed_type:
-        fm_lines.append(f'embed_type: "{embed_type}"')
+    if find['url']:
+        fm_lines.append(f'source_url: "{yaml_str(find["url"])}"')
+    if find['title']:
+        fm_lines.append(f'source_title: "{yaml_str(find["title"])}"')
+    if find['author']:
+        fm_lines.append(f'source_author: "{yaml_str(find["author"])}"')
+    if find['type']:
+        fm_lines.append(f'source_type: "{yaml_str(find["type"])}"')
+    if find['embed_type']:
+        fm_lines.append(f'embed_type: "{find["embed_type"]}"')
     if embed_html:
         # Store as YAML literal block scalar so indentation is preserved
         fm_lines.append('embed_html: |')
@@ -179,19 +150,315 @@ def main():
             fm_lines.append(f'  {line}')
 
     fm_out = '\n'.join(fm_lines)
-    final_content = f"---\n{fm_out}\n---\n\n{body.lstrip()}"
-
-    # Write output as a Hugo page bundle
-    base_dir = Path(__file__).parent.parent
-    find_dir = base_dir / "content" / "finds" / slug
-    find_dir.mkdir(parents=True, exist_ok=True)
-    (find_dir / "index.md").write_text(final_content, encoding='utf-8')
-
-    print(f"✅  Written: content/finds/{slug}/index.md")
-    print(f"    Title:  {source_title}")
-    print(f"    Date:   {date}")
-    print(f"    Tags:   {', '.join(tags) if tags else '(none)'}")
-    print(f"\n🎉 Done!")
+    return f"---\n{fm_out}\n---\n\n{find['body'].lstrip()}"
+
+
+def fetch_embeds(finds, cache, timings=NO_TIMINGS):
+    """Fetch oEmbed HTML for every X/Bluesky find at once. Returns url -> html."""
+    pending = [(f['embed_type'], f['url']) for f in finds if f['embed_type'] in ('x', 'bluesky')]
+    if not pending:
+        return {}
+    cached = sum(1 for _, url in pending if cache.get(url) is not None)
+    print(f"🔗 Fetching {len(pending)} oEmbed(s) ({cached} cached)...")
+    with timings.stage('oEmbed fetch') as stage:
+        embeds = fetch_oembed_batch(pending, cache)
+        cache.save()
+        stage['bytes'] = sum(len(html) for html in embeds.values() if html)
+    return embeds
+
+
+def enrich_finds(planned, enricher, timings=NO_TIMINGS):
+    """Model descriptions (and tags, for finds without any) for every planned
+    find at once. Finds the model can't do keep the first-paragraph description
+    and are marked pending, so the next run asks again."""
+    if enricher is None or not planned:
+        return
+    with timings.stage('enrich'):
+        results = enricher.enrich([(key, 'find', find['title'], find['body']) for find, key, _ in planned])
+    for find, key, _ in planned:
+        find['enrich'] = enricher.settings()
+        result = results.get(key)
+        if not result:
+            find['pending'] = ['enrichment']
+            continue
+        find['description'] = result['description'] or find['description']
+        if not find['tags']:
+            find['tags'] = result['tags']
+        else:
+            find['suggested_tags'] = [t for t in result['tags'] if t not in find['tags']]
+
+
+def write_find(find, embed_html, manifest, key, source_hash, timings=NO_TIMINGS, log=print):
+    """Write a find's page bundle and record it in the manifest. A find whose
+    embed (or enrichment) failed is recorded as pending, so the next run retries it."""
+    pending = list(find.get('pending', []))
+    if find['embed_type'] in ('x', 'bluesky'):
+        if embed_html:
+            log(f"   ✓ Got {find['embed_type']} embed HTML ({len(embed_html)} chars)")
+        else:
+            log("   ⚠️  Falling back to client-side embed (retried next run)")
+            pending.append('embed')
+    with timings.stage('write') as stage:
+        final_content = render_find(find, embed_html)
+        stage['bytes'] = len(final_content)
+
+        # Write output as a Hugo page bundle
+        slug = find['slug']
+        find_dir = BASE_DIR / "content" / "finds" / slug
+        find_dir.mkdir(parents=True, exist_ok=True)
+        written = write_if_changed(find_dir / "index.md", final_content)
+    if written:
+        log(f"✅  Written: content/finds/{slug}/index.md")
+    else:
+        log(f"✅  Unchanged: content/finds/{slug}/index.md")
+    manifest.record(key, source_hash, find_dir / "index.md", bytes_hash(final_content.encode('utf-8')),
+                    links=find['links'], inputs={'enrich': find['enrich']} if find.get('enrich') else None,
+                    pending=pending)
+    log(f"    Title:  {find['title']}")
+    log(f"    Date:   {find['date']}")
+    log(f"    Tags:   {', '.join(find['tags']) if find['tags'] else '(none)'}")
+    if find.get('suggested_tags'):
+        log(f"    💡 Suggested tags: {', '.join(find['suggested_tags'])}")
+
+
+def run_all(finds_dir, manifest, jobs, timings=NO_TIMINGS, enricher=None):
+    """Convert every find in a folder that has no bundle in content/finds/ yet.
+
+    The folder is scanned once; slug collisions (two notes with the same slug,
+    or a note whose slug belongs to another note's bundle) are reported before
+    anything is written and those notes are skipped. New bundles are written
+    in parallel after their embeds (and, with an `enricher`, descriptions)
+    are fetched together. Returns True if any note failed or collided.
+    """
+    start = time.perf_counter()
+    finds_root = (BASE_DIR / "content" / "finds").resolve()
+    with os.scandir(finds_dir) as it:
+        paths = sorted(Path(e.path) for e in it if e.is_file() and e.name.endswith('.md'))
+    print(f"🔍 Scanning {len(paths)} note(s) in {finds_dir}")
+
+    failed = 0
+    by_slug = {}
+    for path in paths:
+        with timings.stage('read') as stage:
+            content = path.read_text(encoding='utf-8')
+            stage['bytes'] = len(content)
+        with timings.stage('frontmatter normalize'):
+            has_fm, fm, _ = detect_existing_frontmatter(content)
+            if has_fm and not extract_scalar(fm, 'source_url') and not extract_scalar(fm, 'source_title'):
+                # Inbox and index notes live alongside finds but aren't finds
+                continue
+            find = plan_find(path, content)
+        if find is None:
+            failed += 1
+            continue
+        by_slug.setdefault(find['slug'], []).append((path, find, bytes_hash(content.encode('utf-8'))))
+
+    # Bundle path -> the note that produced it, so we can tell our own
+    # bundle apart from someone else's with the same slug
+    owners = {entry['output']: key for key, entry in manifest.notes.items()}
+    collisions = []
+    planned = []
+    existing = 0
+    for slug, notes in sorted(by_slug.items()):
+        if len(notes) > 1:
+            collisions.append((slug, [p.name for p, _, _ in notes]))
+            continue
+        path, find, source_hash = notes[0]
+        key = manifest.key(path)
+        output = finds_root / slug / "index.md"
+        owner = owners.get(str(output))
+        if owner and owner != key:
+            collisions.append((slug, [path.name, f"{Path(owner).name} (already published)"]))
+            continue
+        # Existing bundles are left alone, unless they still miss their embed
+        if output.exists() and not manifest.force and not manifest.is_pending(key):
+            existing += 1
+            continue
+        planned.append((find, key, source_hash))
+
+    # The model sees the commentary as written, before links become shortcodes
+    enrich_finds(planned, enricher, timings)
+
+    # New finds can link to each other, so they are indexed before resolving
+    links = LinkIndex.load(BASE_DIR, LINK_MANIFESTS)
+    for find, key, _ in planned:
+        links.add(find_record(find), [source_name(key)])
+    for find, key, _ in planned:
+        resolve_links(find, key, links)
+
+    if collisions:
+        print(f"⚠️  {len(collisions)} slug collision(s), skipped:")
+        for slug, names in collisions:
+            print(f"   {slug}: {', '.join(names)}")
+    print(f"📦 {len(planned)} new, {existing} already in content/finds/")
+
+    embeds = fetch_embeds([find for find, _, _ in planned], OEmbedCache(OEMBED_CACHE_PATH), timings)
+
+    def write(item):
+        find, key, source_hash = item
+        lines = []
+        # Per-thread timings, merged below
+        local = Timings(enabled=timings.enabled)
+        write_find(find, embeds.get(find['url']), manifest, key, source_hash, local, log=lines.append)
+        return lines, local.stages
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for lines, stages in pool.map(write, planned):
+            timings.merge(stages)
+            for line in lines:
+                print(line)
+    manifest.save()
+    if planned:
+        site_data.refresh(BASE_DIR)
+
+    print(f"\n📊 Finds: {len(planned)} written, {existing} existing, "
+          f"{len(collisions)} collision(s), {failed} failed in {time.perf_counter() - start:.2f}s")
+    links.report()
+    return bool(failed or collisions)
+
+
+def convert_inputs(inputs, manifest, cache, timings=NO_TIMINGS, finds_only=False, enricher=None):
+    """Convert the given notes, skipping ones unchanged since the last run.
+    With `finds_only`, notes without source_url/source_title (the inbox) are
+    ignored. With an `enricher`, descriptions come from a local model.
+    Returns (bundles written, notes failed)."""
+    failed = 0
+    planned = []
+    links = LinkIndex.load(BASE_DIR, LINK_MANIFESTS)
+    for input_path in inputs:
+        if not input_path.exists():
+            print(f"Error: Input file '{input_path}' not found")
+            failed += 1
+            continue
+
+        with timings.stage('read') as stage:
+            content = input_path.read_text(encoding='utf-8')
+            stage['bytes'] = len(content)
+
+        # Skip notes whose source and bundle are unchanged since the last run
+        # (this also avoids re-fetching oEmbed HTML).
+        with timings.stage('manifest check', len(content)):
+            key = manifest.key(input_path)
+            source_hash = bytes_hash(content.encode('utf-8'))
+            # Without --enrich, a find enriched earlier is still fresh
+            recorded = manifest.notes.get(key, {}).get('inputs', {})
+            inputs = {'enrich': enricher.settings()} if enricher is not None else recorded
+            fresh = (manifest.is_fresh(key, source_hash, inputs=inputs)
+                     and links.is_current(manifest.notes[key].get('links', {})))
+        if fresh:
+            output = Path(manifest.notes[key]['output'])
+            print(f"⏭️  Unchanged since last conversion: {output.relative_to(BASE_DIR.resolve())}")
+            continue
+
+        with timings.stage('frontmatter normalize'):
+            if finds_only:
+                has_fm, fm, _ = detect_existing_frontmatter(content)
+                if has_fm and not extract_scalar(fm, 'source_url') and not extract_scalar(fm, 'source_title'):
+                    continue
+            find = plan_find(input_path, content)
+        if find is None:
+            failed += 1
+            continue
+        planned.append((find, key, source_hash))
+
+    enrich_finds(planned, enricher, timings)
+    for find, key, _ in planned:
+        resolve_links(find, key, links)
+
+    # All pending embeds are fetched together before any bundle is written
+    embeds = fetch_embeds([find for find, _, _ in planned], cache, timings)
+
+    for find, key, source_hash in planned:
+        write_find(find, embeds.get(find['url']), manifest, key, source_hash, timings)
+    manifest.save()
+    if planned:
+        site_data.refresh(BASE_DIR)
+    links.report()
+    return len(planned), failed
+
+
+def run_watch(finds_dir, manifest, poll=False, debounce=0.05, enricher=None):
+    """Convert finds in a folder as they are saved, until Ctrl-C.
+    The manifest and oEmbed cache stay loaded between saves."""
+    finds_dir = finds_dir.resolve()
+    cache = OEmbedCache(OEMBED_CACHE_PATH)
+    watcher = make_watcher([finds_dir], poll)
+    print(f"   Converting finds in {finds_dir} on save (Ctrl-C to stop)")
+
+    def on_change(paths):
+        start = time.perf_counter()
+        if paths is OVERFLOW:
+            paths = finds_dir.glob('*.md')
+        notes = sorted(p for p in paths if p.suffix == '.md' and p.parent == finds_dir and p.is_file())
+        if not notes:
+            return
+        try:
+            written, failed = convert_inputs(notes, manifest, cache, finds_only=True, enricher=enricher)
+        except Exception as e:
+            print(f"❌ {type(e).__name__}: {e}")
+            return
+        if written or failed:
+            print(f"⚡ {written} written, {failed} failed in {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+    watch(watcher, on_change, debounce)
+
+
+def main():
+    parser = argparse.ArgumentParser(usage="python finds-to-hugo.py input.md [input.md ...] [--force]\n"
+                                           "       python finds-to-hugo.py --all path/to/_finds [--jobs N] [--force]\n"
+                                           "       python finds-to-hugo.py --watch path/to/_finds [--poll]")
+    parser.add_argument('inputs', nargs='*', help=argparse.SUPPRESS)
+    parser.add_argument('--all', metavar='FINDS_DIR', help="convert every find in FINDS_DIR that has no bundle yet")
+    parser.add_argument('--watch', metavar='FINDS_DIR', help="keep running and convert finds in FINDS_DIR as they are saved")
+    parser.add_argument('--poll', action='store_true', help="with --watch: poll for changes instead of using inotify")
+    parser.add_argument('--debounce', type=int, default=50, metavar='MS', help="with --watch: wait for MS ms of quiet after a save (default: 50)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="parallel writers for --all (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="ignore the conversion manifest and rewrite the bundle")
+    parser.add_argument('--timings', '--profile', action='store_true', help="print wall time and bytes per stage")
+    parser.add_argument('--timings-json', metavar='PATH', help="append a JSON trace of stage timings to PATH")
+    parser.add_argument('--enrich', action='store_true', help="write descriptions (and tags for untagged finds) with a local model")
+    parser.add_argument('--enrich-model', default=DEFAULT_MODEL, metavar='MODEL', help=f"with --enrich: Ollama model (default: {DEFAULT_MODEL})")
+    parser.add_argument('--enrich-jobs', type=int, default=2, metavar='N', help="with --enrich: concurrent model requests (default: 2)")
+    opts = parser.parse_args()
+
+    start = time.perf_counter()
+    timings = Timings(enabled=opts.timings or bool(opts.timings_json))
+    enricher = Enricher(ENRICHMENT_CACHE_PATH, opts.enrich_model, concurrency=opts.enrich_jobs) if opts.enrich else None
+
+    if opts.all:
+        if not Path(opts.all).is_dir():
+            print(f"Error: Finds folder '{opts.all}' not found")
+            sys.exit(1)
+        failed = run_all(Path(opts.all), ConvertManifest.load(MANIFEST_PATH, __file__, opts.force), opts.jobs,
+                         timings, enricher)
+        report(timings, time.perf_counter() - start, opts.timings, opts.timings_json, 'finds-to-hugo')
+        if failed:
+            sys.exit(1)
+        return
+
+    if opts.watch:
+        if not Path(opts.watch).is_dir():
+            print(f"Error: Finds folder '{opts.watch}' not found")
+            sys.exit(1)
+        run_watch(Path(opts.watch), ConvertManifest.load(MANIFEST_PATH, __file__, opts.force), opts.poll,
+                  opts.debounce / 1000, enricher)
+        return
+
+    if not opts.inputs:
+        print("Usage: python finds-to-hugo.py input.md [input.md ...]")
+        sys.exit(1)
+
+    manifest = ConvertManifest.load(MANIFEST_PATH, __file__, opts.force)
+    written, failed = convert_inputs([Path(raw) for raw in opts.inputs], manifest, OEmbedCache(OEMBED_CACHE_PATH), timings,
+                                     enricher=enricher)
+    report(timings, time.perf_counter() - start, opts.timings, opts.timings_json, 'finds-to-hugo')
+
+    if failed:
+        sys.exit(1)
+    if written:
+        print(f"\n🎉 Done!")
+    else:
+        print("\n🎉 Nothing to do (use --force to reconvert)")
 
 
 if __name__ == "__main__":
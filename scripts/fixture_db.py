@@ -0,0 +1,208 @@
+"""
+Prebuilt DuckDB database with the fixtures for validating code blocks.
+
+blog-validate-helpers/_global_data.py imports pandas and builds the
+customers/orders tables every time it runs. It is run once here instead and
+the result is saved to .hugo/fixtures.duckdb, together with the plain Python
+values it defines (the `customers` and `orders` lists). DataFrames it
+defines (`customers_df`, `orders_df`) are saved as tables too, and only
+turned back into DataFrames for posts whose Python blocks use them.
+Validation connections ATTACH the file read-only and otherwise never
+import pandas.
+
+With a scale, customers/orders are instead generated with the same columns
+as the SQL fixtures (_customers.sql, _orders.sql) at millions of rows, from
+small pools of Faker values combined in SQL.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import duckdb
+
+FIXTURE_VERSION = 2
+META_TABLE = '_fixture_meta'
+# DataFrame `name` is saved as table _df_<name>
+DATAFRAME_PREFIX = '_df_'
+
+CUSTOMERS_DDL = """CREATE TABLE customers (
+    id INTEGER, name VARCHAR, email VARCHAR,
+    city VARCHAR, signup_date DATE, is_premium BOOLEAN
+)"""
+ORDERS_DDL = """CREATE TABLE orders (
+    id INTEGER, customer_id INTEGER, product VARCHAR,
+    amount DECIMAL(10, 2), order_date DATE
+)"""
+ORDERS_PER_CUSTOMER = 3
+
+
+def parse_scale(value):
+    """'5000', '250k' or '2m' -> number of customers."""
+    value = str(value).strip().lower()
+    factor = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    return int(float(value[:-1] if factor > 1 else value) * factor)
+
+
+def source_digest(global_data_path, scale=None, seed=0):
+    """What the database is built from; a different digest means rebuild."""
+    h = hashlib.sha256(f"{FIXTURE_VERSION}:{duckdb.__version__}:{scale}:{seed}".encode())
+    h.update(Path(global_data_path).read_bytes() if Path(global_data_path).exists() else b'')
+    return h.hexdigest()
+
+
+def read_meta(conn, catalog=None):
+    """The metadata row of a fixture database (None if it has none)."""
+    table = f'{catalog}.main.{META_TABLE}' if catalog else META_TABLE
+    try:
+        row = conn.execute(f"SELECT source, scale, seed, python_globals FROM {table}").fetchone()
+    except duckdb.Error:
+        return None
+    source, scale, seed, python_globals = row
+    return {'source': source, 'scale': scale, 'seed': seed, 'python_globals': json.loads(python_globals)}
+
+
+def _plain_globals(namespace):
+    """The JSON-serializable values a helper script defined (skips modules, DataFrames, ...)."""
+    values = {}
+    for name, value in namespace.items():
+        if name.startswith('_') or name in ('conn', 'con'):
+            continue
+        try:
+            values[name] = json.loads(json.dumps(value))
+        except (TypeError, ValueError):
+            continue
+    return values
+
+
+def _is_dataframe(value):
+    # Without importing pandas just to check
+    return type(value).__name__ == 'DataFrame' and type(value).__module__.startswith('pandas')
+
+
+def _save_dataframes(conn, namespace):
+    """Store the DataFrames a helper script defined as tables."""
+    for name, value in namespace.items():
+        if not name.startswith('_') and _is_dataframe(value):
+            conn.register('_dataframe', value)
+            conn.execute(f'CREATE TABLE "{DATAFRAME_PREFIX}{name}" AS SELECT * FROM _dataframe')
+            conn.unregister('_dataframe')
+
+
+def _generate(conn, customers, seed):
+    """Fill customers/orders with `customers` rows (and 3x as many orders)."""
+    from faker import Faker
+
+    fake = Faker()
+    Faker.seed(seed)
+    pools = {
+        'names': sorted({fake.name() for _ in range(5000)}),
+        'cities': sorted({fake.city() for _ in range(300)}),
+        'domains': ['gmail.com', 'yahoo.com', 'outlook.com', 'example.com', 'proton.me'],
+        'products': sorted({f"{fake.color_name()} {kind}" for kind in ('Widget', 'Gizmo', 'Doodad')
+                            for _ in range(40)}),
+    }
+    # Joining small pool tables on a hash of the row number is much faster
+    # than indexing into a list parameter for every row
+    for name, values in pools.items():
+        conn.execute(f"CREATE TEMP TABLE pool_{name} AS SELECT unnest($v) AS v, "
+                     f"generate_subscripts($v, 1) - 1 AS k", {'v': values})
+
+    def pick(name, salt):
+        return f"JOIN pool_{name} {name} ON {name}.k = hash(i, {seed}, '{salt}') % {len(pools[name])}"
+
+    conn.execute(CUSTOMERS_DDL)
+    conn.execute(f"""
+        INSERT INTO customers
+        SELECT i, names.v, lower(replace(names.v, ' ', '.')) || i || '@' || domains.v, cities.v,
+               DATE '2023-01-01' + (hash(i, {seed}, 'signup') % 730)::INTEGER,
+               hash(i, {seed}, 'premium') % 4 = 0
+        FROM range(1, {customers} + 1) t(i)
+        {pick('names', 'name')} {pick('domains', 'domain')} {pick('cities', 'city')}
+        ORDER BY i
+    """)
+    conn.execute(ORDERS_DDL)
+    conn.execute(f"""
+        INSERT INTO orders
+        SELECT i, 1 + (hash(i, {seed}, 'customer') % {customers})::INTEGER, products.v,
+               (5 + (hash(i, {seed}, 'amount') % 50000) / 100)::DECIMAL(10, 2),
+               DATE '2024-01-01' + (hash(i, {seed}, 'ordered') % 365)::INTEGER
+        FROM range(1, {customers * ORDERS_PER_CUSTOMER} + 1) t(i)
+        {pick('products', 'product')}
+        ORDER BY i
+    """)
+
+
+def build(db_path, global_data_path, scale=None, seed=0, log=print):
+    """Write the fixture database. Returns its metadata."""
+    start = time.perf_counter()
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = db_path.with_suffix('.tmp')
+    tmp.unlink(missing_ok=True)
+    conn = duckdb.connect(str(tmp))
+    try:
+        # The helper script still runs (once) for the Python values it defines
+        namespace = {'__name__': '__blog_validate__', 'conn': conn}
+        if Path(global_data_path).exists():
+            exec(compile(Path(global_data_path).read_text(encoding='utf-8'), str(global_data_path), 'exec'), namespace)
+        if scale:
+            for table in ('customers', 'orders'):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            _generate(conn, scale, seed)
+
+        _save_dataframes(conn, namespace)
+
+        meta = {'source': source_digest(global_data_path, scale, seed), 'scale': scale, 'seed': seed,
+                'python_globals': _plain_globals(namespace)}
+        conn.execute(f"CREATE TABLE {META_TABLE} (source VARCHAR, scale BIGINT, seed INTEGER, python_globals VARCHAR)")
+        conn.execute(f"INSERT INTO {META_TABLE} VALUES (?, ?, ?, ?)",
+                     [meta['source'], scale, seed, json.dumps(meta['python_globals'])])
+        counts = {t: conn.execute(f'SELECT count(*) FROM "{t}"').fetchone()[0] for t in tables(conn)}
+    finally:
+        conn.close()
+    os.replace(tmp, db_path)
+    rows = ', '.join(f"{t} {n:,}" for t, n in counts.items())
+    log(f"🗄️  Fixtures: {rows} rows in {time.perf_counter() - start:.2f}s -> {db_path.name}")
+    return meta
+
+
+def tables(conn, catalog=None):
+    """Fixture table names (without the metadata and DataFrame tables)."""
+    return [name for name in _table_names(conn, catalog)
+            if name != META_TABLE and not name.startswith(DATAFRAME_PREFIX)]
+
+
+def dataframes(conn, catalog=None):
+    """Names of the DataFrames saved by build(), e.g. ['customers_df', 'orders_df']."""
+    return [name[len(DATAFRAME_PREFIX):] for name in _table_names(conn, catalog) if name.startswith(DATAFRAME_PREFIX)]
+
+
+def load_dataframe(conn, name, catalog=None):
+    """A fresh copy of a saved DataFrame (this imports pandas)."""
+    table = f'"{catalog}".main."{DATAFRAME_PREFIX}{name}"' if catalog else f'"{DATAFRAME_PREFIX}{name}"'
+    return conn.execute(f"SELECT * FROM {table}").df()
+
+
+def _table_names(conn, catalog=None):
+    # No bound parameters: binding one makes duckdb import pandas
+    database = f"'{catalog}'" if catalog else "current_database()"
+    return [row[0] for row in conn.execute(
+        f"SELECT table_name FROM duckdb_tables() WHERE database_name = {database} "
+        f"AND schema_name = 'main' AND NOT temporary ORDER BY table_name").fetchall()]
+
+
+def ensure(db_path, global_data_path, log=print):
+    """Metadata of an up-to-date fixture database, rebuilding it (at the same
+    scale) only if _global_data.py or the format changed."""
+    meta = None
+    if Path(db_path).exists():
+        try:
+            with duckdb.connect(str(db_path), read_only=True) as conn:
+                meta = read_meta(conn)
+        except duckdb.Error:
+            meta = None
+    if meta and meta['source'] == source_digest(global_data_path, meta['scale'], meta['seed']):
+        return meta
+    return build(db_path, global_data_path, meta['scale'] if meta else None, meta['seed'] if meta else 0, log)
@@ -0,0 +1,93 @@
+"""
+Lightweight frontmatter helpers shared by the converters and the content index.
+
+These read single fields straight out of the YAML text with regexes, which is
+all the flat frontmatter in this site needs and avoids a YAML dependency.
+"""
+import re
+import unicodedata
+
+FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---\n(.*)$', flags=re.DOTALL)
+
+
+def slugify(text):
+    """
+    Convert to ASCII. Convert spaces to hyphens.
+    Remove characters that aren't alphanumerics, underscores, or hyphens.
+    Convert to lowercase. Strip leading and trailing whitespace.
+    """
+    text = str(text)
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    text = re.sub(r'[^\w\s-]', '', text).strip().lower()
+    return re.sub(r'[-\s]+', '-', text)
+
+
+def detect_existing_frontmatter(content):
+    """Detect if content already has Hugo/Obsidian frontmatter.
+    Returns (has_frontmatter: bool, frontmatter: str, body: str).
+    """
+    m = FRONTMATTER_RE.match(content)
+    if m:
+        return True, m.group(1), m.group(2)
+    return False, "", content
+
+
+def read_frontmatter(f):
+    """Streaming detect_existing_frontmatter for an open text file.
+    Reads only the leading `---` block and leaves `f` positioned at the start
+    of the body (rewound to the top if there is no frontmatter).
+    Returns (has_frontmatter: bool, frontmatter: str).
+    """
+    if f.readline() != '---\n':
+        f.seek(0)
+        return False, ""
+    lines = [f.readline()]
+    for line in iter(f.readline, ''):
+        if line == '---\n':
+            return True, ''.join(lines)[:-1]
+        lines.append(line)
+    f.seek(0)
+    return False, ""
+
+
+def unquote(value):
+    """Strip one pair of YAML quotes from a scalar, undoing their escapes."""
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    return value
+
+
+def extract_scalar(frontmatter, field):
+    """Extract a single-line scalar value from YAML frontmatter."""
+    m = re.search(rf'^{field}:[ \t]*(.*?)[ \t]*$', frontmatter, re.MULTILINE)
+    return unquote(m.group(1)).strip() if m else ""
+
+
+def extract_nested_scalar(frontmatter, parent, field):
+    """Extract `field` from an indented block under `parent:` (e.g. cover.image)."""
+    m = re.search(rf'^{parent}:[ \t]*\n((?:[ \t]+[^\n]*\n?)*)', frontmatter, re.MULTILINE)
+    if not m:
+        return ""
+    m2 = re.search(rf'^[ \t]+{field}:[ \t]*(.*?)[ \t]*$', m.group(1), re.MULTILINE)
+    return unquote(m2.group(1)).strip() if m2 else ""
+
+
+def extract_list(frontmatter, field):
+    """Extract a YAML list field. Returns a list of strings."""
+    # Block style: field:\n  - item
+    m = re.search(rf'^{field}:\s*\n((?:[ \t]+-[ \t]+[^\n]+\n?)*)', frontmatter, re.MULTILINE)
+    if m:
+        items = re.findall(r'[ \t]+-[ \t]+(.+)', m.group(1))
+        return [i.strip().strip('"\'').lstrip('#').strip() for i in items if i.strip()]
+    # Flow style: field: [a, b]
+    m2 = re.search(rf'^{field}:\s*\[([^\]]*)\]', frontmatter, re.MULTILINE)
+    if m2 and m2.group(1).strip():
+        return [i.strip().strip('"\'') for i in m2.group(1).split(',') if i.strip()]
+    return []
+
+
+def yaml_str(value):
+    """Escape a value for embedding in a YAML double-quoted string."""
+    return value.replace('\\', '\\\\').replace('"', '\\"')
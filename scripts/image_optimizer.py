@@ -0,0 +1,138 @@
+"""
+Optional image optimization for bundle images.
+
+Raster images wider than a maximum width are downscaled, JPEG/PNG/WebP are
+recompressed, and a WebP sibling can be written next to each one. Results are
+cached in .hugo/image-cache/ by source hash and settings, so converting the
+same post again only copies cached files. Pillow is imported lazily; without
+it images are copied unchanged.
+"""
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from convert_manifest import copy_if_changed, file_hash
+from timings import human_bytes
+
+OPTIMIZABLE_EXTS = {'.jpg', '.jpeg', '.png', '.webp'}
+
+
+def _optimize_one(src, cache_path, webp_path, max_width, quality):
+    """Pool worker: write the optimized image (and WebP sibling) into the cache."""
+    from PIL import Image, ImageOps
+
+    src = Path(src)
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)
+        resized = im.width > max_width
+        if resized:
+            im = im.resize((max_width, round(im.height * max_width / im.width)), Image.LANCZOS)
+
+        ext = src.suffix.lower()
+        tmp = Path(f"{cache_path}.tmp")
+        if ext in ('.jpg', '.jpeg'):
+            im.convert('RGB').save(tmp, 'JPEG', quality=quality, optimize=True, progressive=True)
+        elif ext == '.png':
+            im.save(tmp, 'PNG', optimize=True)
+        else:
+            im.save(tmp, 'WEBP', quality=quality, method=6)
+        # Never ship a "smaller" image that came out bigger
+        if not resized and tmp.stat().st_size >= src.stat().st_size:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, cache_path)
+
+        if webp_path:
+            tmp = Path(f"{webp_path}.tmp")
+            im.save(tmp, 'WEBP', quality=quality, method=6)
+            os.replace(tmp, webp_path)
+
+
+class ImageOptimizer:
+    """Downscale/recompress images into a bundle, cached by source hash."""
+
+    def __init__(self, cache_dir, max_width=1600, quality=82, webp=False, jobs=1):
+        self.cache_dir = Path(cache_dir)
+        self.max_width = max_width
+        self.quality = quality
+        self.webp = webp
+        self.jobs = jobs
+        try:
+            import PIL  # noqa: F401
+            self.available = True
+        except ImportError:
+            self.available = False
+
+    def settings(self):
+        """What the output depends on besides the source bytes (also fed to the manifest)."""
+        return {'max_width': self.max_width, 'quality': self.quality, 'webp': self.webp}
+
+    def _cache_paths(self, src, src_hash):
+        tag = hashlib.sha256(json.dumps(self.settings(), sort_keys=True).encode()).hexdigest()[:12]
+        base = self.cache_dir / f"{src_hash}-{tag}"
+        webp = Path(f"{base}.webp") if self.webp and src.suffix.lower() != '.webp' else None
+        return Path(f"{base}{src.suffix.lower()}"), webp
+
+    def place(self, copies, log=print, copy=copy_if_changed):
+        """Put each (source, dest, source hash or None) into the bundle.
+
+        Optimizable images are processed on a pool (cache misses only) and
+        copied from the cache; anything else is copied as is. `copy` does the
+        copying (e.g. AttachmentStore.place). Returns {dest: True if written}
+        and logs the bytes saved.
+        """
+        written = {}
+        if not self.available:
+            log("   ⚠️  Pillow not installed, copying images unoptimized (pip install pillow)")
+            for src, dest, digest in copies:
+                written[dest] = copy(src, dest, digest)
+            return written
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        plan = []
+        todo = []
+        for src, dest, digest in copies:
+            if src.suffix.lower() not in OPTIMIZABLE_EXTS:
+                written[dest] = copy(src, dest, digest)
+                continue
+            cached, webp = self._cache_paths(src, digest or file_hash(src))
+            plan.append((src, dest, cached, webp))
+            if not cached.exists() or (webp and not webp.exists()):
+                todo.append((str(src), str(cached), str(webp) if webp else None, self.max_width, self.quality))
+
+        failed = set()
+        if todo:
+            if self.jobs > 1 and len(todo) > 1:
+                with ProcessPoolExecutor(max_workers=min(self.jobs, len(todo))) as pool:
+                    futures = [(args[0], pool.submit(_optimize_one, *args)) for args in todo]
+                    outcomes = [(src, f.exception()) for src, f in futures]
+            else:
+                outcomes = []
+                for args in todo:
+                    try:
+                        _optimize_one(*args)
+                        outcomes.append((args[0], None))
+                    except Exception as e:
+                        outcomes.append((args[0], e))
+            for src, error in outcomes:
+                if error is not None:
+                    log(f"   ⚠️  Could not optimize {Path(src).name} ({error}), copying as is")
+                    failed.add(src)
+
+        before = after = 0
+        for src, dest, cached, webp in plan:
+            if str(src) in failed:
+                written[dest] = copy(src, dest)
+                continue
+            written[dest] = copy(cached, dest)
+            if webp:
+                copy(webp, dest.with_suffix('.webp'))
+            before += src.stat().st_size
+            after += cached.stat().st_size
+
+        if plan:
+            log(f"   🗜️  {len(plan)} image(s): {human_bytes(before)} → {human_bytes(after)} "
+                f"(saved {human_bytes(before - after)}, {len(todo)} processed, {len(plan) - len(todo)} cached)")
+        return written
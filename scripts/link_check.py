@@ -0,0 +1,232 @@
+"""
+Outbound link checking for check-links.py.
+
+URLs are collected from every bundle in one pass (markdown links, autolinks
+and bare URLs in the body outside code, plus source_url/newsletter_url in the
+frontmatter). They are checked concurrently over one pooled httpx client:
+HEAD first, then GET when the server rejects or fails HEAD, with a per-host
+concurrency limit and a minimum interval between requests to the same host.
+Results are cached in .hugo/link-check-cache.json; good links are rechecked
+after the TTL, failures sooner, so daily runs mostly hit the cache. Without
+httpx the links are checked one at a time with urllib.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+from content_bundles import scan_bundles
+from frontmatter_fields import detect_existing_frontmatter, extract_scalar
+from markdown_text import CODE_SPAN_RE, fenced_lines
+
+CACHE_VERSION = 1
+DEFAULT_TTL = 7 * 24 * 3600
+FAILED_TTL = 24 * 3600
+USER_AGENT = 'Mozilla/5.0 (compatible; jamalhansen.com link checker)'
+
+URL_RE = re.compile(r'https?://[^\s<>"\'`)\]]+')
+FRONTMATTER_URL_FIELDS = ('source_url', 'newsletter_url')
+# Hosts that only exist on the author's machine or in documentation examples
+LOCAL_HOSTS = {'localhost', '127.0.0.1', '0.0.0.0', '::1', 'example.com', 'example.org', 'example.net'}
+# HEAD answers that don't prove the page is gone; the link is retried with GET
+RETRY_WITH_GET = {403, 404, 405, 406, 429, 500, 501, 502, 503}
+
+
+def _clean(url):
+    # Trailing punctuation belongs to the sentence, not the URL
+    url = url.rstrip('.,;:!?*_')
+    if url.endswith('(') or (url.count('(') < url.count(')') and url.endswith(')')):
+        url = url[:-1]
+    return url
+
+
+def urls_in_body(body):
+    """URLs in markdown text, skipping fenced code blocks and code spans."""
+    found = []
+    for line, in_code in fenced_lines(body.splitlines()):
+        if not in_code and '://' in line:
+            found.extend(_clean(u) for u in URL_RE.findall(CODE_SPAN_RE.sub('', line)))
+    return found
+
+
+def collect_links(content_dir, include_local=False):
+    """{url: [bundle paths]} for every outbound link in content_dir."""
+    links = {}
+    for rel in sorted(scan_bundles(content_dir)):
+        content = (content_dir / rel).read_text(encoding='utf-8')
+        _, fm, body = detect_existing_frontmatter(content)
+        urls = [extract_scalar(fm, field) for field in FRONTMATTER_URL_FIELDS] + urls_in_body(body)
+        for url in urls:
+            if not url.startswith(('http://', 'https://')):
+                continue
+            host = (urllib.parse.urlsplit(url).hostname or '').lower()
+            if not host or (not include_local and (host in LOCAL_HOSTS or host.endswith('.local'))):
+                continue
+            pages = links.setdefault(url, [])
+            if rel not in pages:
+                pages.append(rel)
+    return links
+
+
+class LinkCache:
+    """JSON file of url -> {"status", "ok", "error", "checked"}.
+    Good results live for `ttl` seconds, failures for `failed_ttl`."""
+
+    def __init__(self, path, ttl=DEFAULT_TTL, failed_ttl=FAILED_TTL):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.failed_ttl = failed_ttl
+        self.entries = {}
+        self._dirty = False
+        if self.path:
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                if data.get('version') == CACHE_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                pass
+
+    def get(self, url, now=None):
+        entry = self.entries.get(url)
+        if entry and (now or time.time()) - entry['checked'] < (self.ttl if entry['ok'] else self.failed_ttl):
+            return entry
+        return None
+
+    def put(self, url, result, now=None):
+        self.entries[url] = {**result, 'checked': now or time.time()}
+        self._dirty = True
+
+    def prune(self, keep):
+        """Forget URLs no page links to any more."""
+        stale = self.entries.keys() - set(keep)
+        for url in stale:
+            del self.entries[url]
+        self._dirty = self._dirty or bool(stale)
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'version': CACHE_VERSION, 'entries': self.entries}, indent=1), encoding='utf-8')
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def _result(status, error=None):
+    # 429 means "slow down", not "gone"
+    return {'status': status, 'ok': status is not None and (status < 400 or status == 429), 'error': error}
+
+
+class _HostGate:
+    """At most `per_host` requests in flight per host, started at least `interval` s apart."""
+
+    def __init__(self, per_host, interval):
+        self.per_host = per_host
+        self.interval = interval
+        self.slots = {}
+        self.locks = {}
+        self.next_start = {}
+
+    async def enter(self, host):
+        await self.slots.setdefault(host, asyncio.Semaphore(self.per_host)).acquire()
+        if self.interval:
+            async with self.locks.setdefault(host, asyncio.Lock()):
+                now = time.monotonic()
+                start = max(now, self.next_start.get(host, now))
+                self.next_start[host] = start + self.interval
+            await asyncio.sleep(start - now)
+
+    def leave(self, host):
+        self.slots[host].release()
+
+
+async def _check_all_async(urls, timeout, per_host, interval, on_result):
+    import httpx
+
+    gate = _HostGate(per_host, interval)
+    errors = (httpx.HTTPError, httpx.InvalidURL, ValueError)
+    hosts = {urllib.parse.urlsplit(url).netloc for url in urls}
+    limits = httpx.Limits(max_connections=per_host * len(hosts), max_keepalive_connections=per_host * len(hosts))
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits, headers={'User-Agent': USER_AGENT},
+                                 follow_redirects=True) as client:
+        async def request(method, url, host):
+            await gate.enter(host)
+            try:
+                if method == 'GET':
+                    # Only the status matters; don't download the page
+                    async with client.stream('GET', url) as resp:
+                        return resp.status_code
+                return (await client.head(url)).status_code
+            finally:
+                gate.leave(host)
+
+        async def check(url):
+            host = urllib.parse.urlsplit(url).netloc
+            try:
+                status = await request('HEAD', url, host)
+                if status in RETRY_WITH_GET:
+                    status = await request('GET', url, host)
+                result = _result(status)
+            except errors as e:
+                try:
+                    result = _result(await request('GET', url, host))
+                except errors:
+                    message = str(e).splitlines()[0] if str(e) else ''
+                    result = _result(None, f"{type(e).__name__}: {message}" if message else type(e).__name__)
+            on_result(url, result)
+
+        await asyncio.gather(*(check(url) for url in urls))
+
+
+def _check_all_serial(urls, timeout, on_result):
+    for url in urls:
+        result = None
+        for method in ('HEAD', 'GET'):
+            req = urllib.request.Request(url, method=method, headers={'User-Agent': USER_AGENT})
+            try:
+                with urllib.request.urlopen(req, timeout=timeout) as resp:
+                    result = _result(resp.status)
+            except urllib.error.HTTPError as e:
+                result = _result(e.code)
+            except Exception as e:
+                result = _result(None, f"{type(e).__name__}: {e}")
+            if result['ok']:
+                break
+        on_result(url, result)
+
+
+def check_links(urls, cache=None, timeout=15, per_host=2, interval=0.5, force=False, log=print):
+    """Check many URLs at once. Returns ({url: result}, number served from cache).
+
+    Cached results younger than their TTL are reused (unless `force`); the
+    rest are checked concurrently and stored back in `cache`.
+    """
+    results = {}
+    pending = []
+    for url in urls:
+        entry = None if force or cache is None else cache.get(url)
+        if entry is not None:
+            results[url] = entry
+        else:
+            pending.append(url)
+    cached = len(results)
+
+    def on_result(url, result):
+        results[url] = result
+        if cache is not None:
+            cache.put(url, result)
+
+    if pending:
+        try:
+            asyncio.run(_check_all_async(pending, timeout, per_host, interval, on_result))
+        except ImportError:
+            log("⚠️  httpx not installed, checking links one at a time")
+            _check_all_serial(pending, timeout, on_result)
+    return results, cached
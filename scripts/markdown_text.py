@@ -0,0 +1,40 @@
+"""
+Walking markdown while leaving code alone.
+
+Shared by obsidian-to-hugo.py, wiki_links.py and link_check.py, which all
+rewrite or read markdown line by line but must not touch fenced code blocks
+or `code spans`.
+"""
+import re
+
+FENCE_RE = re.compile(r' {0,3}(`{3,}|~{3,})')
+CODE_SPAN_RE = re.compile(r'(`+).+?\1')
+
+
+def fenced_lines(lines):
+    """(line, in_code) for every line; the fence lines themselves are code.
+    A fence closes on a line of at least as many of the same character."""
+    fence = None
+    for line in lines:
+        fence_match = FENCE_RE.match(line)
+        if fence:
+            closer = fence_match.group(1) if fence_match else ''
+            if closer[:1] == fence[0] and len(closer) >= len(fence) and not line[fence_match.end():].strip():
+                fence = None
+            yield line, True
+        elif fence_match:
+            fence = fence_match.group(1)
+            yield line, True
+        else:
+            yield line, False
+
+
+def outside_code_spans(text, convert):
+    """Apply convert() to the parts of one line that aren't code spans."""
+    out, last = [], 0
+    for code in CODE_SPAN_RE.finditer(text):
+        out.append(convert(text[last:code.start()]))
+        out.append(code.group(0))
+        last = code.end()
+    out.append(convert(text[last:]))
+    return ''.join(out)
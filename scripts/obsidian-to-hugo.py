@@ -2,272 +2,946 @@
 """
 Convert Obsidian markdown to Hugo-compatible markdown with page bundle setup.
 Usage: python obsidian-to-hugo.py input.md post-slug [obsidian-vault-path]
+       python obsidian-to-hugo.py --batch <dir|glob> [obsidian-vault-path] [--jobs N]
+       python obsidian-to-hugo.py --watch <drafts-dir> [obsidian-vault-path] [--poll]
+Add --optimize-images [--max-width PX] [--quality Q] [--webp] to shrink images,
+--enrich to have a local model (Ollama) fill in missing descriptions and tags,
+--timings (alias --profile) and/or --timings-json PATH to see where time goes.
 """
+import argparse
+import glob
+import itertools
+import os
 import sys
 import re
-import shutil
-import unicodedata
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import unquote
 
-def slugify(text):
-    """
-    Convert to ASCII. Convert spaces to hyphens.
-    Remove characters that aren't alphanumerics, underscores, or hyphens.
-    Convert to lowercase. Strip leading and trailing whitespace.
-    """
-    text = str(text)
-    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
-    text = re.sub(r'[^\w\s-]', '', text).strip().lower()
-    return re.sub(r'[-\s]+', '-', text)
-
-def detect_existing_frontmatter(content):
-    """Detect if content already has Hugo/Obsidian frontmatter.
-    Returns (has_frontmatter: bool, frontmatter: str, body: str).
-    """
-    m = re.match(r'^---\n(.*?)\n---\n(.*)$', content, flags=re.DOTALL)
-    if m:
-        return True, m.group(1), m.group(2)
-    return False, "", content
-
-def yaml_str(value):
-    """Escape a value for embedding in a YAML double-quoted string."""
-    return value.replace('\\', '\\\\').replace('"', '\\"')
+from attachment_index import AttachmentIndex
+from attachment_store import IMAGE_EXTS, AttachmentStore
+from convert_manifest import ConvertManifest, file_hash, write_stream_if_changed
+from enrichment import DEFAULT_MODEL, MAX_PROMPT_CHARS, Enricher
+from frontmatter_fields import extract_list, extract_nested_scalar, extract_scalar, read_frontmatter, slugify, yaml_str
+from image_optimizer import ImageOptimizer
+from markdown_text import fenced_lines
+import site_data
+from timings import NO_TIMINGS, Timings, report
+from vault_watch import OVERFLOW, make_watcher, watch
+from wiki_links import LinkIndex, source_name
 
 def clean_obsidian_links_from_frontmatter(frontmatter):
     """Remove Obsidian wiki-link syntax [[]] from frontmatter values"""
     return re.sub(r'\[\[([^\]]+)\]\]', r'\1', frontmatter)
 
+# ---------------------------------------------------------------------------
+# Frontmatter normalization
+#
+# The frontmatter is parsed once into an ordered list of fields (a top-level
+# `key:` line plus any indented continuation lines). Facts that depend on the
+# whole block (first status value, unsplash credit, cover image, ...) are
+# collected while parsing; FIELD_RULES is then applied in a single traversal
+# and the result is serialized once. Values are read from the key's own line.
+# ---------------------------------------------------------------------------
+
+FM_KEY_RE = re.compile(r'([^\s:#-][^:]*):')
+FM_SCALAR_RE = re.compile(r'\s*["\']?([^"\'\n]+)["\']?\s*$')
+FM_WORD_RE = re.compile(r'\s*["\']?(\w+)["\']?\s*$')
+FM_SERIES_SCALAR_RE = re.compile(r'[ \t]*(\S[^\n]*?)[ \t]*$')
+TOC_TRUE_RE = re.compile(r'^toc:\s*true')
+TOC_FALSE_RE = re.compile(r'^toc:\s*false')
+TAG_ITEM_LINE_RE = re.compile(r'  - [^\n]+')
+TAG_HASH_RE = re.compile(r'- ["\']*#([^"\'\n]+)["\']*')
+EMPTY_TAG_RE = re.compile(r'  -\s*')
+COVER_RELATIVE_RE = re.compile(r'(relative:\s*true)')
+
+# Obsidian capitalizations and PaperMod names (summary -> description)
+FIELD_RENAMES = {
+    'Series': 'series', 'Status': 'status', 'Author': 'author',
+    'Tags': 'tags', 'Category': 'category', 'summary': 'description',
+}
+
+# Redundant or theme-clashing fields; the key line is dropped
+DROPPED_FIELDS = {
+    'canonical_url', 'layout', 'created', 'Created', 'promo_file',
+    'series_position', 'target_date', 'post',
+    'unsplash_name', 'unsplash_user', 'unsplash_id',
+}
+
+class _Field:
+    __slots__ = ('key', 'head', 'line', 'rest', 'line_no')
+
+    def __init__(self, key, head, line, line_no):
+        self.key = key        # canonical key, or None for lines before the first key
+        self.head = head      # text after "key:" on the key line
+        self.line = line      # the key line as it will be written
+        self.rest = []        # continuation lines
+        self.line_no = line_no
+
+# Fields whose first usable value feeds other rules, and how to read it
+FACT_PATTERNS = {
+    'published_date': FM_SCALAR_RE, 'status': FM_WORD_RE,
+    'unsplash_name': FM_SCALAR_RE, 'unsplash_user': FM_SCALAR_RE, 'unsplash_id': FM_SCALAR_RE,
+    'alt': FM_SCALAR_RE, 'image': FM_SCALAR_RE, 'series': FM_SERIES_SCALAR_RE,
+}
+
+def parse_frontmatter(frontmatter):
+    """Split frontmatter into ordered fields and collect whole-block facts."""
+    lines = frontmatter.split('\n')
+    fields = []
+    facts = dict.fromkeys(FACT_PATTERNS)
+    facts['last_line_no'] = len(lines) - 1
+    facts['has_draft'] = False
+    for line_no, line in enumerate(lines):
+        m = FM_KEY_RE.match(line)
+        if not m:
+            if fields:
+                fields[-1].rest.append(line)
+            else:
+                fields.append(_Field(None, '', line, line_no))
+            continue
+
+        key = raw_key = m.group(1)
+        head = line[m.end():]
+        if raw_key in FIELD_RENAMES:
+            key = FIELD_RENAMES[raw_key]
+            line = f"{key}:{head}"
+        fields.append(_Field(key, head, line, line_no))
+
+        if key in FACT_PATTERNS:
+            if facts[key] is None:
+                v = FACT_PATTERNS[key].match(head)
+                if v:
+                    facts[key] = v.group(1).strip()
+        elif key == 'draft':
+            facts['has_draft'] = True
+    return fields, facts
+
+def _series_is_block_list(out, start):
+    """True if the `series:` key at out[start] is followed by an indented `- item`.
+
+    Looks at the lines that survived the other rules, so a dropped field
+    between `series:` and its list doesn't hide the list.
+    """
+    series = out[start]
+    if series.head.strip():
+        return False
+    gap = series.head + '\n'
+    following = itertools.chain(series.rest, *(
+        [item.line, *item.rest] if isinstance(item, _Field) else [item] for item in out[start + 1:]))
+    for line in following:
+        stripped = line.lstrip()
+        if stripped:
+            # The list item must be indented (or separated by a blank line)
+            gap += line[:len(line) - len(stripped)]
+            return stripped.startswith('-') and '\n' in gap[:-1]
+        gap += line + '\n'
+    return False
+
+def _keep(field, facts):
+    return [field.line] + field.rest
+
+def _drop(field, facts):
+    return field.rest
+
+def _toc_rule(field, facts):
+    line = TOC_TRUE_RE.sub('ShowToc: true\nTocOpen: false', field.line)
+    line = TOC_FALSE_RE.sub('ShowToc: false', line)
+    return [line] + field.rest
+
+def _tags_rule(field, facts):
+    """Strip # prefixes and empty entries from a `tags:` block list."""
+    if field.head.strip() or field.line_no == facts['last_line_no']:
+        return _keep(field, facts)
+    out = [field.line]
+    rest = field.rest
+    i = 0
+    while i < len(rest) and not rest[i].strip():
+        out.append(rest[i])
+        i += 1
+    while i < len(rest) and TAG_ITEM_LINE_RE.fullmatch(rest[i]) and field.line_no + 1 + i < facts['last_line_no']:
+        item = TAG_HASH_RE.sub(r'- \1', rest[i])
+        if not EMPTY_TAG_RE.fullmatch(item):
+            out.append(item)
+        i += 1
+    return out + rest[i:]
+
+def _published_date_rule(field, facts):
+    if facts['published_date'] is None:
+        return _keep(field, facts)
+    return [f"date: {facts['published_date']}"] + field.rest
+
+def _status_rule(field, facts):
+    status = facts['status']
+    if status and status.lower() == 'draft' and not facts['has_draft']:
+        return ['draft: true'] + field.rest
+    return field.rest
+
+def _alt_rule(field, facts):
+    # Only removed when a usable value exists (it moves into cover.alt)
+    return field.rest if facts['alt'] is not None else _keep(field, facts)
+
+def _image_rule(field, facts):
+    img = facts['image']
+    if img is None:
+        return _keep(field, facts)
+    if not img:
+        return field.rest
+    alt_value = yaml_str(facts['alt']) if facts['alt'] else ""
+    cover_block = f'cover:\n  image: "{yaml_str(img)}"\n  alt: "{alt_value}"\n  caption: ""\n  relative: true{facts["credit_block"]}'
+    return [cover_block] + field.rest
+
+def _weight_rule(field, facts):
+    # Strip empty weight field; keep it when set
+    return field.rest if not field.head.strip() else _keep(field, facts)
+
+def _series_rule(field, facts):
+    """Convert a scalar series to Hugo's array format; strip it if empty."""
+    raw = facts['series']
+    if raw is None or facts.get('already_array'):
+        return _keep(field, facts)
+    # Strip surrounding quotes of any style (handles 'value', "value", '"value"')
+    value = raw.strip("'\"").strip("'\"") if raw != '[]' else ''
+    if value:
+        return [f'series:\n  - "{value}"'] + field.rest
+    return field.rest
+
+FIELD_RULES = {
+    'toc': _toc_rule,
+    'tags': _tags_rule,
+    'published_date': _published_date_rule,
+    'status': _status_rule,
+    'alt': _alt_rule,
+    'image': _image_rule,
+    'weight': _weight_rule,
+    **{field: _drop for field in DROPPED_FIELDS},
+}
+
+def _has_cover(fields, facts):
+    """True if a `cover:` block survives the fields dropped ahead of it."""
+    for field in fields:
+        if any('cover:' in line for line in field.rest):
+            return True
+        if field.key in ('status', 'unsplash_name', 'unsplash_user', 'unsplash_id'):
+            continue
+        if field.key in ('alt', 'published_date') and facts[field.key] is not None:
+            continue
+        if 'cover:' in field.line:
+            return True
+    return False
+
+def _credit_block(facts):
+    """cover.credit lines built from unsplash_name/user/id."""
+    name, user, photo_id = facts['unsplash_name'], facts['unsplash_user'], facts['unsplash_id']
+    if name is None and user is None and photo_id is None:
+        return ""
+    credit_block = "\n  credit:"
+    if name is not None: credit_block += f'\n    name: "{yaml_str(name)}"'
+    if user is not None: credit_block += f'\n    username: "{yaml_str(user)}"'
+    if photo_id is not None: credit_block += f'\n    photo_id: "{yaml_str(photo_id)}"'
+    return credit_block
+
 def normalize_frontmatter_fields(frontmatter):
     """Normalize frontmatter field names to PaperMod theme conventions"""
-    # Normalize capitalized field names to lowercase
-    for field in ['Series', 'Status', 'Author', 'Tags', 'Category']:
-        frontmatter = re.sub(rf'^{field}:', field.lower() + ':', frontmatter, flags=re.MULTILINE)
-
-    # Change summary: to description: (PaperMod uses description)
-    frontmatter = re.sub(r'^summary:', 'description:', frontmatter, flags=re.MULTILINE)
-    
-    # PaperMod uses ShowToc instead of toc
-    frontmatter = re.sub(r'^toc:\s*true', 'ShowToc: true\nTocOpen: false', frontmatter, flags=re.MULTILINE)
-    frontmatter = re.sub(r'^toc:\s*false', 'ShowToc: false', frontmatter, flags=re.MULTILINE)
-
-    # Clean up tags (remove # hashes and empty entries)
-    def remove_tag_hashes(match):
-        cleaned = re.sub(r'- ["\']*#([^"\'\n]+)["\']*', r'- \1', match.group(0))
-        cleaned = re.sub(r'  -\s*\n', '', cleaned)
-        return cleaned
-
-    frontmatter = re.sub(r'^tags:\s*\n(?:  - [^\n]+\n)*', remove_tag_hashes, frontmatter, flags=re.MULTILINE)
-
-    # Convert published_date to date (Hugo field)
-    published_date_match = re.search(r'^published_date:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE)
-    if published_date_match:
-        pub_date = published_date_match.group(1).strip()
-        frontmatter = re.sub(r'^published_date:[^\n]*\n?', f'date: {pub_date}\n', frontmatter, flags=re.MULTILINE)
-
-    # Convert status: draft -> draft: true; strip status field
-    status_match = re.search(r'^status:\s*["\']?(\w+)["\']?\s*$', frontmatter, re.MULTILINE)
-    if status_match and status_match.group(1).lower() == 'draft':
-        if not re.search(r'^draft:', frontmatter, re.MULTILINE):
-            frontmatter = re.sub(r'^status:[^\n]*\n?', 'draft: true\n', frontmatter, flags=re.MULTILINE)
-        else:
-            frontmatter = re.sub(r'^status:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
-    else:
-        frontmatter = re.sub(r'^status:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+    fields, facts = parse_frontmatter(frontmatter)
+    facts['credit_block'] = credit_block = _credit_block(facts)
 
-    # Process Unsplash credit and Cover images
-    unsplash_data = {
-        'name': re.search(r'^unsplash_name:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE),
-        'user': re.search(r'^unsplash_user:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE),
-        'id': re.search(r'^unsplash_id:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE)
-    }
-    
-    credit_info = {k: v.group(1).strip() for k, v in unsplash_data.items() if v}
-    
-    # Remove raw unsplash fields
-    for field in ['unsplash_name', 'unsplash_user', 'unsplash_id']:
-        frontmatter = re.sub(rf'^{field}:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
-
-    # Build credit block
-    credit_block = ""
-    if credit_info:
-        credit_block = "\n  credit:"
-        if 'name' in credit_info: credit_block += f'\n    name: "{yaml_str(credit_info["name"])}"'
-        if 'user' in credit_info: credit_block += f'\n    username: "{yaml_str(credit_info["user"])}"'
-        if 'id' in credit_info: credit_block += f'\n    photo_id: "{yaml_str(credit_info["id"])}"'
-
-    # Capture standalone alt field to use in cover.alt, then remove it
-    standalone_alt = ""
-    alt_match = re.search(r'^alt:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE)
-    if alt_match:
-        standalone_alt = alt_match.group(1).strip()
-        frontmatter = re.sub(r'^alt:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
-
-    # Convert simple image: to PaperMod cover:
-    image_match = re.search(r'^image:\s*["\']?([^"\'\n]+)["\']?\s*$', frontmatter, re.MULTILINE)
-    if image_match:
-        img = image_match.group(1).strip()
-        if img:
-            alt_value = yaml_str(standalone_alt) if standalone_alt else ""
-            cover_block = f'cover:\n  image: "{yaml_str(img)}"\n  alt: "{alt_value}"\n  caption: ""\n  relative: true{credit_block}'
-            frontmatter = re.sub(r'^image:[^\n]*\n?', cover_block + '\n', frontmatter, flags=re.MULTILINE)
+    out = []
+    series_at = []
+    for field in fields:
+        if field.key == 'series':
+            # Resolved last: whether series is already a list depends on
+            # which of the lines after it survive
+            series_at.append(len(out))
+            out.append(field)
         else:
-            frontmatter = re.sub(r'^image:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
-    elif credit_block:
-        # Inject credit into existing cover if possible
-        if 'cover:' in frontmatter:
-            frontmatter = re.sub(r'(relative:\s*true)', r'\1' + credit_block, frontmatter)
-
-    # Strip Obsidian's capital-A Author: scalar (keep lowercase author: list)
-    frontmatter = re.sub(r'^Author:\s*\S[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
-
-    # Clean up redundant or theme-clashing fields
-    for field in ['canonical_url', 'layout', 'created', 'Created',
-                  'Category', 'promo_file', 'series_position', 'target_date', 'post']:
-        frontmatter = re.sub(rf'^{field}:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
-
-    # Strip empty weight field
-    frontmatter = re.sub(r'^weight:\s*\n?', '', frontmatter, flags=re.MULTILINE)
-
-    # Convert series scalar string to Hugo array format; strip if empty
-    series_scalar = re.search(r'^series:[ \t]*(\S[^\n]*?)[ \t]*$', frontmatter, re.MULTILINE)
-    already_array = re.search(r'^series:\s*\n\s+-', frontmatter, re.MULTILINE)
-    if series_scalar and not already_array:
-        raw = series_scalar.group(1).strip()
-        if raw in ('[]', ''):
-            frontmatter = re.sub(r'^series:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
-        else:
-            # Strip surrounding quotes of any style (handles 'value', "value", '"value"')
-            value = raw.strip("'\"").strip("'\"")
-            if value:
-                frontmatter = re.sub(r'^series:[^\n]*\n?', f'series:\n  - "{value}"\n', frontmatter, flags=re.MULTILINE)
-            else:
-                frontmatter = re.sub(r'^series:[^\n]*\n?', '', frontmatter, flags=re.MULTILINE)
+            out.extend(FIELD_RULES.get(field.key, _keep)(field, facts))
+
+    if series_at:
+        facts['already_array'] = any(_series_is_block_list(out, i) for i in series_at)
+        for i in reversed(series_at):
+            out[i:i + 1] = _series_rule(out[i], facts)
+
+    # No image: to expand, so merge the credit into an existing cover block
+    if facts['image'] is None and credit_block and _has_cover(fields, facts):
+        out = [COVER_RELATIVE_RE.sub(r'\1' + credit_block, line) for line in out]
+
+    return '\n'.join(out).strip()
+
+# Patterns used once per note; compiled at import so batch runs share them
+WIKI_EMBED_RE = re.compile(r'!\[\[([^\]|]+)\]\]')
+WIKI_EMBED_ALT_RE = re.compile(r'!\[\[([^\]|]+)\|([^\]]+)\]\]')
+CALLOUT_RE = re.compile(r'^>\s+\[!(\w+)\]\+?\s*(.*)', re.MULTILINE | re.IGNORECASE)
+SLUG_RE = re.compile(r'^slug:\s*["\']?(.+?)["\']?\s*$', re.MULTILINE)
+H1_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+HAS_SLUG_RE = re.compile(r'^slug:', re.MULTILINE)
+HAS_AUTHOR_RE = re.compile(r'^author:', re.MULTILINE)
+DATE_LINE_RE = re.compile(r'^(date:[^\n]*)', re.MULTILINE)
+SERIES_ITEM_RE = re.compile(r'^series:\s*\n\s*-\s*["\']?(.+?)["\']?\s*$', re.MULTILINE)
+TAGS_BLOCK_RE = re.compile(r'^tags:\s*\n((?:[ \t]*-[^\n]*\n)*)', re.MULTILINE)
+TAG_ITEM_RE = re.compile(r'^[ \t]*-[ \t]*["\']?(\S+?)["\']?[ \t]*$', re.MULTILINE)
+MD_IMAGE_RE = re.compile(r'!\[.*?\]\(([^)]+)\)')
+EMPTY_DESCRIPTION_RE = re.compile(r'^description:[ \t]*(?:""|\'\')?[ \t]*$', re.MULTILINE)
+EMPTY_TAGS_RE = re.compile(r'^tags:[ \t]*(?:\[\])?[ \t]*$(?!\n[ \t]*-)', re.MULTILINE)
 
-    return frontmatter.strip()
+# Tag → subfolder routing (used when series field is empty)
+TAG_FOLDERS = {
+    'tsql2sday': 'tsql-tuesday',
+}
 
-def convert_body_syntax(content):
+# Converted bodies larger than this are spooled to a temp file instead of memory
+SPOOL_MAX_BYTES = 8 << 20
+
+BASE_DIR = Path(__file__).parent.parent
+ATTACHMENT_INDEX_PATH = BASE_DIR / ".hugo" / "attachment-index.json"
+MANIFEST_PATH = BASE_DIR / ".hugo" / "obsidian-manifest.json"
+# Source note names for [[wiki link]] resolution come from both converters' manifests
+LINK_MANIFESTS = (MANIFEST_PATH, BASE_DIR / ".hugo" / "finds-manifest.json")
+IMAGE_CACHE_DIR = BASE_DIR / ".hugo" / "image-cache"
+ENRICHMENT_CACHE_PATH = BASE_DIR / ".hugo" / "enrichment-cache.json"
+ATTACHMENT_STORE_DIR = BASE_DIR / ".hugo" / "attachment-store"
+
+def convert_body_lines(lines, found=None, links=None):
+    """Convert Obsidian-specific syntax line by line, yielding Hugo-compatible markdown.
+
+    Fenced code blocks pass through untouched. If `found` is a dict, the first
+    H1 title ('h1') and the referenced image paths ('images') are collected in it.
+    With a LinkIndex as `links`, [[wiki links]] become Hugo refs; `found` then
+    also gets 'links' (target -> destination) and 'unresolved' (targets).
+    """
+    for line, in_code in fenced_lines(lines):
+        if in_code:
+            yield line
+            continue
+
+        text, nl = (line[:-1], '\n') if line.endswith('\n') else (line, '')
+        if '![[' in text:
+            # ![[image.jpg]] -> ![Image](image.jpg)
+            text = WIKI_EMBED_RE.sub(r'![Image](\1)', text)
+            # ![[image.jpg|alt]] -> ![alt](image.jpg)
+            text = WIKI_EMBED_ALT_RE.sub(r'![\2](\1)', text)
+        if links is not None and '[[' in text:
+            # [[Note]] / [[Note|label]] -> [label]({{< relref "/blog/note" >}})
+            text = links.rewrite(text, found.setdefault('links', {}), found.setdefault('unresolved', []))
+        if text.startswith('>'):
+            # Obsidian callouts [!info] -> Hugo/Goldmark blockquotes (basic support)
+            text = CALLOUT_RE.sub(r'> **\1**: \2', text)
+        if found is not None:
+            if 'h1' not in found and text.startswith('#'):
+                h1_match = H1_RE.match(text)
+                if h1_match:
+                    found['h1'] = h1_match.group(1).strip()
+            if '](' in text:
+                found.setdefault('images', []).extend(MD_IMAGE_RE.findall(text))
+        yield text + nl
+
+def convert_body_syntax(content, links=None):
     """Convert Obsidian-specific syntax to Hugo-compatible markdown"""
-    # ![[image.jpg]] -> ![Image](image.jpg)
-    content = re.sub(r'!\[\[([^\]|]+)\]\]', r'![Image](\1)', content)
-    # ![[image.jpg|alt]] -> ![alt](image.jpg)
-    content = re.sub(r'!\[\[([^\]|]+)\|([^\]]+)\]\]', r'![\2](\1)', content)
-    # Obsidian callouts [!info] -> Hugo/Goldmark blockquotes (basic support)
-    content = re.sub(r'^>\s+\[!(\w+)\]\+?\s*(.*)', r'> **\1**: \2', content, flags=re.MULTILINE | re.IGNORECASE)
-    return content
+    return ''.join(convert_body_lines(content.splitlines(keepends=True), {}, links))
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python obsidian-to-hugo.py input.md post-slug [vault-path]")
-        sys.exit(1)
-    
-    input_path = Path(sys.argv[1])
-    # Optimization: Ensure the slug is always clean (dashes, lowercase)
-    slug = slugify(sys.argv[2])
-    vault_path = Path(sys.argv[3]) if len(sys.argv) > 3 else None
-    
-    if not input_path.exists():
-        print(f"Error: Input file '{input_path}' not found")
-        sys.exit(1)
-    
-    with open(input_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    has_fm, fm, body = detect_existing_frontmatter(content)
-    
+def build_frontmatter(has_fm, fm, input_path, slug, title=None, log=print):
+    """Produce a note's Hugo frontmatter from its Obsidian frontmatter (if any).
+    `title` (the body's first H1) is only used when creating new frontmatter.
+    Returns (fm, slug) where slug may be overridden by the note's frontmatter.
+    """
     if has_fm:
-        print("✅ Found existing frontmatter")
+        log("✅ Found existing frontmatter")
         fm = clean_obsidian_links_from_frontmatter(fm)
         fm = normalize_frontmatter_fields(fm)
 
         # Prioritize slug from Obsidian frontmatter
-        obsidian_slug_match = re.search(r'^slug:\s*["\']?(.+?)["\']?\s*$', fm, re.MULTILINE)
+        obsidian_slug_match = SLUG_RE.search(fm)
         if obsidian_slug_match:
             slug = slugify(obsidian_slug_match.group(1))
-            print(f"🔗 Using slug from Obsidian: {slug}")
+            log(f"🔗 Using slug from Obsidian: {slug}")
 
-        # Extract title from FM if possible
-        title_match = re.search(r'^title:\s*["\']?(.+?)["\']?\s*$', fm, re.MULTILINE)
-        title = title_match.group(1).strip('"\'') if title_match else input_path.stem.replace('-', ' ').title()
         # Inject slug if missing
-        if not re.search(r'^slug:', fm, re.MULTILINE):
+        if not HAS_SLUG_RE.search(fm):
             fm = f"slug: {slug}\n" + fm
         # Inject author if missing
-        if not re.search(r'^author:', fm, re.MULTILINE):
-            fm = re.sub(r'^(date:[^\n]*)', r'\1\nauthor:\n  - Jamal Hansen', fm, count=1, flags=re.MULTILINE)
+        if not HAS_AUTHOR_RE.search(fm):
+            fm = DATE_LINE_RE.sub(r'\1\nauthor:\n  - Jamal Hansen', fm, count=1)
     else:
-        print("ℹ️  Creating new frontmatter")
-        # Extract title from first H1 or filename
-        h1_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-        title = h1_match.group(1).strip() if h1_match else input_path.stem.replace('-', ' ').title()
+        log("ℹ️  Creating new frontmatter")
+        # Title from first H1 or filename
+        title = title or input_path.stem.replace('-', ' ').title()
         fm = f'title: "{title}"\nslug: {slug}\ndate: {datetime.now().strftime("%Y-%m-%d")}\nauthor:\n  - Jamal Hansen\ndraft: true\ndescription: ""\ntags: []\ncategories: []\nseries: []\ncover:\n  image: ""\n  alt: ""\n  caption: ""\n  relative: true\nShowToc: true\nTocOpen: false'
 
-    converted_body = convert_body_syntax(body if has_fm else content)
-    final_content = f"---\n{fm}\n---\n\n{converted_body}"
+    return fm, slug
 
-    # Tag → subfolder routing (used when series field is empty)
-    TAG_FOLDERS = {
-        'tsql2sday': 'tsql-tuesday',
-    }
+def needs_enrichment(fm):
+    """True if a note's own frontmatter lacks a description or tags."""
+    return not ((extract_scalar(fm, 'description') or extract_scalar(fm, 'summary')) and extract_list(fm, 'tags'))
+
+def enrich_notes(inputs, enricher, log=print):
+    """Model descriptions and tags for the notes among `inputs` that lack a
+    description or tags, requested together. Returns {input_path: result},
+    None where the model couldn't help (see enrichment.py)."""
+    items = []
+    for input_path in inputs:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            _, fm = read_frontmatter(f)
+            if not needs_enrichment(fm):
+                continue
+            text = f.read(MAX_PROMPT_CHARS)
+        h1 = H1_RE.search(text)
+        title = extract_scalar(fm, 'title') or (h1.group(1).strip() if h1 else input_path.stem.replace('-', ' '))
+        items.append((input_path, 'post', title, text))
+    return enricher.enrich(items, log) if items else {}
+
+def apply_enrichment(fm, result, log=print):
+    """Fill an empty description and empty tags with a model's answer.
+    Tags the note already has are kept; the model's are only suggested."""
+    if result['description'] and not extract_scalar(fm, 'description'):
+        line = f'description: "{yaml_str(result["description"])}"'
+        fm, found = EMPTY_DESCRIPTION_RE.subn(lambda m: line, fm, count=1)
+        if not found:
+            fm = f"{fm}\n{line}"
+        log(f"🤖 Description: {result['description']}")
+    tags = extract_list(fm, 'tags')
+    if result['tags'] and not tags:
+        block = 'tags:\n' + '\n'.join(f'  - {tag}' for tag in result['tags'])
+        fm, found = EMPTY_TAGS_RE.subn(lambda m: block, fm, count=1)
+        if not found:
+            fm = f"{fm}\n{block}"
+        log(f"🤖 Tags: {', '.join(result['tags'])}")
+    elif suggested := [t for t in result['tags'] if t not in tags]:
+        log(f"💡 Suggested tags: {', '.join(suggested)}")
+    return fm
 
+def bundle_dir_for(fm, slug, log=print):
+    """Page bundle directory for a post: series sub-folder, tag routing, or top level."""
     # Determine series sub-folder
     series_folder = ""
-    series_match = re.search(r'^series:\s*\n\s*-\s*["\']?(.+?)["\']?\s*$', fm, re.MULTILINE)
+    series_match = SERIES_ITEM_RE.search(fm)
     if series_match:
         series_name = series_match.group(1).strip()
         series_folder = slugify(series_name)
 
     # Fall back to tag-based folder routing
     if not series_folder:
-        tags_block = re.search(r'^tags:\s*\n((?:[ \t]*-[^\n]*\n)*)', fm, re.MULTILINE)
+        tags_block = TAGS_BLOCK_RE.search(fm)
         if tags_block:
-            tags = re.findall(r'^[ \t]*-[ \t]*["\']?(\S+?)["\']?[ \t]*$', tags_block.group(1), re.MULTILINE)
+            tags = TAG_ITEM_RE.findall(tags_block.group(1))
             for tag in tags:
                 if tag.lower() in TAG_FOLDERS:
                     series_folder = TAG_FOLDERS[tag.lower()]
-                    print(f"📂 Routing to subfolder via tag '{tag}': {series_folder}")
+                    log(f"📂 Routing to subfolder via tag '{tag}': {series_folder}")
                     break
 
-    # Setup Directory
-    base_dir = Path(__file__).parent.parent
     if series_folder:
-        blog_dir = base_dir / "content" / "blog" / series_folder / slug
-    else:
-        blog_dir = base_dir / "content" / "blog" / slug
-    
-    blog_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Write Post
-    (blog_dir / "index.md").write_text(final_content, encoding='utf-8')
-    
-    # Image Handling
-    print(f"\n📸 Copying images to: {blog_dir.relative_to(base_dir)}")
-    
-    # 1. Copy from source directory (if it's a page bundle or attachment in same folder)
-    image_exts = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'}
+        return BASE_DIR / "content" / "blog" / series_folder / slug
+    return BASE_DIR / "content" / "blog" / slug
+
+# directory -> (mtime_ns, images); batch runs convert many notes from one folder
+_image_listings = {}
+
+def images_in(directory):
+    """Image files directly inside `directory`, sorted. The listing is reused
+    while the directory's mtime is unchanged."""
+    key = str(directory)
+    mtime = os.stat(directory).st_mtime_ns
+    cached = _image_listings.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with os.scandir(directory) as it:
+        images = sorted(Path(e.path) for e in it
+                        if os.path.splitext(e.name)[1].lower() in IMAGE_EXTS and e.is_file())
+    _image_listings[key] = (mtime, images)
+    return images
+
+def referenced_images(found, fm):
+    """Image paths a note uses (body images, then cover.image), relative to its bundle."""
+    refs = list(found.get('images', []))
+    cover = extract_nested_scalar(fm, 'cover', 'image')
+    if cover:
+        refs.append(cover)
+    names = []
+    for ref in refs:
+        # ![alt](my%20image.png "title") -> my image.png
+        ref = unquote(ref.strip().split(' "')[0].strip('<>')).removeprefix('./')
+        if ref and '://' not in ref and not ref.startswith(('/', '#', 'data:')) and ref not in names:
+            names.append(ref)
+    return names
+
+# Bundle images are linked from one content-addressed store (see attachment_store.py)
+_store = AttachmentStore(ATTACHMENT_STORE_DIR)
+
+def convert_note(input_path, slug, vault_path=None, index=None, manifest=None, optimizer=None,
+                 timings=NO_TIMINGS, log=print, links=None, enrichment=None, enrich=None):
+    """Convert one Obsidian note into its page bundle and copy its images.
+
+    `index` is a shared AttachmentIndex (batch mode); when omitted it is
+    loaded lazily, only if a referenced image is missing from the bundle.
+    With a `manifest`, a note whose source, images and output are unchanged
+    since the last run is skipped, and files are only written when their
+    bytes differ. With an `optimizer` (ImageOptimizer) images are
+    downscaled/recompressed into the bundle instead of copied verbatim.
+    With a LinkIndex as `links`, wiki links are resolved and the ones that
+    don't resolve are added to links.missing; a note is also reconverted
+    when one of its links now resolves differently. `enrichment` is the
+    note's result from enrich_notes(), filling an empty description and tags;
+    `enrich` is the enricher's settings when the run enriches. A note the
+    model couldn't do is recorded as pending and converted again next time.
+    Stage times and byte counts go to `timings`.
+    Returns (bundle directory, 'converted' | 'unchanged').
+    """
+    # Images sitting next to the note (page bundle or shared attachment folder)
     source_dir = input_path.parent
-    for img_file in source_dir.iterdir():
-        if img_file.is_file() and img_file.suffix.lower() in image_exts:
-            shutil.copy2(img_file, blog_dir / img_file.name)
-            print(f"   ✓ {img_file.name}")
+    local_images = images_in(source_dir)
+
+    source_size = input_path.stat().st_size
+    # The slug and vault decide where the bundle goes and which images it gets
+    inputs = {'slug': slug, 'vault': str(Path(vault_path).resolve()) if vault_path else None}
+    if enrich:
+        inputs['enrich'] = enrich
+    if manifest is not None:
+        with timings.stage('manifest check', source_size):
+            key = manifest.key(input_path)
+            source_hash = file_hash(input_path)
+            # Only the note's own images matter: a newly referenced one comes with an edit to the note
+            recorded = manifest.notes.get(key, {}).get('images', {})
+            local_hashes = {str(p): manifest.image_hash(key, p) for p in local_images if str(p) in recorded}
+            # Without --enrich, a note enriched earlier is still fresh
+            expected = dict(inputs)
+            if not enrich and 'enrich' in manifest.notes.get(key, {}).get('inputs', {}):
+                expected['enrich'] = manifest.notes[key]['inputs']['enrich']
+            fresh = manifest.is_fresh(key, source_hash, local_hashes, expected)
+            if fresh and links is not None:
+                fresh = links.is_current(manifest.notes[key].get('links', {}))
+        if fresh:
+            blog_dir = Path(manifest.notes[key]['output']).parent
+            log(f"⏭️  Unchanged since last conversion: {blog_dir.relative_to(BASE_DIR.resolve())}")
+            return blog_dir, 'unchanged'
+
+    # Stream the body through the converter into a spool (spills to disk for
+    # huge notes), since new frontmatter needs the body's H1 before writing.
+    found = {}
+    with open(input_path, 'r', encoding='utf-8') as f, \
+            tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as body:
+        with timings.stage('read', source_size):
+            has_fm, fm = read_frontmatter(f)
+        pending = ['enrichment'] if enrich and not enrichment and needs_enrichment(fm) else []
+        with timings.stage('body convert', exclude='read') as stage:
+            for line in convert_body_lines(timings.timed_iter('read', f), found, links):
+                body.write(line.encode('utf-8'))
+            stage['bytes'] = body.tell()
+
+        with timings.stage('frontmatter normalize', len(fm)):
+            fm, slug = build_frontmatter(has_fm, fm, input_path, slug, found.get('h1'), log)
+            blog_dir = bundle_dir_for(fm, slug, log)
+            # After routing, so model tags never move a post to another folder
+            if enrichment:
+                fm = apply_enrichment(fm, enrichment, log)
+        blog_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write Post (only if its bytes changed, so Hugo's change detection stays quiet)
+        with timings.stage('write') as stage:
+            stage['bytes'] = body.tell()
+            body.seek(0)
+            header = f"---\n{fm}\n---\n\n".encode('utf-8')
+            stage['bytes'] += len(header)
+            written, output_hash = write_stream_if_changed(
+                blog_dir / "index.md", itertools.chain([header], iter(lambda: body.read(1 << 20), b'')))
+    if not written:
+        log("ℹ️  index.md unchanged")
+    if found.get('links'):
+        unresolved = found['unresolved']
+        links.note_missing(source_name(str(input_path)), unresolved)
+        resolved = sum(dest is not None for dest in found['links'].values())
+        log(f"🔗 {resolved} wiki link target(s) resolved"
+            + (f", {len(unresolved)} unresolved: {', '.join(unresolved)}" if unresolved else ""))
+
+    # Image Handling
+    log(f"\n📸 Copying images to: {blog_dir.relative_to(BASE_DIR)}")
+    image_entries = {}
+    copies = []  # (source, bundle destination, source hash, label)
+
+    referenced = referenced_images(found, fm)
+
+    # 1. Copy from source directory (if it's a page bundle or attachment in same folder),
+    #    only the images the note references
+    wanted = set(referenced)
+    for img_file in local_images:
+        if img_file.name not in wanted:
+            continue
+        digest = (local_hashes.get(str(img_file)) or manifest.image_hash(key, img_file)) if manifest is not None else None
+        copies.append((img_file, blog_dir / img_file.name, digest, img_file.name))
+        if manifest is not None:
+            image_entries[str(img_file)] = manifest.image_entry(img_file, digest, img_file.name)
 
     # 2. Search vault for referenced images if not in source dir
     if vault_path and vault_path.exists():
-        referenced_images = re.findall(r'!\[.*?\]\(([^)]+)\)', converted_body)
-        blog_dir_resolved = blog_dir.resolve()
-        for img_name in referenced_images:
-            dest = (blog_dir / img_name).resolve()
-            if not dest.is_relative_to(blog_dir_resolved):
-                print(f"   ⚠️  Skipped suspicious image path: {img_name}")
-                continue
-            if not dest.exists():
-                # Search vault (rglob can be slow on huge vaults, but works for most)
-                matches = list(vault_path.rglob(img_name))
-                if matches:
-                    shutil.copy2(matches[0], dest)
-                    print(f"   ✓ {img_name} (from vault)")
-
-    print(f"\n🎉 Done! Folder created: {slug}")
+        with timings.stage('vault search'):
+            blog_dir_resolved = blog_dir.resolve()
+            owns_index = index is None
+            for img_name in referenced:
+                dest = (blog_dir / img_name).resolve()
+                if not dest.is_relative_to(blog_dir_resolved):
+                    log(f"   ⚠️  Skipped suspicious image path: {img_name}")
+                    continue
+                if any(img.name == img_name for img in local_images):
+                    continue
+                # Walk the vault at most once, and only if something is referenced
+                if index is None:
+                    index = AttachmentIndex.load(vault_path, ATTACHMENT_INDEX_PATH)
+                match = index.lookup(img_name)
+                if match:
+                    dest.parent.mkdir(parents=True, exist_ok=True)
+                    digest = manifest.image_hash(key, match) if manifest is not None else None
+                    copies.append((match, dest, digest, f"{img_name} (from vault)"))
+                    if manifest is not None:
+                        image_entries[str(match)] = manifest.image_entry(match, digest, img_name, local=False)
+                elif not dest.exists():
+                    log(f"   ⚠️  {img_name} not found in vault")
+            if owns_index and index is not None:
+                index.save()
+                log(f"   {index.stats_line()}")
+
+    copied_bytes = sum(src.stat().st_size for src, _, _, _ in copies) if timings.enabled else 0
+    with timings.stage('image copy', copied_bytes):
+        if optimizer is not None:
+            written = optimizer.place([(src, dest, digest) for src, dest, digest, _ in copies], log, _store.place)
+        else:
+            written = {dest: _store.place(src, dest, digest) for src, dest, digest, _ in copies}
+    for src, dest, digest, label in copies:
+        if written[dest]:
+            log(f"   ✓ {label}")
+        else:
+            log(f"   = {label} (unchanged)")
+
+    if manifest is not None:
+        manifest.record(key, source_hash, blog_dir / "index.md", output_hash, image_entries, found.get('links'), inputs,
+                        pending)
+    return blog_dir, 'converted'
+
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+_worker_index = None
+_worker_vault = None
+_worker_manifest = None
+_worker_optimizer = None
+_worker_timed = False
+_worker_links = None
+
+def _init_worker(vault_path, index, manifest, optimizer=None, timed=False, links=None):
+    global _worker_index, _worker_vault, _worker_manifest, _worker_optimizer, _worker_timed, _worker_links
+    _worker_vault = vault_path
+    _worker_index = index
+    _worker_manifest = manifest
+    _worker_optimizer = optimizer
+    _worker_timed = timed
+    _worker_links = links
+
+def _convert_worker(input_path, slug, enrichment=None, enrich=None):
+    """Run convert_note in a pool worker, capturing its log lines."""
+    lines = []
+    hits_before = _worker_index.hits if _worker_index else 0
+    misses_before = _worker_index.misses if _worker_index else 0
+    entry = None
+    timings = Timings() if _worker_timed else NO_TIMINGS
+    try:
+        _, status = convert_note(input_path, slug, _worker_vault, _worker_index, _worker_manifest,
+                                 _worker_optimizer, timings, log=lines.append, links=_worker_links,
+                                 enrichment=enrichment, enrich=enrich)
+        error = None
+        if status == 'converted':
+            entry = _worker_manifest.notes.get(_worker_manifest.key(input_path))
+    except Exception as e:
+        status, error = 'failed', f"{type(e).__name__}: {e}"
+    return {
+        'status': status,
+        'error': error,
+        'lines': lines,
+        'entry': entry,
+        'hits': (_worker_index.hits - hits_before) if _worker_index else 0,
+        'misses': (_worker_index.misses - misses_before) if _worker_index else 0,
+        'stages': timings.stages,
+        'unresolved': sorted(t for t, notes in _worker_links.missing.items() if source_name(str(input_path)) in notes)
+                      if _worker_links else [],
+    }
+
+def collect_batch_inputs(spec):
+    """Notes for --batch: every *.md in a directory, or the matches of a glob."""
+    path = Path(spec)
+    if path.is_dir():
+        return sorted(p for p in path.glob('*.md') if p.is_file())
+    return sorted(Path(p) for p in glob.glob(spec, recursive=True) if p.endswith('.md') and Path(p).is_file())
+
+def slug_for_path(input_path):
+    """Default slug for a note, matching scripts/new-post (bundle notes use their folder name)."""
+    stem = input_path.parent.name if input_path.stem == 'index' else input_path.stem
+    return slugify(stem)
+
+def run_batch(spec, vault_path, jobs, force=False, optimizer=None, timings=NO_TIMINGS, enricher=None):
+    """Convert many notes; returns per-note timing records for --timings-json."""
+    inputs = collect_batch_inputs(spec)
+    if not inputs:
+        print(f"Error: No notes matched '{spec}'")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    print(f"🚀 Converting {len(inputs)} note(s) with {jobs} worker(s)...")
+
+    # Plan destinations first so two notes mapping to one bundle are caught
+    # up front instead of silently overwriting each other.
+    converted, skipped, failed = [], [], []
+    planned = {}
+    tasks = []
+    quiet = lambda *a: None
+    # Notes in this batch can link to each other, so they are indexed as planned
+    links = LinkIndex.load(BASE_DIR, LINK_MANIFESTS)
+    for input_path in inputs:
+        try:
+            with timings.stage('batch plan'), open(input_path, 'r', encoding='utf-8') as f:
+                has_fm, fm = read_frontmatter(f)
+                fm, slug = build_frontmatter(has_fm, fm, input_path, slug_for_path(input_path), log=quiet)
+                blog_dir = bundle_dir_for(fm, slug, quiet)
+        except Exception as e:
+            failed.append((input_path, f"{type(e).__name__}: {e}"))
+            continue
+        if blog_dir in planned:
+            skipped.append((input_path, f"same bundle as {planned[blog_dir].name}: {blog_dir.relative_to(BASE_DIR)}"))
+            continue
+        planned[blog_dir] = input_path
+        links.add_frontmatter(fm, (blog_dir / "index.md").relative_to(BASE_DIR / "content").as_posix(), input_path)
+        tasks.append((input_path, slug_for_path(input_path)))
+
+    index = None
+    if vault_path and vault_path.exists():
+        with timings.stage('vault search'):
+            index = AttachmentIndex.load(vault_path, ATTACHMENT_INDEX_PATH)
+            index.save()
+
+    manifest = ConvertManifest.load(MANIFEST_PATH, __file__, force, image_settings(optimizer))
+
+    # Every note's model request goes out together, before the workers start
+    enrichment = {}
+    enrich = enricher.settings() if enricher is not None else None
+    if enricher is not None:
+        with timings.stage('enrich'):
+            enrichment = enrich_notes([p for p, _ in tasks], enricher)
+
+    hits = misses = 0
+    if jobs > 1 and len(tasks) > 1:
+        # Notes already run in parallel, so each worker optimizes its images serially
+        if optimizer is not None:
+            optimizer.jobs = 1
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(vault_path, index, manifest, optimizer, timings.enabled, links)) as pool:
+            futures = {pool.submit(_convert_worker, p, s, enrichment.get(p), enrich): p for p, s in tasks}
+            results = [(futures[f], f.result()) for f in as_completed(futures)]
+    else:
+        _init_worker(vault_path, index, manifest, optimizer, timings.enabled, links)
+        results = [(p, _convert_worker(p, s, enrichment.get(p), enrich)) for p, s in tasks]
+
+    notes = []
+    for input_path, result in sorted(results, key=lambda r: r[0]):
+        timings.merge(result['stages'])
+        notes.append({'note': str(input_path), 'status': result['status'], 'stages': result['stages']})
+        print(f"\n📄 {input_path.name}")
+        for line in result['lines']:
+            print(f"   {line.lstrip()}")
+        hits += result['hits']
+        misses += result['misses']
+        manifest.merge(manifest.key(input_path), result['entry'])
+        links.note_missing(source_name(str(input_path)), result['unresolved'])
+        if result['status'] == 'converted':
+            converted.append(input_path)
+        elif result['status'] == 'unchanged':
+            skipped.append((input_path, "unchanged"))
+        else:
+            failed.append((input_path, result['error']))
+            print(f"   ❌ {result['error']}")
+
+    manifest.save()
+    if converted:
+        site_data.refresh(BASE_DIR)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 Batch: {len(converted)} converted, {len(skipped)} skipped, {len(failed)} failed in {elapsed:.2f}s")
+    if index is not None:
+        print(f"   📇 Attachment index: {hits} hit(s), {misses} miss(es), "
+              f"{len(index.dirs)} dirs walked ({index.rescanned} rescanned) in {index.walk_seconds:.2f}s")
+    for input_path, reason in skipped:
+        if reason == "unchanged":
+            continue
+        print(f"   ⏭️  {input_path.name}: {reason}")
+    for input_path, reason in failed:
+        print(f"   ❌ {input_path.name}: {reason}")
+    links.report()
+    return notes, bool(failed)
+
+# ---------------------------------------------------------------------------
+# Watch mode
+# ---------------------------------------------------------------------------
+
+def notes_using(drafts_dir, images):
+    """Notes under drafts_dir that sit next to, or mention by name, any of `images`."""
+    names = {p.name for p in images}
+    dirs = {p.parent for p in images}
+    for note in drafts_dir.rglob('*.md'):
+        if note.parent in dirs:
+            yield note, False
+            continue
+        try:
+            text = note.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            continue
+        if any(name in text for name in names):
+            yield note, True
+
+def run_watch(drafts_dir, vault_path, optimizer=None, poll=False, debounce=0.05, enricher=None):
+    """Reconvert notes under drafts_dir as they are saved, until Ctrl-C.
+
+    A changed attachment reconverts the notes that use it. The manifest,
+    attachment index and compiled patterns stay loaded between saves, so
+    each one only pays for the note it touches.
+    """
+    drafts_dir = drafts_dir.resolve()
+    roots = [drafts_dir]
+    index = None
+    if vault_path and vault_path.exists():
+        vault_path = vault_path.resolve()
+        index = AttachmentIndex.load(vault_path, ATTACHMENT_INDEX_PATH)
+        index.save()
+        roots = [vault_path] if drafts_dir.is_relative_to(vault_path) else [drafts_dir, vault_path]
+    manifest = ConvertManifest.load(MANIFEST_PATH, __file__, settings=image_settings(optimizer))
+    watcher = make_watcher(roots, poll)
+    print(f"   Converting notes under {drafts_dir} on save (Ctrl-C to stop)")
+
+    def on_change(paths):
+        start = time.perf_counter()
+        if paths is OVERFLOW:
+            notes, images = set(drafts_dir.rglob('*.md')), []
+        else:
+            notes = {p for p in paths if p.suffix == '.md' and p.is_relative_to(drafts_dir) and p.is_file()}
+            images = [p for p in paths if p.suffix.lower() in IMAGE_EXTS]
+        if index is not None and (images or paths is OVERFLOW):
+            index.refresh()
+            index.save()
+        if images:
+            for note, by_name in notes_using(drafts_dir, images):
+                if by_name:
+                    # The image may be new to the note, which the manifest can't know
+                    manifest.notes.pop(manifest.key(note), None)
+                notes.add(note)
+        if not notes:
+            return
+        converted = 0
+        # Reloaded per save (cheap: only changed bundles are re-read) so new posts resolve
+        links = LinkIndex.load(BASE_DIR, LINK_MANIFESTS)
+        enrichment = enrich_notes(sorted(notes), enricher) if enricher is not None else {}
+        for note in sorted(notes):
+            print(f"\n📄 {note.name}")
+            try:
+                _, status = convert_note(note, slug_for_path(note), vault_path, index, manifest, optimizer,
+                                         log=lambda line: print(f"   {line.lstrip()}"), links=links,
+                                         enrichment=enrichment.get(note),
+                                         enrich=enricher.settings() if enricher is not None else None)
+                converted += status == 'converted'
+            except Exception as e:
+                print(f"   ❌ {type(e).__name__}: {e}")
+        manifest.save()
+        if converted:
+            site_data.refresh(BASE_DIR)
+        links.report()
+        print(f"⚡ {converted} converted, {len(notes) - converted} unchanged or failed "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    watch(watcher, on_change, debounce)
+
+def image_settings(optimizer):
+    """Manifest settings for the image optimizer (None when images are copied as is)."""
+    if optimizer is None or not optimizer.available:
+        return None
+    return {'images': optimizer.settings()}
+
+def main():
+    parser = argparse.ArgumentParser(
+        usage="python obsidian-to-hugo.py input.md post-slug [vault-path] [--force]\n"
+              "       python obsidian-to-hugo.py --batch <dir|glob> [vault-path] [--jobs N] [--force]\n"
+              "       python obsidian-to-hugo.py --watch <drafts-dir> [vault-path] [--poll]")
+    parser.add_argument('args', nargs='*', help=argparse.SUPPRESS)
+    parser.add_argument('--batch', metavar='DIR|GLOB', help="convert every note in a folder or matching a glob")
+    parser.add_argument('--watch', metavar='DIR', help="keep running and reconvert notes under DIR as they are saved")
+    parser.add_argument('--poll', action='store_true', help="with --watch: poll for changes instead of using inotify")
+    parser.add_argument('--debounce', type=int, default=50, metavar='MS', help="with --watch: wait for MS ms of quiet after a save (default: 50)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="worker processes for --batch and --optimize-images")
+    parser.add_argument('--force', action='store_true', help="ignore the conversion manifest and rewrite everything")
+    parser.add_argument('--optimize-images', action='store_true', help="downscale and recompress images (needs Pillow)")
+    parser.add_argument('--max-width', type=int, default=1600, help="with --optimize-images: maximum width in px (default: 1600)")
+    parser.add_argument('--quality', type=int, default=82, help="with --optimize-images: JPEG/WebP quality (default: 82)")
+    parser.add_argument('--webp', action='store_true', help="with --optimize-images: also write a .webp next to each image")
+    parser.add_argument('--enrich', action='store_true', help="fill in missing descriptions and tags with a local model")
+    parser.add_argument('--enrich-model', default=DEFAULT_MODEL, metavar='MODEL', help=f"with --enrich: Ollama model (default: {DEFAULT_MODEL})")
+    parser.add_argument('--enrich-jobs', type=int, default=2, metavar='N', help="with --enrich: concurrent model requests (default: 2)")
+    parser.add_argument('--timings', '--profile', action='store_true', help="print wall time and bytes per stage")
+    parser.add_argument('--timings-json', metavar='PATH', help="append a JSON trace of stage timings to PATH")
+    opts = parser.parse_args()
+
+    start = time.perf_counter()
+    timings = Timings(enabled=opts.timings or bool(opts.timings_json))
+
+    optimizer = None
+    if opts.optimize_images:
+        optimizer = ImageOptimizer(IMAGE_CACHE_DIR, opts.max_width, opts.quality, opts.webp, max(1, opts.jobs))
+    enricher = Enricher(ENRICHMENT_CACHE_PATH, opts.enrich_model, concurrency=opts.enrich_jobs) if opts.enrich else None
+
+    if opts.batch:
+        if len(opts.args) > 1:
+            parser.error("--batch takes at most one positional argument (the vault path)")
+        vault_path = Path(opts.args[0]) if opts.args else None
+        notes, failed = run_batch(opts.batch, vault_path, max(1, opts.jobs), opts.force, optimizer, timings, enricher)
+        report(timings, time.perf_counter() - start, opts.timings, opts.timings_json, 'obsidian-to-hugo', notes)
+        if failed:
+            sys.exit(1)
+        return
+
+    if opts.watch:
+        if len(opts.args) > 1:
+            parser.error("--watch takes at most one positional argument (the vault path)")
+        if not Path(opts.watch).is_dir():
+            print(f"Error: Drafts folder '{opts.watch}' not found")
+            sys.exit(1)
+        run_watch(Path(opts.watch), Path(opts.args[0]) if opts.args else None, optimizer, opts.poll, opts.debounce / 1000,
+                  enricher)
+        return
+
+    if len(opts.args) < 2:
+        print("Usage: python obsidian-to-hugo.py input.md post-slug [vault-path]")
+        sys.exit(1)
+
+    input_path = Path(opts.args[0])
+    # Optimization: Ensure the slug is always clean (dashes, lowercase)
+    slug = slugify(opts.args[1])
+    vault_path = Path(opts.args[2]) if len(opts.args) > 2 else None
+
+    if not input_path.exists():
+        print(f"Error: Input file '{input_path}' not found")
+        sys.exit(1)
+
+    manifest = ConvertManifest.load(MANIFEST_PATH, __file__, opts.force, image_settings(optimizer))
+    links = LinkIndex.load(BASE_DIR, LINK_MANIFESTS)
+    enrichment = enrich_notes([input_path], enricher) if enricher is not None else {}
+    blog_dir, status = convert_note(input_path, slug, vault_path, manifest=manifest, optimizer=optimizer,
+                                    timings=timings, links=links, enrichment=enrichment.get(input_path),
+                                    enrich=enricher.settings() if enricher is not None else None)
+    manifest.save()
+    if status == 'converted':
+        site_data.refresh(BASE_DIR)
+    report(timings, time.perf_counter() - start, opts.timings, opts.timings_json, 'obsidian-to-hugo',
+           [{'note': str(input_path), 'status': status, 'stages': timings.stages}])
+    links.report()
+    if status == 'unchanged':
+        print("\n🎉 Nothing to do (use --force to reconvert)")
+    else:
+        print(f"\n🎉 Done! Folder created: {blog_dir.name}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,165 @@
+"""
+oEmbed fetching for finds: an on-disk response cache plus a concurrent batch fetcher.
+
+Responses are cached in .hugo/oembed-cache.json keyed by normalized post URL
+and reused until they are older than the TTL. Pending embeds are fetched
+together over one pooled httpx client with a per-host concurrency limit; if
+httpx isn't installed they are fetched one at a time with urllib.
+"""
+import asyncio
+import json
+import os
+import time
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+CACHE_VERSION = 1
+DEFAULT_TTL = 30 * 24 * 3600
+USER_AGENT = 'finds-to-hugo/1.0'
+
+# Platform -> oEmbed endpoint. OEMBED_X_ENDPOINT / OEMBED_BLUESKY_ENDPOINT
+# override them, e.g. to point at a local stub server when testing offline.
+ENDPOINTS = {
+    'x': os.environ.get('OEMBED_X_ENDPOINT', 'https://publish.twitter.com/oembed'),
+    'bluesky': os.environ.get('OEMBED_BLUESKY_ENDPOINT', 'https://embed.bsky.app/oembed'),
+}
+
+# Extra query parameters per platform
+ENDPOINT_PARAMS = {
+    'x': {'theme': 'dark', 'dnt': 'true', 'omit_script': 'false'},
+    'bluesky': {},
+}
+
+
+def normalize_url(url):
+    """Cache key for a post URL: https, lowercase host without www., no query or fragment."""
+    parts = urllib.parse.urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if host in ('twitter.com', 'mobile.twitter.com'):
+        host = 'x.com'
+    return urllib.parse.urlunsplit(('https', host, parts.path.rstrip('/'), '', ''))
+
+
+def oembed_request_url(platform, url, endpoints=None):
+    """Full oEmbed API URL for a post, or None for unsupported platforms."""
+    endpoint = (endpoints or ENDPOINTS).get(platform)
+    if not endpoint:
+        return None
+    # X rejects tracking parameters; Bluesky gets the URL as written
+    target = url.split('?', 1)[0] if platform == 'x' else url
+    params = {'url': target, **ENDPOINT_PARAMS.get(platform, {})}
+    return f"{endpoint}?{urllib.parse.urlencode(params)}"
+
+
+class OEmbedCache:
+    """JSON file of normalized URL -> {"html", "fetched"} with a TTL."""
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.entries = {}
+        self._dirty = False
+        if self.path:
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                if data.get('version') == CACHE_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                pass
+
+    def get(self, url, now=None):
+        entry = self.entries.get(normalize_url(url))
+        if entry and (now or time.time()) - entry['fetched'] < self.ttl:
+            return entry['html']
+        return None
+
+    def put(self, url, html, now=None):
+        self.entries[normalize_url(url)] = {'html': html, 'fetched': now or time.time()}
+        self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'version': CACHE_VERSION, 'entries': self.entries}, indent=1), encoding='utf-8')
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+async def _fetch_all_async(requests, timeout, per_host, log):
+    import httpx
+
+    semaphores = {}
+    results = {}
+    hosts = {urllib.parse.urlsplit(api).netloc for _, api in requests}
+    limits = httpx.Limits(max_connections=per_host * len(hosts), max_keepalive_connections=per_host * len(hosts))
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits, headers={'User-Agent': USER_AGENT},
+                                 follow_redirects=True) as client:
+        async def fetch(url, api):
+            host = urllib.parse.urlsplit(api).netloc
+            sem = semaphores.setdefault(host, asyncio.Semaphore(per_host))
+            async with sem:
+                try:
+                    resp = await client.get(api)
+                    resp.raise_for_status()
+                    results[url] = (resp.json().get('html') or '').strip() or None
+                except (httpx.HTTPError, ValueError) as e:
+                    log(f"⚠️  oEmbed fetch failed for {url}: {str(e).splitlines()[0]}")
+                    results[url] = None
+
+        await asyncio.gather(*(fetch(url, api) for url, api in requests))
+    return results
+
+
+def _fetch_all_serial(requests, timeout, log):
+    results = {}
+    for url, api in requests:
+        try:
+            req = urllib.request.Request(api, headers={'User-Agent': USER_AGENT})
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                results[url] = (json.loads(resp.read()).get('html') or '').strip() or None
+        except Exception as e:
+            log(f"⚠️  oEmbed fetch failed for {url}: {e}")
+            results[url] = None
+    return results
+
+
+def fetch_oembed_batch(items, cache=None, endpoints=None, timeout=10, per_host=4, log=print):
+    """Fetch embed HTML for many posts at once.
+
+    `items` is an iterable of (platform, url). Cached entries are served from
+    `cache`; the rest are fetched concurrently and stored back. Returns a dict
+    of url -> html (None when unsupported or the fetch failed).
+    """
+    results = {}
+    pending = {}
+    for platform, url in items:
+        if url in results or url in pending:
+            continue
+        html = cache.get(url) if cache else None
+        if html is not None:
+            results[url] = html
+            continue
+        api = oembed_request_url(platform, url, endpoints)
+        if api is None:
+            results[url] = None
+        else:
+            pending[url] = api
+
+    if pending:
+        requests = list(pending.items())
+        try:
+            fetched = asyncio.run(_fetch_all_async(requests, timeout, per_host, log))
+        except ImportError:
+            log("⚠️  httpx not installed, fetching oEmbed HTML one at a time")
+            fetched = _fetch_all_serial(requests, timeout, log)
+        for url, html in fetched.items():
+            results[url] = html
+            if html and cache is not None:
+                cache.put(url, html)
+    return results
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Decide whether a site build would change what is published.
+Usage: python plan-build.py [--record] [--now DATETIME] [--snapshot PATH]
+
+Works out which pages Hugo would publish right now (not drafts, publish date
+reached, not expired) and hashes their files, along with the templates,
+config and static files. This is compared with the snapshot recorded at the
+last build (.hugo/build-snapshot.json) to list the pages that became due,
+were added, changed or taken down, and whether a build is needed at all.
+--record saves the current state as the new snapshot once a build has
+been triggered, or has started by itself after a push.
+
+Only files git tracks count, since Amplify builds from the repository, and
+their hashes come from git's index, so unchanged files are not read. With
+GITHUB_OUTPUT set (GitHub Actions), `build=true` or `build=false` is
+written to it.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from frontmatter_fields import read_frontmatter, unquote
+
+BASE_DIR = Path(__file__).parent.parent
+SNAPSHOT_PATH = BASE_DIR / ".hugo" / "build-snapshot.json"
+SNAPSHOT_VERSION = 1
+
+# Everything besides content/ that ends up in the built site
+SITE_INPUTS = ('amplify.yml', 'assets', 'config', 'data', 'go.mod', 'go.sum', 'i18n', 'layouts', 'static', 'themes')
+# Hugo's default front matter date fields, first one set wins
+PUBLISH_DATE_FIELDS = ('publishDate', 'pubdate', 'published', 'date')
+EXPIRY_DATE_FIELDS = ('expiryDate', 'unpublishdate')
+
+BUILD_FLAG_RE = re.compile(r'^(buildDrafts|buildExpired|buildFuture):[ \t]*(\w+)', re.MULTILINE)
+FIELD_RE = re.compile(r'^(\w+):[ \t]*(.*?)[ \t]*$', re.MULTILINE)
+TIME_ZONE_RE = re.compile(r'^timeZone:[ \t]*["\']?([^"\'\s]+)', re.MULTILINE)
+LIST_LIMIT = 20
+
+
+def blob_hash(path):
+    """The id git gives a file's contents."""
+    data = Path(path).read_bytes()
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def _git(base_dir, *args):
+    out = subprocess.run(['git', '-C', str(base_dir), *args], capture_output=True, check=True).stdout
+    return [p.decode('utf-8', 'surrogateescape') for p in out.split(b'\0') if p]
+
+
+def tracked_files(base_dir, paths):
+    """{path relative to base_dir: blob id} for the files under `paths`.
+
+    In a git checkout these are the tracked files, with ids from the index
+    (files modified since are hashed). Elsewhere every file is hashed."""
+    try:
+        staged = _git(base_dir, 'ls-files', '-s', '-z', '--', *paths)
+        modified = _git(base_dir, 'ls-files', '-m', '-z', '--', *paths)
+    except (OSError, subprocess.CalledProcessError):
+        files = {}
+        for top in paths:
+            for root, dirs, names in os.walk(base_dir / top):
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                for name in names:
+                    path = Path(root) / name
+                    files[path.relative_to(base_dir).as_posix()] = blob_hash(path)
+            if (base_dir / top).is_file():
+                files[top] = blob_hash(base_dir / top)
+        return files
+    # "<mode> <blob> <stage>\t<path>"
+    files = {entry.split('\t', 1)[1]: entry.split(' ', 2)[1] for entry in staged}
+    for rel in modified:
+        try:
+            files[rel] = blob_hash(base_dir / rel)
+        except OSError:  # deleted
+            files.pop(rel, None)
+    return files
+
+
+def load_build_config(config_path):
+    """buildDrafts/buildExpired/buildFuture and the time zone for dates
+    without one (UTC unless hugo.yaml sets timeZone)."""
+    try:
+        config = config_path.read_text(encoding='utf-8')
+    except OSError:
+        config = ''
+    flags = {name: value.lower() == 'true' for name, value in BUILD_FLAG_RE.findall(config)}
+    zone = TIME_ZONE_RE.search(config)
+    try:
+        tz = ZoneInfo(zone.group(1)) if zone else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = timezone.utc
+    return flags, tz
+
+
+def parse_datetime(value, tz):
+    """A front matter date as an aware datetime (None if it isn't one).
+    Dates without a time are midnight, times without an offset are in `tz`."""
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=tz)
+
+
+def page_dates(path, tz):
+    """(draft, publish date, expiry date) from a page's front matter."""
+    with open(path, encoding='utf-8') as f:
+        _, fm = read_frontmatter(f)
+    # One pass over the top-level fields; the first occurrence of a key counts
+    fields = {}
+    for key, value in FIELD_RE.findall(fm):
+        fields.setdefault(key, value)
+
+    def first(keys):
+        for key in keys:
+            value = key in fields and parse_datetime(unquote(fields[key]).strip(), tz)
+            if value:
+                return value
+        return None
+
+    draft = unquote(fields.get('draft', '')).strip().lower() == 'true'
+    return draft, first(PUBLISH_DATE_FIELDS), first(EXPIRY_DATE_FIELDS)
+
+
+def group_pages(content_files):
+    """{page: {file: blob}} for the files under content/. Pages are the .md
+    files; every other file, and any .md inside a leaf bundle, belongs to
+    the nearest index.md or _index.md above it."""
+    bundles = {}
+    for rel in content_files:
+        folder, _, name = rel.rpartition('/')
+        if name in ('index.md', '_index.md'):
+            bundles[folder] = rel
+    pages = {}
+    for rel, blob in content_files.items():
+        folder = rel.rpartition('/')[0]
+        while folder not in bundles and folder:
+            folder = folder.rpartition('/')[0]
+        bundle = bundles.get(folder)
+        if bundle and (not rel.endswith('.md') or bundle.endswith('/index.md') or bundle == 'index.md'):
+            page = bundle
+        else:
+            page = rel
+        pages.setdefault(page, {})[rel] = blob
+    return pages
+
+
+def page_hash(files):
+    h = hashlib.sha1()
+    for rel in sorted(files):
+        h.update(f"{rel}\0{files[rel]}\n".encode('utf-8', 'surrogateescape'))
+    return h.hexdigest()
+
+
+def current_state(base_dir, now):
+    """What a build now would publish: {'pages': {page: hash of its files},
+    'dates': {page: publish date}, 'site': {site file: blob}, 'upcoming':
+    (page, date) of the next page to become due, or None}."""
+    flags, tz = load_build_config(base_dir / "config" / "_default" / "hugo.yaml")
+    files = tracked_files(base_dir, ('content', *SITE_INPUTS))
+    content = {rel[len('content/'):]: blob for rel, blob in files.items() if rel.startswith('content/')}
+    state = {'pages': {}, 'dates': {}, 'upcoming': None,
+             'site': {rel: blob for rel, blob in files.items() if not rel.startswith('content/')}}
+
+    content_dir = str(base_dir / "content")
+    for page, page_files in group_pages(content).items():
+        if page.endswith('.md'):
+            draft, publish, expiry = page_dates(os.path.join(content_dir, page), tz)
+            if draft and not flags.get('buildDrafts'):
+                continue
+            if expiry and expiry <= now and not flags.get('buildExpired'):
+                continue
+            if publish and publish > now and not flags.get('buildFuture'):
+                if state['upcoming'] is None or publish < state['upcoming'][1]:
+                    state['upcoming'] = (page, publish)
+                continue
+            if publish:
+                state['dates'][page] = publish
+        state['pages'][page] = page_hash(page_files)
+    return state
+
+
+def load_snapshot(path):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    return data if data.get('version') == SNAPSHOT_VERSION else None
+
+
+def save_snapshot(path, state, now):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps({'version': SNAPSHOT_VERSION, 'built_at': now.isoformat(),
+                               'pages': state['pages'], 'site': state['site']}, indent=1, sort_keys=True),
+                   encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def plan(snapshot, state):
+    """{kind: [paths]} of what a build would change since the snapshot."""
+    before, pages, site = snapshot['pages'], state['pages'], state['site']
+    built_at = datetime.fromisoformat(snapshot['built_at'])
+    new = pages.keys() - before.keys()
+    due = {p for p in new if p in state['dates'] and state['dates'][p] > built_at}
+    changes = {
+        'became due': sorted(due),
+        'added': sorted(new - due),
+        'changed': sorted(p for p in pages.keys() & before.keys() if pages[p] != before[p]),
+        'taken down': sorted(before.keys() - pages.keys()),
+        'site files changed': sorted(p for p in site.keys() | snapshot['site'].keys()
+                                     if site.get(p) != snapshot['site'].get(p)),
+    }
+    return {kind: paths for kind, paths in changes.items() if paths}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decide whether a site build would change the published output.")
+    parser.add_argument('--record', action='store_true', help="save the current state as the last build's snapshot")
+    parser.add_argument('--now', type=datetime.fromisoformat, metavar='DATETIME',
+                        help="plan as of this time (ISO 8601, UTC unless it has an offset; default: now)")
+    parser.add_argument('--snapshot', type=Path, default=SNAPSHOT_PATH, metavar='FILE',
+                        help="snapshot file (default: .hugo/build-snapshot.json)")
+    opts = parser.parse_args()
+
+    start = time.perf_counter()
+    now = opts.now or datetime.now(timezone.utc)
+    if not now.tzinfo:
+        now = now.replace(tzinfo=timezone.utc)
+    state = current_state(BASE_DIR, now)
+
+    if opts.record:
+        save_snapshot(opts.snapshot, state, now)
+        print(f"📸 Recorded {len(state['pages'])} published page(s) and {len(state['site'])} site file(s) "
+              f"in {opts.snapshot.name} ({time.perf_counter() - start:.2f}s)")
+        return
+
+    snapshot = load_snapshot(opts.snapshot)
+    if snapshot is None:
+        build = True
+        print(f"📭 No snapshot of the last build ({len(state['pages'])} published page(s))")
+    else:
+        changes = plan(snapshot, state)
+        build = bool(changes)
+        print(f"🗓️  Last build: {snapshot['built_at']}")
+        for kind, paths in changes.items():
+            print(f"   {kind}: {len(paths)}")
+            for path in paths[:LIST_LIMIT]:
+                print(f"      {path}")
+            if len(paths) > LIST_LIMIT:
+                print(f"      ... and {len(paths) - LIST_LIMIT} more")
+    if state['upcoming']:
+        page, publish = state['upcoming']
+        print(f"⏭️  Next scheduled page: {page} on {publish.isoformat()}")
+    verdict = "🚀 Build needed" if build else "💤 Nothing to publish, build can be skipped"
+    print(f"{verdict} ({time.perf_counter() - start:.2f}s)")
+
+    if os.environ.get('GITHUB_OUTPUT'):
+        with open(os.environ['GITHUB_OUTPUT'], 'a', encoding='utf-8') as f:
+            f.write(f"build={'true' if build else 'false'}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Precomputed series and related-post data for the templates.
+
+Writes data/series.json (each series' members in date order) and
+data/related.json (the top related pages for each page, scored by shared
+tags and series with NumPy), so layouts/partials/series-nav.html and
+related-posts.html look pages up in a map instead of scanning every page.
+
+Bundles are parsed incrementally: a cache in .hugo/ keeps each index.md's
+fields by mtime and size, so after a converter writes one bundle only that
+bundle is re-read. The data files are only rewritten when their bytes change.
+"""
+import json
+import os
+import re
+import unicodedata
+
+from content_bundles import read_bundle, scan_bundles
+from convert_manifest import write_if_changed
+
+CACHE_VERSION = 3
+RELATED_K = 10
+SERIES_WEIGHT = 2.0
+
+PERMALINKS_BLOCK_RE = re.compile(r'^permalinks:[ \t]*\n((?:[ \t]+[^\n]*\n?)*)', re.MULTILINE)
+PERMALINK_LINE_RE = re.compile(r'^[ \t]+([\w-]+):[ \t]*["\']?([^"\'\n]+?)["\']?[ \t]*$', re.MULTILINE)
+PERMALINK_TOKEN_RE = re.compile(r':(\w+)')
+
+
+def urlize(text):
+    """Hugo's urlize: spaces become hyphens, characters other than letters,
+    digits and . _ - + ~ # @ are dropped, and the result is lowercased."""
+    out = []
+    hyphen = False
+    for ch in text:
+        if ch in '._-+~#@/' or unicodedata.category(ch)[0] in 'LMN':
+            out.append(ch)
+            hyphen = ch == '-'
+        elif ch.isspace() and not hyphen:
+            out.append('-')
+            hyphen = True
+    return ''.join(out).lower()
+
+
+def load_permalinks(config_path):
+    """The `permalinks:` patterns from hugo.yaml, by section."""
+    try:
+        config = config_path.read_text(encoding='utf-8')
+    except OSError:
+        return {}
+    block = PERMALINKS_BLOCK_RE.search(config)
+    return dict(PERMALINK_LINE_RE.findall(block.group(1))) if block else {}
+
+
+def permalink(record, permalinks):
+    """The page's relative permalink, as Hugo builds it."""
+    parts = record['path'].split('/')[:-1]
+    pattern = permalinks.get(record['section'])
+    if not pattern:
+        return '/' + '/'.join(urlize(p) for p in parts) + '/'
+    day = record['date'] or ''
+    values = {
+        'slug': urlize(record['slug'] or record['title']),
+        'title': urlize(record['title']),
+        'section': record['section'],
+        'year': day[:4], 'month': day[5:7], 'day': day[8:10],
+        'filename': urlize(parts[-1]), 'contentbasename': urlize(parts[-1]),
+    }
+    return PERMALINK_TOKEN_RE.sub(lambda m: values.get(m.group(1), m.group(0)), pattern)
+
+
+def load_records(content_dir, cache_path, force=False):
+    """Every bundle's fields, re-reading only bundles whose mtime or size changed.
+    Returns (records, number re-read)."""
+    cached = {}
+    if not force:
+        try:
+            data = json.loads(cache_path.read_text(encoding='utf-8'))
+            if data.get('version') == CACHE_VERSION:
+                cached = data['bundles']
+        except (OSError, ValueError):
+            pass
+
+    bundles = {}
+    parsed = 0
+    for rel, (mtime_ns, size) in scan_bundles(content_dir).items():
+        entry = cached.get(rel)
+        if not entry or entry['mtime_ns'] != mtime_ns or entry['size'] != size:
+            record = read_bundle(content_dir, rel)
+            record['date'] = record['date'].isoformat() if record['date'] else None
+            entry = {'mtime_ns': mtime_ns, 'size': size, 'record': record}
+            parsed += 1
+        bundles[rel] = entry
+
+    if parsed or bundles.keys() != cached.keys():
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'version': CACHE_VERSION, 'bundles': bundles}), encoding='utf-8')
+        os.replace(tmp, cache_path)
+    return [bundles[rel]['record'] for rel in sorted(bundles)], parsed
+
+
+def _member(record):
+    return {'title': record['title'], 'permalink': record['permalink'], 'path': record['path'],
+            'date': record['date'], 'draft': record['draft']}
+
+
+def build_series(records):
+    """{urlized series name: {title, members in date order}}. Members whose
+    series is a single value rather than a list carry it as `series`, since
+    the series box matches those exactly, as Hugo's `where ... "eq"` does."""
+    series = {}
+    for record in records:
+        for name in record['series']:
+            entry = series.setdefault(urlize(name), {'title': name, 'members': []})
+            entry['members'].append(record)
+    for entry in series.values():
+        entry['members'].sort(key=lambda r: (r['date'] or '', r['path']))
+        entry['members'] = [{**_member(r), 'series': r['series_scalar']} if r.get('series_scalar') else _member(r)
+                            for r in entry['members']]
+    return dict(sorted(series.items()))
+
+
+def build_related(records, k=RELATED_K, chunk=256):
+    """{lowercased path: up to k related pages of the same section, best first}.
+
+    A pair of pages scores the summed weight of the tags and series they
+    share; rarer ones weigh more and series SERIES_WEIGHT times more than
+    tags. Scores for a block of pages are accumulated in one bincount over
+    the posting lists of their tags, so the cost grows with the number of
+    shared tags rather than with every pair. Drafts are never suggested;
+    ties go to the newer page.
+    """
+    import numpy as np
+
+    related = {}
+    by_section = {}
+    for record in records:
+        by_section.setdefault(record['section'], []).append(record)
+
+    for pages in by_section.values():
+        n = len(pages)
+        if n < 2:
+            continue
+        features = {}
+        rows, cols = [], []
+        for i, page in enumerate(pages):
+            names = {('tag', t.lower()) for t in page['tags']} | {('series', s.lower()) for s in page['series']}
+            for name in names:
+                rows.append(i)
+                cols.append(features.setdefault(name, len(features)))
+        if not features:
+            continue
+        rows = np.array(rows)
+        cols = np.array(cols)
+        df = np.bincount(cols, minlength=len(features))
+        weights = np.log1p(n / df)
+        weights[[col for name, col in features.items() if name[0] == 'series']] *= SERIES_WEIGHT
+
+        # Posting lists: the pages having each feature
+        by_feature = np.argsort(cols, kind='stable')
+        postings = rows[by_feature]
+        starts = np.concatenate(([0], np.cumsum(df)[:-1]))
+        # The page's features, grouped by page (rows are already in order)
+        page_starts = np.searchsorted(rows, np.arange(n + 1))
+
+        dates = [p['date'] or '' for p in pages]
+        recency = np.argsort(np.argsort(dates, kind='stable'), kind='stable') / (n * 1000.0)
+        candidate = np.array([not p['draft'] for p in pages])
+        members = [_member(p) for p in pages]
+
+        for first in range(0, n, chunk):
+            last = min(first + chunk, n)
+            lo, hi = page_starts[first], page_starts[last]
+            block_rows, block_cols = rows[lo:hi] - first, cols[lo:hi]
+            lengths = df[block_cols]
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            others = postings[np.repeat(starts[block_cols], lengths) + offsets]
+            pair_rows = np.repeat(block_rows, lengths)
+            keep = candidate[others] & (others != pair_rows + first)
+            # Sum the shared weight of each (page, other page) pair
+            pairs, where = np.unique(pair_rows[keep] * n + others[keep], return_inverse=True)
+            shared = np.bincount(where, weights=np.repeat(weights[block_cols], lengths)[keep])
+            block_rows, others = pairs // n, pairs % n
+            # By page, then best first (one argsort on a combined key is
+            # much faster than lexsort)
+            ranked = shared + recency[others]
+            order = np.argsort(block_rows * (ranked.max(initial=0.0) + 1.0) - ranked)
+            block_rows, others, shared = block_rows[order], others[order], shared[order]
+            bounds = np.searchsorted(block_rows, np.arange(last - first + 1))
+            top = np.arange(len(order)) - bounds[block_rows] < k
+            block_rows, others, shared = block_rows[top], others[top], shared[top].round(3)
+            bounds = np.searchsorted(block_rows, np.arange(last - first + 1)).tolist()
+            others, shared = others.tolist(), shared.tolist()
+            for row in range(last - first):
+                lo, hi = bounds[row], bounds[row + 1]
+                if lo < hi:
+                    related[pages[first + row]['path'].lower()] = [
+                        {**members[c], 'score': score} for c, score in zip(others[lo:hi], shared[lo:hi])]
+    return dict(sorted(related.items()))
+
+
+def update(base_dir, force=False, log=print):
+    """Bring data/series.json and data/related.json up to date. Returns the names written."""
+    content_dir = base_dir / "content"
+    data_dir = base_dir / "data"
+    cache_path = base_dir / ".hugo" / "site-data-cache.json"
+    config_path = base_dir / "config" / "_default" / "hugo.yaml"
+    records, parsed = load_records(content_dir, cache_path, force)
+    permalinks = load_permalinks(config_path)
+    for record in records:
+        record['permalink'] = permalink(record, permalinks)
+
+    outputs = {'series.json': build_series(records)}
+    try:
+        outputs['related.json'] = build_related(records)
+    except ImportError:
+        log("   ⚠️  NumPy not installed, data/related.json not updated (pip install numpy)")
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    written = [name for name, data in outputs.items()
+               if write_if_changed(data_dir / name, json.dumps(data, indent=1, ensure_ascii=False) + '\n')]
+    if written:
+        log(f"🧭 Site data: {', '.join(written)} updated ({parsed} of {len(records)} bundle(s) re-read)")
+    return written
+
+
+def refresh(base_dir, log=print):
+    """update() after a converter wrote bundles. A failure is reported, not
+    raised, so it never fails the conversion itself."""
+    try:
+        return update(base_dir, log=log)
+    except Exception as e:
+        log(f"   ⚠️  Site data not updated ({type(e).__name__}: {e}); run build-site-data.py")
+        return []
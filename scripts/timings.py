@@ -0,0 +1,129 @@
+"""
+Per-stage wall time and byte counts for the converters (--timings / --profile).
+
+Stages are accumulated by name. A run can print them as a table and append
+them, with per-note detail, as one JSON line to a trace file so several
+(batch) runs can be aggregated later.
+"""
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+def human_bytes(n):
+    for unit in ('B', 'KB', 'MB'):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+class Timings:
+    """Accumulates seconds, bytes and call counts per stage name."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = {}
+
+    def add(self, name, seconds, nbytes=0, calls=1):
+        if not self.enabled:
+            return
+        stage = self.stages.setdefault(name, {'seconds': 0.0, 'bytes': 0, 'calls': 0})
+        stage['seconds'] += seconds
+        stage['bytes'] += nbytes
+        stage['calls'] += calls
+
+    @contextmanager
+    def stage(self, name, nbytes=0, exclude=None):
+        """Time the enclosed block. Yields a dict whose 'bytes' may be set inside.
+        Time charged to the `exclude` stage during the block is not counted twice."""
+        counter = {'bytes': nbytes}
+        if not self.enabled:
+            yield counter
+            return
+        excluded = self.seconds(exclude) if exclude else 0.0
+        start = time.perf_counter()
+        try:
+            yield counter
+        finally:
+            elapsed = time.perf_counter() - start
+            if exclude:
+                elapsed -= self.seconds(exclude) - excluded
+            self.add(name, elapsed, counter['bytes'])
+
+    def timed_iter(self, name, iterable, nbytes=0):
+        """Yield from iterable, charging only the time spent fetching items to `name`
+        (as part of the current call to that stage rather than a new one)."""
+        if not self.enabled:
+            return iterable
+        return self._timed_iter(name, iterable, nbytes)
+
+    def _timed_iter(self, name, iterable, nbytes):
+        it = iter(iterable)
+        spent = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    spent += time.perf_counter() - start
+                    break
+                spent += time.perf_counter() - start
+                yield item
+        finally:
+            self.add(name, spent, nbytes, calls=0)
+
+    def seconds(self, name):
+        return self.stages.get(name, {}).get('seconds', 0.0)
+
+    def merge(self, stages):
+        """Fold in another run's `stages` (e.g. from a pool worker)."""
+        for name, s in stages.items():
+            stage = self.stages.setdefault(name, {'seconds': 0.0, 'bytes': 0, 'calls': 0})
+            stage['seconds'] += s['seconds']
+            stage['bytes'] += s['bytes']
+            stage['calls'] += s['calls']
+
+    def table(self, total=None):
+        """Stages as a text table, slowest first."""
+        rows = sorted(self.stages.items(), key=lambda kv: kv[1]['seconds'], reverse=True)
+        width = max([len(name) for name, _ in rows] + [5])
+        lines = [f"{'stage':<{width}}  {'calls':>6}  {'seconds':>9}  {'share':>6}  {'bytes':>10}"]
+        total = total or sum(s['seconds'] for _, s in rows) or 1e-9
+        for name, s in rows:
+            nbytes = human_bytes(s['bytes']) if s['bytes'] else '-'
+            lines.append(f"{name:<{width}}  {s['calls']:>6}  {s['seconds']:>9.4f}  {s['seconds'] / total:>6.1%}  {nbytes:>10}")
+        lines.append(f"{'total':<{width}}  {'':>6}  {total:>9.4f}")
+        return '\n'.join(lines)
+
+    def dump(self, path, tool, total, notes=None):
+        """Append this run as one JSON line to `path`."""
+        record = {
+            'tool': tool,
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'argv': sys.argv[1:],
+            'total_seconds': total,
+            'stages': self.stages,
+            'notes': notes or [],
+        }
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+def report(timings, wall, show=True, trace_path=None, tool='', notes=None):
+    """Print the table and/or append the JSON trace at the end of a run."""
+    if not timings.enabled:
+        return
+    if show:
+        print(f"\n⏱️  Timings ({wall:.3f}s wall; stage seconds are summed across workers)")
+        print(timings.table())
+    if trace_path:
+        timings.dump(trace_path, tool, wall, notes)
+        print(f"🧾 Trace appended to {trace_path}")
+
+
+# Shared do-nothing instance for callers that don't record timings
+NO_TIMINGS = Timings(enabled=False)
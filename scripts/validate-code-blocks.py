@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Run the SQL and Python code blocks in blog posts and report the ones that fail.
+Usage: python validate-code-blocks.py [post.md|folder ...] [--jobs N] [--force] [--timeout SECONDS]
+
+Fenced ```sql and ```python blocks are taken from every index.md under the
+content path in blog-validate.toml and honour the same annotations:
+
+  <!-- test:needs: customers, orders -->  anywhere in a post: load
+                                          blog-validate-helpers/_customers.sql, ...
+  <!-- test:skip -->                      directly above a block: don't run it
+  <!-- test:syntax-only -->               only parse it
+  <!-- test:expected-failure -->          it must raise an error
+  <!-- test:setup -->                     run it first, for the blocks after it
+
+Posts are checked in parallel. Each worker opens one DuckDB connection,
+seeded once from blog-validate-helpers/_global_data.py, and runs each post in
+a schema of its own that is dropped afterwards. Posts that pass are cached
+in .hugo/code-block-cache.json by a hash of their blocks and the fixtures
+they load, so only edited posts are run again.
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import signal
+import sys
+import tempfile
+import time
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import duckdb
+
+import fixture_db
+
+BASE_DIR = Path(__file__).parent.parent
+CONFIG_PATH = BASE_DIR / "blog-validate.toml"
+HELPERS_DIR = BASE_DIR / "blog-validate-helpers"
+GLOBAL_DATA_PATH = HELPERS_DIR / "_global_data.py"
+FIXTURE_DB_PATH = BASE_DIR / ".hugo" / "fixtures.duckdb"
+CACHE_PATH = BASE_DIR / ".hugo" / "code-block-cache.json"
+CACHE_VERSION = 3
+
+FENCE_OPEN_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})[ \t]*([\w+-]*)')
+FENCE_CLOSE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})[ \t]*$')
+ANNOTATION_RE = re.compile(r'^[ \t]*<!--[ \t]*test:([\w-]+)(?::[ \t]*(.*?))?[ \t]*-->[ \t]*$')
+LANGUAGES = {'sql': 'sql', 'python': 'python', 'py': 'python'}
+BLOCK_MODES = {'skip', 'syntax-only', 'expected-failure', 'setup'}
+READ_ONLY_STATEMENTS = {'SELECT', 'EXPLAIN'}
+
+
+def extract_blocks(text):
+    """(needed fixtures, blocks) for a post. Blocks are dicts with line, lang, mode, code."""
+    needs = []
+    blocks = []
+    mode = 'run'
+    fence = None
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if fence is not None:
+            m = FENCE_CLOSE_RE.match(line)
+            if m and m.group(1)[0] == fence['marker'][0] and len(m.group(1)) >= len(fence['marker']):
+                if fence['lang']:
+                    blocks.append({'line': fence['line'], 'lang': fence['lang'], 'mode': fence['mode'],
+                                   'code': '\n'.join(fence['lines']) + '\n'})
+                fence = None
+            else:
+                fence['lines'].append(line)
+            continue
+
+        m = FENCE_OPEN_RE.match(line)
+        if m:
+            fence = {'marker': m.group(1), 'lang': LANGUAGES.get(m.group(2).lower()),
+                     'mode': mode, 'line': lineno + 1, 'lines': []}
+            mode = 'run'
+            continue
+        m = ANNOTATION_RE.match(line)
+        if m:
+            if m.group(1) == 'needs':
+                needs.extend(n.strip() for n in (m.group(2) or '').split(',') if n.strip())
+            elif m.group(1) in BLOCK_MODES:
+                mode = m.group(1)
+            continue
+        if line.strip():
+            mode = 'run'
+    return needs, blocks
+
+
+def fixture_path(name):
+    for candidate in (HELPERS_DIR / f"_{name}.sql", HELPERS_DIR / f"{name}.sql"):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def post_key(blocks, fixtures, fixture_source):
+    """Cache key: everything a post's outcome depends on."""
+    payload = json.dumps({
+        'version': CACHE_VERSION,
+        'duckdb': duckdb.__version__,
+        'python': sys.version_info[:2],
+        'fixture_db': fixture_source,
+        'fixtures': fixtures,
+        'blocks': [(b['lang'], b['mode'], b['code']) for b in blocks],
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('posts', {}) if data.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(posts, path=CACHE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps({'version': CACHE_VERSION, 'posts': posts}, indent=1), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Pool workers
+# ---------------------------------------------------------------------------
+
+_conn = None
+_seed = None
+_python_globals = '{}'
+_seed_tables = []
+_dataframes = []
+_scaled = False
+
+
+class BlockTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise BlockTimeout("timed out")
+
+
+def _init_worker(db_path):
+    """Open this worker's DuckDB connection with the fixture database attached read-only."""
+    global _conn, _seed, _python_globals, _seed_tables, _dataframes, _scaled
+    _conn = duckdb.connect()
+    _conn.execute(f"ATTACH '{db_path}' AS fixtures (READ_ONLY)")
+    meta = fixture_db.read_meta(_conn, 'fixtures')
+    # Posts call their connection `con`, _global_data.py calls it `conn`
+    _seed = {'__name__': '__blog_validate__', 'conn': _conn, 'con': _conn, 'duckdb': duckdb}
+    _python_globals = json.dumps(meta['python_globals'])
+    _seed_tables = fixture_db.tables(_conn, 'fixtures')
+    _dataframes = fixture_db.dataframes(_conn, 'fixtures')
+    _scaled = bool(meta['scale'])
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def _run_block(block, namespace):
+    """Run (or just parse) one block; raises on failure."""
+    if block['lang'] == 'sql':
+        if block['mode'] == 'syntax-only':
+            _conn.extract_statements(block['code'])
+        else:
+            for statement in _conn.extract_statements(block['code']):
+                _conn.execute(statement)
+    else:
+        code = compile(block['code'], f"line {block['line']}", 'exec')
+        if block['mode'] != 'syntax-only':
+            exec(code, namespace)
+
+
+def _writes(blocks):
+    """True if any SQL block that runs has a statement other than a query."""
+    for block in blocks:
+        if block['lang'] != 'sql' or block['mode'] in ('skip', 'syntax-only'):
+            continue
+        try:
+            statements = _conn.extract_statements(block['code'])
+        except duckdb.Error:
+            continue
+        if any(st.type.name not in READ_ONLY_STATEMENTS for st in statements):
+            return True
+    return False
+
+
+def _check_post(rel, needs, fixtures, blocks, timeout):
+    """Run a post's blocks in order. Returns [(line, lang, status, message, seconds)]."""
+    results = []
+    # Fresh copies of customers/orders/... so one post can't change them for the next
+    namespace = {**_seed, **json.loads(_python_globals)}
+    # customers_df & co. cost a pandas import, so only posts using them get them
+    python = '\n'.join(b['code'] for b in blocks if b['lang'] == 'python' and b['mode'] not in ('skip', 'syntax-only'))
+    for name in _dataframes:
+        if re.search(rf'\b{name}\b', python):
+            namespace[name] = fixture_db.load_dataframe(_conn, name, 'fixtures')
+    _conn.execute("CREATE SCHEMA memory.post")
+    _conn.execute("SET search_path = 'memory.post,fixtures.main'")
+    cwd = os.getcwd()
+    try:
+        # Fixture tables are copied so the post can change them freely, and
+        # fixtures the post needs replace them. Scaled tables stand in for
+        # the fixtures of the same name; they are only copied for posts that
+        # change data, and otherwise read in place.
+        writes = _scaled and _writes(blocks)
+        for table in _seed_tables:
+            if (table in needs and writes) if _scaled else table not in needs:
+                _conn.execute(f'CREATE TABLE memory.post."{table}" AS SELECT * FROM fixtures.main."{table}"')
+        for name in needs:
+            if not (_scaled and name in _seed_tables):
+                _conn.execute(fixtures[name])
+
+        with tempfile.TemporaryDirectory() as scratch, \
+                contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            # Blocks that write files (practice.duckdb, ...) do so in a scratch folder
+            os.chdir(scratch)
+            for block in blocks:
+                if block['mode'] == 'skip':
+                    results.append((block['line'], block['lang'], 'skipped', '', 0.0))
+                    continue
+                error = None
+                began = time.perf_counter()
+                signal.alarm(timeout)
+                try:
+                    _run_block(block, namespace)
+                except BaseException as e:
+                    if isinstance(e, KeyboardInterrupt):
+                        raise
+                    error = f"{type(e).__name__}: {str(e).strip().splitlines()[0] if str(e).strip() else ''}"
+                finally:
+                    signal.alarm(0)
+                if block['mode'] == 'expected-failure':
+                    status, message = ('passed', '') if error else ('failed', "expected an error, but it ran")
+                else:
+                    status, message = ('failed', error) if error else ('passed', '')
+                results.append((block['line'], block['lang'], status, message, time.perf_counter() - began))
+    except duckdb.Error as e:
+        results.append((0, 'sql', 'failed', f"fixture setup: {type(e).__name__}: {e}", 0.0))
+    finally:
+        os.chdir(cwd)
+        with contextlib.suppress(duckdb.Error):
+            _conn.execute("ROLLBACK")
+        _conn.execute("SET search_path = 'memory.main'")
+        _conn.execute("DROP SCHEMA IF EXISTS memory.post CASCADE")
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def collect_posts(targets, post_file):
+    posts = []
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            posts.extend(path.rglob(post_file))
+        elif path.is_file():
+            posts.append(path)
+        else:
+            print(f"⚠️  Not found: {target}")
+    return sorted(set(p.resolve() for p in posts))
+
+
+def main():
+    config = tomllib.loads(CONFIG_PATH.read_text(encoding='utf-8')) if CONFIG_PATH.exists() else {}
+    blog = config.get('blog', {})
+    content_path = BASE_DIR / blog.get('content_path', 'content/blog')
+    post_file = blog.get('post_file', 'index.md')
+
+    parser = argparse.ArgumentParser(description="Run the SQL and Python code blocks in blog posts.")
+    parser.add_argument('targets', nargs='*', help=f"posts or folders (default: {content_path.relative_to(BASE_DIR)})")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="run every post again, even if its cached result is current")
+    parser.add_argument('--timeout', type=int, default=30, metavar='SECONDS', help="per-block time limit (default: 30)")
+    parser.add_argument('--slowest', type=int, default=0, metavar='N', help="list the N slowest blocks that ran")
+    opts = parser.parse_args()
+
+    start = time.perf_counter()
+    posts = collect_posts(opts.targets or [content_path], post_file)
+    meta = fixture_db.ensure(FIXTURE_DB_PATH, GLOBAL_DATA_PATH)
+    if meta['scale']:
+        print(f"📏 Fixtures scaled to {meta['scale']:,} customers (build-fixtures.py without --scale to reset)")
+    # Only the posts run here are updated; --force just doesn't trust the cache
+    cache = load_cache()
+
+    tasks = []
+    cached_posts = 0
+    counts = {'passed': 0, 'skipped': 0, 'failed': 0}
+    failures = []
+    for post in posts:
+        rel = str(post.relative_to(BASE_DIR)) if post.is_relative_to(BASE_DIR) else str(post)
+        needs, blocks = extract_blocks(post.read_text(encoding='utf-8'))
+        if not blocks:
+            cache.pop(rel, None)
+            continue
+        fixtures = {}
+        for name in needs:
+            path = fixture_path(name)
+            if path is None:
+                failures.append((rel, 0, 'sql', f"no fixture for test:needs '{name}' in {HELPERS_DIR.name}/"))
+            else:
+                fixtures[name] = path.read_text(encoding='utf-8')
+        if len(fixtures) < len(needs):
+            continue
+        key = post_key(blocks, fixtures, meta['source'])
+        hit = cache.get(rel)
+        if hit and hit['key'] == key and not opts.force:
+            cached_posts += 1
+            counts['passed'] += hit['passed']
+            counts['skipped'] += hit['skipped']
+            continue
+        tasks.append((rel, key, needs, fixtures, blocks))
+
+    print(f"🧪 {len(posts)} post(s): {len(tasks)} to run, {cached_posts} cached")
+
+    outcomes = []
+    if tasks:
+        jobs = max(1, min(opts.jobs, len(tasks)))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(str(FIXTURE_DB_PATH),)) as pool:
+            futures = [(rel, key, pool.submit(_check_post, rel, needs, fixtures, blocks, opts.timeout))
+                       for rel, key, needs, fixtures, blocks in tasks]
+            for rel, key, future in futures:
+                try:
+                    outcomes.append((rel, key, future.result()))
+                except Exception as e:
+                    outcomes.append((rel, key, [(0, '', 'failed', f"worker crashed: {type(e).__name__}: {e}", 0.0)]))
+
+    timed = []
+    for rel, key, results in outcomes:
+        statuses = [status for _, _, status, _, _ in results]
+        for line, lang, status, message, seconds in results:
+            counts[status] += 1
+            timed.append((seconds, rel, line, lang))
+            if status == 'failed':
+                failures.append((rel, line, lang, message))
+        if 'failed' not in statuses:
+            cache[rel] = {'key': key, 'passed': statuses.count('passed'), 'skipped': statuses.count('skipped')}
+        else:
+            cache.pop(rel, None)
+    # Forget posts that were deleted or moved
+    for rel in [rel for rel in cache if not (BASE_DIR / rel).exists()]:
+        del cache[rel]
+    save_cache(cache)
+
+    if opts.slowest:
+        print(f"🐢 Slowest {opts.slowest} block(s) run:")
+        for seconds, rel, line, lang in sorted(timed, reverse=True)[:opts.slowest]:
+            print(f"   {seconds:8.3f}s  {rel}:{line} ({lang})")
+    for rel, line, lang, message in failures:
+        where = f"{rel}:{line}" if line else rel
+        print(f"   ❌ {where} ({lang}) {message}")
+    print(f"\n📊 Code blocks: {counts['passed']} passed, {counts['skipped']} skipped, "
+          f"{len(failures)} failed in {time.perf_counter() - start:.2f}s")
+    if failures:
+        sys.exit(1)
+    print("🎉 All code blocks passed")
+
+
+if __name__ == "__main__":
+    main()
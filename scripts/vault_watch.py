@@ -0,0 +1,174 @@
+"""
+File watching for the converters' --watch mode.
+
+On Linux, changes are read from inotify (through ctypes, no extra packages);
+elsewhere, or if inotify is unavailable, the watched trees are polled by
+mtime. Bursts of events are debounced into one set of changed paths.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+# Returned instead of paths when events were lost and everything may have changed
+OVERFLOW = object()
+
+
+def _walk_dirs(root):
+    """root and every directory below it, skipping dot-directories."""
+    stack = [Path(root)]
+    while stack:
+        d = stack.pop()
+        yield d
+        try:
+            with os.scandir(d) as it:
+                stack.extend(Path(e.path) for e in it
+                             if not e.name.startswith('.') and e.is_dir(follow_symlinks=False))
+        except OSError:
+            pass
+
+
+class InotifyWatcher:
+    """Recursive inotify watch on one or more directory trees."""
+
+    def __init__(self, roots):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for root in roots:
+            for d in _walk_dirs(root):
+                self._watch(d)
+
+    def _watch(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached (raise fs.inotify.max_user_watches or use --poll)")
+            return
+        self.dirs[wd] = Path(directory)
+
+    def wait(self, timeout=None):
+        """Changed paths seen within `timeout` seconds (None blocks until one)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(buf, offset)
+                name = buf[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+                offset += EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return OVERFLOW
+                parent = self.dirs.get(wd)
+                if parent is None or not name:
+                    continue
+                path = parent / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    # New folder: watch it, and report files that landed before the watch did
+                    if not path.name.startswith('.'):
+                        for d in _walk_dirs(path):
+                            self._watch(d)
+                            changed.update(p for p in d.iterdir() if p.is_file())
+                elif not path.name.startswith('.'):
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback: compares file mtimes under the roots every `interval` seconds."""
+
+    def __init__(self, roots, interval=0.5):
+        self.roots = [Path(r) for r in roots]
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        seen = {}
+        for root in self.roots:
+            for d in _walk_dirs(root):
+                try:
+                    with os.scandir(d) as it:
+                        for e in it:
+                            if not e.name.startswith('.') and e.is_file():
+                                seen[e.path] = e.stat().st_mtime_ns
+                except OSError:
+                    pass
+        return seen
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if remaining > 0:
+                time.sleep(remaining)
+            current = self._scan()
+            changed = {Path(p) for p, m in current.items() if self.snapshot.get(p) != m}
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(roots, poll=False, log=print):
+    """inotify on Linux unless `poll`; polling otherwise or if inotify fails."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            watcher = InotifyWatcher(roots)
+            log(f"👀 Watching {len(watcher.dirs)} folder(s) with inotify")
+            return watcher
+        except OSError as e:
+            log(f"⚠️  inotify unavailable ({e}), falling back to polling")
+    watcher = PollingWatcher(roots)
+    log(f"👀 Polling {len(watcher.snapshot)} file(s) every {watcher.interval}s")
+    return watcher
+
+
+def watch(watcher, on_change, debounce=0.05, log=print):
+    """Call on_change(paths) for each debounced burst of changes until Ctrl-C.
+    `paths` is OVERFLOW if events were dropped."""
+    try:
+        while True:
+            changed = watcher.wait(None)
+            if not changed:
+                continue
+            # Keep collecting until the burst has been quiet for `debounce` seconds
+            while changed is not OVERFLOW:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed = OVERFLOW if more is OVERFLOW else changed | more
+            on_change(changed)
+    except KeyboardInterrupt:
+        log("\n👋 Stopped watching")
+    finally:
+        watcher.close()
@@ -0,0 +1,174 @@
+"""
+Resolve Obsidian [[wiki links]] to Hugo refs.
+
+LinkIndex maps every bundle's title, aliases and source note filename (from
+the converters' manifests) to its page, with the bundle's folder name and
+slug as a fallback. It is built once per run from the bundle cache site_data
+keeps in .hugo/, so only changed bundles are re-read, and each link is then
+a dict lookup.
+
+Published pages become {{< relref >}} links, which Hugo checks at build time.
+Drafts and future-dated pages aren't built yet, so those get their final URL
+instead. Links that don't resolve are written as plain text and collected
+for one report at the end of the run.
+"""
+import json
+import re
+import unicodedata
+from datetime import date
+
+from frontmatter_fields import extract_list, extract_scalar, slugify
+from markdown_text import fenced_lines, outside_code_spans
+from site_data import load_permalinks, load_records, permalink
+
+# [[Note]], [[Note|label]], [[Note#Heading]], [[Note^block|label]], [[#Heading]]
+WIKI_LINK_RE = re.compile(r'(?<!!)\[\[([^\[\]|#^]*)(?:#([^\[\]|^]*))?(?:\^[^\[\]|]*)?(?:\|([^\[\]]*))?\]\]')
+ANCHOR_DROP_RE = re.compile(r'[^\w\- ]')
+
+AMBIGUOUS = object()
+
+
+def normalize(name):
+    """Lookup key for a link target: last path component, no .md, case-folded."""
+    name = unicodedata.normalize('NFC', name).strip().rsplit('/', 1)[-1]
+    if name.lower().endswith('.md'):
+        name = name[:-3]
+    return ' '.join(name.casefold().split())
+
+
+def source_name(path):
+    """The name Obsidian links a note by: its filename, or its folder for index.md."""
+    parts = path.replace('\\', '/').split('/')
+    return parts[-2] if parts[-1] == 'index.md' and len(parts) > 1 else parts[-1]
+
+
+def anchor(heading):
+    """The id Hugo (goldmark) gives a heading."""
+    return ANCHOR_DROP_RE.sub('', heading.strip().lower()).replace(' ', '-')
+
+
+def link_label(m):
+    """The text a WIKI_LINK_RE match shows: its label, else "note > heading"."""
+    target, heading, label = m.group(1).strip(), (m.group(2) or '').strip(), m.group(3)
+    if label:
+        return label
+    return f"{target} > {heading}" if target and heading else target or heading
+
+
+def plain_text(text):
+    """Text with its wiki links reduced to what they show, e.g. for a description."""
+    return WIKI_LINK_RE.sub(link_label, text)
+
+
+class LinkIndex:
+    """Link target name -> destination of every bundle in content/blog and content/finds."""
+
+    SECTIONS = ('blog', 'finds')
+
+    def __init__(self, today=None):
+        self.names = {}  # name -> bundle path (or AMBIGUOUS)
+        self.slugs = {}
+        self.dests = {}  # bundle path -> destination
+        self.missing = {}  # target as written -> {note names}
+        self.permalinks = {}
+        self.today = (today or date.today()).isoformat()
+
+    @classmethod
+    def load(cls, base_dir, manifest_paths=()):
+        """Index every bundle, plus the source note names the converters recorded."""
+        index = cls()
+        records, _ = load_records(base_dir / "content", base_dir / ".hugo" / "site-data-cache.json")
+        index.permalinks = load_permalinks(base_dir / "config" / "_default" / "hugo.yaml")
+        sources = {}
+        for manifest_path in manifest_paths:
+            try:
+                notes = json.loads(manifest_path.read_text(encoding='utf-8')).get('notes', {})
+            except (OSError, ValueError):
+                continue
+            content_dir = str((base_dir / "content").resolve())
+            for source, entry in notes.items():
+                output = entry.get('output', '')
+                if output.startswith(content_dir):
+                    rel = output[len(content_dir) + 1:].replace('\\', '/')
+                    sources.setdefault(rel, []).append(source_name(source))
+        for record in records:
+            if record['section'] in cls.SECTIONS:
+                index.add(record, sources.get(record['path'], []))
+        return index
+
+    def add(self, record, source_names=()):
+        """Index one bundle (a site_data record) under its names."""
+        published = not record['draft'] and (record['date'] or '') <= self.today
+        # relref takes the content path of the bundle folder
+        path = record['path']
+        self.dests[path] = f'ref:/{path.rsplit("/", 1)[0]}' if published else permalink(record, self.permalinks)
+        names = {record['title'], *record.get('aliases', ()), *source_names}
+        for name in filter(None, map(normalize, names)):
+            self._put(self.names, name, path)
+        for slug in {path.split('/')[-2], record['slug']} - {''}:
+            self._put(self.slugs, slugify(slug), path)
+
+    def add_frontmatter(self, fm, rel, source_path):
+        """Index a note converted in this run (its bundle may not exist yet).
+        `rel` is the bundle's index.md relative to content/."""
+        self.add({'path': rel, 'section': rel.split('/')[0], 'title': extract_scalar(fm, 'title'),
+                  'slug': extract_scalar(fm, 'slug'), 'aliases': extract_list(fm, 'aliases'),
+                  'draft': extract_scalar(fm, 'draft').lower() == 'true',
+                  'date': extract_scalar(fm, 'date')[:10] or None}, [source_name(str(source_path))])
+
+    @staticmethod
+    def _put(table, key, path):
+        # Two pages answering to one name: link to neither
+        table[key] = path if table.get(key, path) == path else AMBIGUOUS
+
+    def destination(self, target):
+        """What a link to `target` points to ('ref:<content path>' for published
+        pages, else the URL), or None if it doesn't resolve."""
+        key = normalize(target)
+        path = self.names.get(key)
+        if path is None:
+            path = self.slugs.get(slugify(key))
+        return None if path is None or path is AMBIGUOUS else self.dests[path]
+
+    def rewrite(self, text, resolved, unresolved):
+        """Rewrite the wiki links in one line of markdown (outside code spans).
+        Targets go into `resolved` (target -> destination) or `unresolved`."""
+        def link(m):
+            target, heading, label = m.group(1).strip(), m.group(2), link_label(m)
+            heading = heading.strip() if heading else ''
+            if not target:
+                return f"[{label}](#{anchor(heading)})" if heading else m.group(0)
+            dest = self.destination(target)
+            resolved[normalize(target)] = dest
+            if dest is None:
+                unresolved.append(target)
+                return label
+            if heading:
+                dest += f"#{anchor(heading)}"
+            if dest.startswith('ref:'):
+                dest = f'{{{{< relref "{dest[4:]}" >}}}}'
+            return f"[{label}]({dest})"
+
+        return outside_code_spans(text, lambda part: WIKI_LINK_RE.sub(link, part))
+
+    def rewrite_body(self, body, resolved, unresolved):
+        """rewrite() every line of a markdown body, leaving fenced code alone."""
+        return ''.join(self.rewrite(line, resolved, unresolved) if not in_code and '[[' in line else line
+                       for line, in_code in fenced_lines(body.splitlines(keepends=True)))
+
+    def is_current(self, recorded):
+        """True if links recorded at the last conversion still resolve the same way."""
+        return all(self.destination(target) == dest for target, dest in recorded.items())
+
+    def note_missing(self, note_name, targets):
+        for target in targets:
+            self.missing.setdefault(target, set()).add(note_name)
+
+    def report(self, log=print):
+        """Print every unresolved link target once, with the notes that use it."""
+        if not self.missing:
+            return
+        notes = set().union(*self.missing.values())
+        log(f"\n🔗 {len(self.missing)} unresolved wiki link(s) in {len(notes)} note(s), written as plain text:")
+        for target in sorted(self.missing, key=str.casefold):
+            log(f"   [[{target}]] ← {', '.join(sorted(self.missing[target]))}")
@@ -0,0 +1,96 @@
+"""Shared fixtures: a local HTTP server standing in for oEmbed providers,
+linked sites and the model server, so no test touches the network."""
+import http.server
+import json
+import threading
+import time
+import urllib.parse
+
+import pytest
+
+
+class StubServer(http.server.ThreadingHTTPServer):
+    """Answers (method, path) with the response set by route(), 404 otherwise.
+    Records every request and the most requests it had in flight at once."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _StubHandler)
+        self.routes = {}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def route(self, method, path, status=200, body=None, delay=0):
+        """`body` may be a dict (sent as JSON) or a function of the request body."""
+        self.routes[(method, path)] = (status, body, delay)
+
+    def count(self, method=None, path=None):
+        return sum(1 for m, p, _ in self.requests if method in (None, m) and path in (None, p))
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+
+    def _answer(self, method):
+        server = self.server
+        path = urllib.parse.urlsplit(self.path).path
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = self.rfile.read(length) if length else b''
+        with server.lock:
+            server.requests.append((method, path, self.path))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            status, body, delay = server.routes.get((method, path), (404, None, 0))
+            if delay:
+                time.sleep(delay)
+            if callable(body):
+                body = body(json.loads(payload) if payload else None)
+            data = json.dumps(body).encode() if body is not None else b''
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            if method != 'HEAD':
+                self.wfile.write(data)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def do_GET(self):
+        self._answer('GET')
+
+    def do_HEAD(self):
+        self._answer('HEAD')
+
+    def do_POST(self):
+        self._answer('POST')
+
+    def log_message(self, *args):
+        pass
+
+
+class Log(list):
+    def __call__(self, message):
+        self.append(message)
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def log():
+    """A `log` callback that keeps its messages for assertions."""
+    return Log()
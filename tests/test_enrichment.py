@@ -0,0 +1,83 @@
+import json
+
+from enrichment import Enricher
+
+NOTES = [
+    ('one', 'post', 'Window functions', 'How ROW_NUMBER works in DuckDB.'),
+    ('two', 'find', 'A pandas trick', 'Someone found a faster groupby.'),
+]
+
+
+def reply(request):
+    title = request['messages'][1]['content'].splitlines()[0][len('Title: '):]
+    content = {'description': f'"About {title}."', 'tags': ['#SQL', 'sql', 'Local AI']}
+    return {'message': {'role': 'assistant', 'content': json.dumps(content)}}
+
+
+def serve_model(stub_server, delay=0):
+    stub_server.route('GET', '/api/tags', body={'models': [{'name': 'llama3.2:latest'}]})
+    stub_server.route('POST', '/api/chat', body=reply, delay=delay)
+
+
+def make_enricher(stub_server, tmp_path):
+    return Enricher(tmp_path / 'enrichment.json', model='llama3.2', endpoint=stub_server.url, timeout=5)
+
+
+def test_notes_get_a_description_and_tags(stub_server, tmp_path, log):
+    serve_model(stub_server)
+    results = make_enricher(stub_server, tmp_path).enrich(NOTES, log)
+    assert results['one'] == {'description': 'About Window functions.', 'tags': ['sql', 'local-ai']}
+    assert results['two']['description'] == 'About A pandas trick.'
+    assert stub_server.count('POST', '/api/chat') == 2
+
+
+def test_answers_are_cached_by_content(stub_server, tmp_path, log):
+    serve_model(stub_server)
+    first = make_enricher(stub_server, tmp_path).enrich(NOTES, log)
+
+    again = make_enricher(stub_server, tmp_path).enrich(NOTES, log)
+    assert again == first
+    assert stub_server.count('POST', '/api/chat') == 2
+
+    # An edited note is asked about again, the other one isn't
+    edited = [NOTES[0], (*NOTES[1][:3], 'Someone found an even faster groupby.')]
+    make_enricher(stub_server, tmp_path).enrich(edited, log)
+    assert stub_server.count('POST', '/api/chat') == 3
+
+
+def test_requests_in_flight_are_limited(stub_server, tmp_path, log):
+    serve_model(stub_server, delay=0.1)
+    notes = [(str(n), 'post', f'Post {n}', f'Text {n}') for n in range(6)]
+    enricher = Enricher(tmp_path / 'enrichment.json', endpoint=stub_server.url, model='llama3.2', concurrency=2)
+    assert all(enricher.enrich(notes, log).values())
+    assert stub_server.max_in_flight == 2
+
+
+def test_missing_model_leaves_notes_to_the_fallback(stub_server, tmp_path, log):
+    stub_server.route('GET', '/api/tags', body={'models': [{'name': 'mistral:latest'}]})
+    assert make_enricher(stub_server, tmp_path).enrich(NOTES, log) == {'one': None, 'two': None}
+    assert stub_server.count('POST') == 0
+    assert any('ollama pull llama3.2' in message for message in log)
+
+
+def test_unreachable_server_leaves_notes_to_the_fallback(stub_server, tmp_path, log):
+    stub_server.server_close()
+    assert make_enricher(stub_server, tmp_path).enrich(NOTES, log) == {'one': None, 'two': None}
+    assert any('No model server' in message for message in log)
+
+
+def test_failed_answers_are_not_cached(stub_server, tmp_path, log):
+    stub_server.route('GET', '/api/tags', body={'models': [{'name': 'llama3.2'}]})
+    stub_server.route('POST', '/api/chat', status=500)
+    enricher = make_enricher(stub_server, tmp_path)
+    assert enricher.enrich(NOTES[:1], log) == {'one': None}
+
+    # A reply that isn't the JSON asked for counts as a failure too
+    stub_server.route('POST', '/api/chat', body={'message': {'content': 'Sure! Here is a description.'}})
+    assert enricher.enrich(NOTES[:1], log) == {'one': None}
+    assert enricher.cache.entries == {}
+    assert not (tmp_path / 'enrichment.json').exists()
+
+    serve_model(stub_server)
+    assert enricher.enrich(NOTES[:1], log)['one']
+    assert stub_server.count('POST', '/api/chat') == 3
@@ -0,0 +1,82 @@
+import time
+
+from link_check import LinkCache, check_links, urls_in_body
+
+
+def check(stub_server, paths, cache=None, **kwargs):
+    urls = [f"{stub_server.url}{path}" for path in paths]
+    results, cached = check_links(urls, cache, timeout=5, interval=0, log=lambda message: None, **kwargs)
+    return {url[len(stub_server.url):]: result for url, result in results.items()}, cached
+
+
+def test_head_is_enough_when_it_succeeds(stub_server):
+    stub_server.route('HEAD', '/ok')
+    results, _ = check(stub_server, ['/ok'])
+    assert results['/ok']['ok'] and results['/ok']['status'] == 200
+    assert stub_server.count('GET') == 0
+
+
+def test_refused_head_is_retried_with_get(stub_server):
+    stub_server.route('HEAD', '/no-head', status=405)
+    stub_server.route('GET', '/no-head')
+    stub_server.route('HEAD', '/forbidden', status=403)
+    stub_server.route('GET', '/forbidden')
+    results, _ = check(stub_server, ['/no-head', '/forbidden'])
+    assert results['/no-head'] == {'status': 200, 'ok': True, 'error': None}
+    assert results['/forbidden']['ok']
+    assert [m for m, p, _ in stub_server.requests if p == '/no-head'] == ['HEAD', 'GET']
+
+
+def test_missing_pages_are_broken(stub_server):
+    results, _ = check(stub_server, ['/gone'])
+    assert results['/gone'] == {'status': 404, 'ok': False, 'error': None}
+    assert stub_server.count('HEAD', '/gone') == 1 and stub_server.count('GET', '/gone') == 1
+
+
+def test_unreachable_hosts_are_broken(stub_server):
+    stub_server.server_close()
+    results, _ = check(stub_server, ['/down'])
+    assert not results['/down']['ok'] and results['/down']['status'] is None
+    assert results['/down']['error']
+
+
+def test_results_are_cached_until_their_ttl(stub_server, tmp_path):
+    stub_server.route('HEAD', '/ok')
+    cache = LinkCache(tmp_path / 'links.json', ttl=3600)
+    check(stub_server, ['/ok', '/gone'], cache)
+    cache.save()
+    requests = len(stub_server.requests)
+
+    cache = LinkCache(tmp_path / 'links.json', ttl=3600)
+    results, cached = check(stub_server, ['/ok', '/gone'], cache)
+    assert cached == 2 and len(stub_server.requests) == requests
+    assert results['/ok']['ok'] and not results['/gone']['ok']
+
+    # --force rechecks everything
+    _, cached = check(stub_server, ['/ok'], cache, force=True)
+    assert cached == 0 and stub_server.count('HEAD', '/ok') == 2
+
+
+def test_failures_expire_sooner_than_good_links(stub_server, tmp_path):
+    cache = LinkCache(tmp_path / 'links.json', ttl=7 * 86400, failed_ttl=3600)
+    two_hours_ago = time.time() - 7200
+    cache.put(f"{stub_server.url}/ok", {'status': 200, 'ok': True, 'error': None}, now=two_hours_ago)
+    cache.put(f"{stub_server.url}/flaky", {'status': 503, 'ok': False, 'error': None}, now=two_hours_ago)
+    stub_server.route('HEAD', '/flaky')
+
+    results, cached = check(stub_server, ['/ok', '/flaky'], cache)
+    assert cached == 1
+    assert results['/flaky']['ok']
+    assert stub_server.count('HEAD', '/flaky') == 1 and stub_server.count(path='/ok') == 0
+
+
+def test_urls_in_code_are_ignored():
+    body = "\n".join([
+        "See https://example.org/a, and [docs](https://example.org/b).",
+        "`https://example.org/span`",
+        "```python",
+        "requests.get('https://example.org/fenced')",
+        "```",
+        "<https://example.org/c>",
+    ])
+    assert urls_in_body(body) == ['https://example.org/a', 'https://example.org/b', 'https://example.org/c']
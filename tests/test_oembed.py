@@ -0,0 +1,65 @@
+import time
+
+from oembed import OEmbedCache, fetch_oembed_batch
+
+POSTS = [('x', f'https://x.com/someone/status/{n}') for n in range(1, 7)]
+
+
+def endpoints(stub_server):
+    return {'x': f"{stub_server.url}/x", 'bluesky': f"{stub_server.url}/bluesky"}
+
+
+def test_cached_embeds_are_not_fetched_again(stub_server, tmp_path, log):
+    stub_server.route('GET', '/x', body={'html': '<blockquote>post</blockquote>'})
+    cache = OEmbedCache(tmp_path / 'oembed.json')
+    first = fetch_oembed_batch(POSTS[:2], cache, endpoints(stub_server), log=log)
+    cache.save()
+    assert set(first.values()) == {'<blockquote>post</blockquote>'}
+    assert stub_server.count('GET', '/x') == 2
+
+    # Another run reads the saved cache; twitter.com and www. are the same post
+    again = OEmbedCache(tmp_path / 'oembed.json')
+    second = fetch_oembed_batch([('x', 'https://www.twitter.com/someone/status/1'), POSTS[1]], again,
+                                endpoints(stub_server), log=log)
+    assert list(second.values()) == ['<blockquote>post</blockquote>'] * 2
+    assert stub_server.count('GET', '/x') == 2
+
+
+def test_expired_embeds_are_fetched_again(stub_server, tmp_path, log):
+    stub_server.route('GET', '/x', body={'html': '<blockquote>new</blockquote>'})
+    cache = OEmbedCache(tmp_path / 'oembed.json', ttl=3600)
+    platform, url = POSTS[0]
+    cache.put(url, '<blockquote>old</blockquote>', now=time.time() - 7200)
+
+    results = fetch_oembed_batch([(platform, url)], cache, endpoints(stub_server), log=log)
+    assert results[url] == '<blockquote>new</blockquote>'
+    assert stub_server.count('GET', '/x') == 1
+    assert cache.get(url) == '<blockquote>new</blockquote>'
+
+
+def test_failed_fetches_are_not_cached(stub_server, tmp_path, log):
+    stub_server.route('GET', '/x', status=503)
+    cache = OEmbedCache(tmp_path / 'oembed.json')
+    platform, url = POSTS[0]
+
+    assert fetch_oembed_batch([(platform, url)], cache, endpoints(stub_server), log=log) == {url: None}
+    assert cache.entries == {}
+    assert any('oEmbed fetch failed' in message for message in log)
+
+    # The next run tries again
+    stub_server.route('GET', '/x', body={'html': '<blockquote>post</blockquote>'})
+    assert fetch_oembed_batch([(platform, url)], cache, endpoints(stub_server), log=log)[url]
+    assert stub_server.count('GET', '/x') == 2
+
+
+def test_requests_per_host_are_limited(stub_server, log):
+    stub_server.route('GET', '/x', body={'html': '<blockquote>post</blockquote>'}, delay=0.2)
+    results = fetch_oembed_batch(POSTS, None, endpoints(stub_server), per_host=2, log=log)
+    assert len(results) == len(POSTS) and all(results.values())
+    assert stub_server.max_in_flight == 2
+
+
+def test_unsupported_platforms_are_skipped(stub_server, log):
+    url = 'https://mastodon.social/@someone/1'
+    assert fetch_oembed_batch([('mastodon', url)], None, endpoints(stub_server), log=log) == {url: None}
+    assert stub_server.requests == []